@@ -1,44 +1,105 @@
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, Response, current_app, g, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from exa_py import Exa
 import datetime
 from dotenv import load_dotenv
 import os
 import json
 from flask_cors import CORS
+from werkzeug.datastructures import MultiDict
 from apscheduler.schedulers.background import BackgroundScheduler
 import re
-from difflib import SequenceMatcher
-import spacy
+from similarity import SimHashIndex, TitleIndex, hamming_distance, simhash, title_ratio
+from categories import CategoryClassifier
+from compressed import CompressedText
+from sources import registry as source_registry, INDIAN, BD, INTL
+from exa_fetch import fan_out, plan_requests
+from response_cache import MemoryCache, SQLiteCache, cache_key
+from database import configure_engine, database_url, dispose_after_fork, engine_options, upsert_insert
+from entities import load_ner_pipeline, ner_pool, pipe_processes, pool_entities, text_segments
+import metrics
+import click
 from collections import Counter
-from sqlalchemy import text
+import functools
+import base64
+import csv
+import io
+import zlib
+import hashlib
+import threading
+import socket
+import atexit
+from concurrent.futures.process import BrokenProcessPool
+import time
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, selectinload, undefer_group
 
-# Ensure instance directory exists
-instance_path = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'instance')
-os.makedirs(instance_path, exist_ok=True)
-
-app = Flask(__name__)
-# Set up portable SQLite DB path
+# Portable SQLite DB path; the instance directory is created by create_app()
 basedir = os.path.abspath(os.path.dirname(__file__))
-db_path = os.path.join(basedir, 'instance', 'SIMS_Analytics.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-print("Database URI:", app.config['SQLALCHEMY_DATABASE_URI'])
-print("Database absolute path:", os.path.abspath('instance/SIMS_Analytics.db'))
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-CORS(app, resources={r"/api/*": {"origins": "*"}})
-
-# Initialize database if it doesn't exist
-with app.app_context():
-    db.create_all()
+instance_path = os.path.join(basedir, 'instance')
+db_path = os.path.join(instance_path, 'SIMS_Analytics.db')
+
+# Bound to an app by create_app(); routes and CLI commands live on the api blueprint
+db = SQLAlchemy()
+migrate = Migrate()
+api = Blueprint('api', __name__, cli_group=None)
 
 load_dotenv()
 EXA_API_KEY = os.getenv('EXA_API_KEY')
+# Exa fan-out: domains per request (0 = one request per query), parallel requests,
+# requests per second across all workers and retries per failed request
+EXA_SHARD_SIZE = int(os.getenv('EXA_SHARD_SIZE', '0'))
+EXA_CONCURRENCY = int(os.getenv('EXA_CONCURRENCY', '4'))
+EXA_RATE_LIMIT = float(os.getenv('EXA_RATE_LIMIT', '5'))
+EXA_MAX_RETRIES = int(os.getenv('EXA_MAX_RETRIES', '3'))
+# Response cache for /api/dashboard and /api/articles: 'memory' (per process), 'sqlite'
+# (shared file, for multi-worker servers) or 'off'
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', os.path.join(instance_path, 'response_cache.db'))
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '600'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+# Requests slower than this many milliseconds get an X-Debug-Timing breakdown header and a log
+# line even without asking for one (0 = only when the request sends X-Debug-Timing)
+DEBUG_TIMING_SLOW_MS = float(os.getenv('DEBUG_TIMING_SLOW_MS', '0'))
+
+# Load the spaCy model in create_app() instead of on first use, e.g. once in a
+# gunicorn master started with --preload so workers share it copy-on-write
+PRELOAD_NLP = os.getenv('PRELOAD_NLP', '0').lower() in ('1', 'true', 'yes')
+# Background scheduler, started on the first request of an app built with create_app(start_background=True)
+# unless SCHEDULER_ENABLED=0 (e.g. for pure API workers). Every enabled process competes for a lease; only
+# its holder runs ingestion, and a holder that stops renewing loses it after SCHEDULER_LEASE_SECONDS
+SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', '1').lower() not in ('0', 'false', 'no')
+SCHEDULER_LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', '90'))
 
-# Load spaCy model once at startup
-nlp = spacy.load('en_core_web_sm')
+# spaCy model for entity extraction (a package name or path), loaded by get_nlp() on first use
+NLP_MODEL = os.getenv('NLP_MODEL', 'en_core_web_sm')
+# nlp.pipe() batch size and NER worker processes. Larger jobs go to a pool of spawned workers that each
+# load the model once and live as long as this process (see entities.ner_pool); small ones stay in-process
+NLP_BATCH_SIZE = int(os.getenv('NLP_BATCH_SIZE', '64'))
+NLP_PROCESSES = int(os.getenv('NLP_PROCESSES', str(min(4, os.cpu_count() or 1))))
+# Article text fed to NER: at most NLP_MAX_CHARS, in pieces of at most NLP_SEGMENT_CHARS
+NLP_MAX_CHARS = int(os.getenv('NLP_MAX_CHARS', '100000'))
+NLP_SEGMENT_CHARS = int(os.getenv('NLP_SEGMENT_CHARS', '10000'))
+_nlp = None
+_nlp_lock = threading.Lock()
+_ner_pool = (None, 0, None)  # (pid, workers, pool)
+# Entity labels kept for the dashboard's entity list
+NER_LABELS = ['PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT', 'WORK_OF_ART', 'LAW', 'LANGUAGE']
+# Related-article neighbours stored per article and their minimum title similarity
+RELATED_K = 5
+RELATED_THRESHOLD = 0.5
+# Titles verified per related-article lookup (see TitleIndex.query_top); also bounds the existing
+# lists a new article is merged into
+RELATED_CANDIDATES = 400
+# Exa results written per upsert transaction during ingestion
+INGEST_BATCH_SIZE = 50
+# New articles whose body SimHash is within this many bits of a stored one from the same source group
+# are syndicated copies
+SIMHASH_MAX_DISTANCE = 6
 
 class Article(db.Model):
     id           = db.Column(db.Integer, primary_key=True)
@@ -54,9 +115,27 @@ class Article(db.Model):
     image        = db.Column(db.String)
     favicon      = db.Column(db.String)
     score        = db.Column(db.Float)
-    extras       = db.Column(db.Text)  # Store as JSON string
-    full_text    = db.Column(db.Text)
-    summary_json = db.Column(db.Text)  # Store as JSON string
+    # Large text is stored compressed and only loaded when accessed or undeferred ('content' group)
+    extras       = db.deferred(db.Column(CompressedText), group='content')  # Store as JSON string
+    full_text    = db.deferred(db.Column(CompressedText), group='content')
+    summary_json = db.deferred(db.Column(CompressedText), group='content')  # Store as JSON string
+    category     = db.Column(db.String)  # Summary category, or inferred from the text
+    source_group = db.Column(db.String)  # Registry group of the publishing site (indian, bd, intl, factcheck)
+    content_hash = db.Column(db.String)  # SHA-256 of the raw Exa result; unchanged re-fetches are skipped
+    simhash      = db.Column(db.BigInteger)  # Body fingerprint for spotting syndicated copies
+    mentions_bangladesh = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    bd_matches   = db.relationship('BDMatch', order_by='BDMatch.id', lazy='select')
+    int_matches  = db.relationship('IntMatch', order_by='IntMatch.id', lazy='select')
+    # Listing filters paired with the date ordering; id (the rowid) is implied as the last key
+    __table_args__ = (
+        db.Index('ix_article_published_at', 'published_at'),
+        db.Index('ix_article_source_published_at', 'source', 'published_at'),
+        db.Index('ix_article_sentiment_published_at', 'sentiment', 'published_at'),
+        db.Index('ix_article_category_published_at', 'category', 'published_at'),
+        db.Index('ix_article_source_group_published_at', 'source_group', 'published_at'),
+        # Dashboard eligibility: Indian sources that mention Bangladesh
+        db.Index('ix_article_mentions_bangladesh_source', 'mentions_bangladesh', 'source'),
+    )
 
 class BDMatch(db.Model):
     id         = db.Column(db.Integer, primary_key=True)
@@ -64,6 +143,8 @@ class BDMatch(db.Model):
     title      = db.Column(db.String, nullable=False)
     source     = db.Column(db.String, nullable=False)
     url        = db.Column(db.String)
+    # Covers the per-article match loads, which read every column
+    __table_args__ = (db.Index('ix_bd_match_article_id_covering', 'article_id', 'title', 'source', 'url'),)
 
 class IntMatch(db.Model):
     id         = db.Column(db.Integer, primary_key=True)
@@ -71,327 +152,1655 @@ class IntMatch(db.Model):
     title      = db.Column(db.String, nullable=False)
     source     = db.Column(db.String, nullable=False)
     url        = db.Column(db.String)
+    # Covers the per-article match loads, which read every column
+    __table_args__ = (db.Index('ix_int_match_article_id_covering', 'article_id', 'title', 'source', 'url'),)
 
-def safe_capitalize(val, default='Neutral'):
-    if isinstance(val, str):
-        return val.capitalize()
-    return default
+class ArticleEntity(db.Model):
+    id         = db.Column(db.Integer, primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), nullable=False, index=True)
+    text       = db.Column(db.String, nullable=False)
+    label      = db.Column(db.String, nullable=False)
 
-def run_exa_ingestion():
-    if not EXA_API_KEY:
-        print("Error: EXA_API_KEY environment variable not set")
-        return
-    exa = Exa(api_key=EXA_API_KEY)
-    print("Running advanced Exa ingestion for Bangladesh-related news coverage by Indian Media...")
-    indian_and_bd_domains = [
-        "timesofindia.indiatimes.com", "hindustantimes.com", "ndtv.com", "thehindu.com", "indianexpress.com", "indiatoday.in", "news18.com", "zeenews.india.com", "aajtak.in", "abplive.com", "jagran.com", "bhaskar.com", "livehindustan.com", "business-standard.com", "economictimes.indiatimes.com", "livemint.com", "scroll.in", "thewire.in", "wionews.com", "indiatvnews.com", "newsnationtv.com", "jansatta.com", "india.com", "bdnews24.com", "thedailystar.net", "prothomalo.com", "dhakatribune.com", "newagebd.net", "financialexpress.com.bd", "theindependentbd.com", "bbc.com", "reuters.com", "aljazeera.com", "apnews.com", "cnn.com", "nytimes.com", "theguardian.com", "france24.com", "dw.com", "factwatchbd.com", "altnews.in", "boomlive.in", "factchecker.in", "thequint.com", "factcheck.afp.com", "snopes.com", "politifact.com", "fullfact.org", "apnews.com", "factcheck.org"
-    ]
-    # Source categorization
-    indian_sources = set([
-        "timesofindia.indiatimes.com", "hindustantimes.com", "ndtv.com", "thehindu.com", "indianexpress.com", "indiatoday.in", "news18.com", "zeenews.india.com", "aajtak.in", "abplive.com", "jagran.com", "bhaskar.com", "livehindustan.com", "business-standard.com", "economictimes.indiatimes.com", "livemint.com", "scroll.in", "thewire.in", "wionews.com", "indiatvnews.com", "newsnationtv.com", "jansatta.com", "india.com"
-    ])
-    bd_sources = set([
-        "bdnews24.com", "thedailystar.net", "prothomalo.com", "dhakatribune.com", "newagebd.net", "financialexpress.com.bd", "theindependentbd.com"
-    ])
-    intl_sources = set([
-        "bbc.com", "reuters.com", "aljazeera.com", "apnews.com", "cnn.com", "nytimes.com", "theguardian.com", "france24.com", "dw.com"
-    ])
-    result = exa.search_and_contents(
-        "Bangladesh-related News coverage by Indian news media",
-        category="news",
-        text=True,
-        num_results=100,
-        livecrawl="always",
-        include_domains=list(indian_and_bd_domains),
-        summary={
-            "query": "You are a fact-checking and media-analysis assistant specialising in India–Bangladesh coverage.  For the Indian news article at {url} complete ALL of the following tasks and reply **only** with a single JSON object that exactly matches the schema provided below (do not wrap it in Markdown):  1️⃣  **extractSummary** → In ≤3 sentences, give a concise, neutral summary of the article's topic and its main claim(s).  2️⃣  **sourceDomain** → Return only the publisher's domain, e.g. \"thehindu.com\".  3️⃣  **newsCategory** → Classify into one of: Politics • Economy • Crime • Environment • Health • Technology • Diplomacy • Sports • Culture • Other  4️⃣  **sentimentTowardBangladesh** → Positive • Negative • Neutral (base it on overall tone toward Bangladesh).  5️⃣  **factCheck** → Compare the article's main claim(s) against the latest coverage in these outlets 🇧🇩 bdnews24.com, thedailystar.net, prothomalo.com, dhakatribune.com, newagebd.net, financialexpress.com.bd, theindependentbd.com 🌍 bbc.com, reuters.com, aljazeera.com, apnews.com, cnn.com, nytimes.com, theguardian.com, france24.com, dw.com ✅ Fact-checking sites: factwatchbd.com, altnews.in, boomlive.in, factchecker.in, thequint.com, factcheck.afp.com, snopes.com, politifact.com, fullfact.org, factcheck.org Return: • **status** \"verified\" | \"unverified\" • **sources** array of URLs used for verification • **similarFactChecks** array of objects { \"title\": …, \"source\": …, \"url\": … }  6️⃣  **mediaCoverageSummary** → For both Bangladeshi and international media, give ≤2-sentence summaries of how (or if) the claim was covered. Return \"Not covered\" if nothing found.  7️⃣  **supportingArticleMatches** → Two arrays: • **bangladeshiMatches** — articles from 🇧🇩 outlets • **internationalMatches** — articles from 🌍 outlets Each item: { \"title\": …, \"source\": …, \"url\": … }",
-            "schema": {
-                "$schema": "http://json-schema.org/draft-07/schema#",
-                "title": "IndianNewsArticleAnalysis",
+class RelatedArticle(db.Model):
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    related_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True, index=True)
+    score      = db.Column(db.Float, nullable=False)
+
+# URL of a syndicated copy, linked to the article it duplicates instead of being stored again
+class ArticleAlias(db.Model):
+    url        = db.Column(db.String, primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), nullable=False, index=True)
+    distance   = db.Column(db.Integer)  # SimHash bits that differ from the canonical article
+    created_at = db.Column(db.DateTime)
+
+# Dashboard view of an Indian-source article that mentions Bangladesh, kept current at ingest time
+class DashboardEntry(db.Model):
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    day        = db.Column(db.Date, index=True)
+    source     = db.Column(db.String, nullable=False, index=True)
+    category   = db.Column(db.String, nullable=False, index=True)
+    sentiment  = db.Column(db.String, nullable=False)
+    verdict    = db.Column(db.String, nullable=False)
+    reason     = db.Column(db.String)
+
+# Dashboard entry counts per (day, source, category, sentiment, verdict)
+class DashboardRollup(db.Model):
+    id        = db.Column(db.Integer, primary_key=True)
+    day       = db.Column(db.Date, index=True)
+    source    = db.Column(db.String, nullable=False)
+    category  = db.Column(db.String, nullable=False)
+    sentiment = db.Column(db.String, nullable=False)
+    verdict   = db.Column(db.String, nullable=False)
+    count     = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.Index('ix_dashboard_rollup_source_category_day', 'source', 'category', 'day'),
+        db.Index('ix_dashboard_rollup_category_day', 'category', 'day'),
+    )
+
+# Article counts per (publish day, source, group, category, sentiment) behind /api/timeseries,
+# recomputed for the days each ingestion touches
+class ArticleRollup(db.Model):
+    id           = db.Column(db.Integer, primary_key=True)
+    day          = db.Column(db.Date, nullable=False)
+    source       = db.Column(db.String)
+    source_group = db.Column(db.String)
+    category     = db.Column(db.String, nullable=False)
+    sentiment    = db.Column(db.String, nullable=False)
+    count        = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.Index('ix_article_rollup_day', 'day'),
+        db.Index('ix_article_rollup_source_day', 'source', 'day'),
+        db.Index('ix_article_rollup_category_day', 'category', 'day'),
+    )
+
+# Single-row counter bumped after every ingestion; cached responses are tagged with it
+class DataVersion(db.Model):
+    id         = db.Column(db.Integer, primary_key=True)
+    version    = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+# Exa ingestion run, queued by /api/fetch-latest or the scheduler and polled via /api/jobs/<id>
+class IngestionJob(db.Model):
+    id          = db.Column(db.Integer, primary_key=True)
+    status      = db.Column(db.String, nullable=False, default='queued')  # queued, running, succeeded, failed
+    active      = db.Column(db.Boolean, unique=True)  # True while queued/running, NULL after: one active job at a time
+    trigger     = db.Column(db.String)
+    stage       = db.Column(db.String)
+    fetched     = db.Column(db.Integer, nullable=False, default=0)
+    processed   = db.Column(db.Integer, nullable=False, default=0)
+    skipped     = db.Column(db.Integer, nullable=False, default=0)
+    failed      = db.Column(db.Integer, nullable=False, default=0)
+    inserted    = db.Column(db.Integer, nullable=False, default=0)
+    updated     = db.Column(db.Integer, nullable=False, default=0)
+    unchanged   = db.Column(db.Integer, nullable=False, default=0)
+    duplicate   = db.Column(db.Integer, nullable=False, default=0)
+    error       = db.Column(db.Text)
+    created_at  = db.Column(db.DateTime)
+    started_at  = db.Column(db.DateTime)
+    updated_at  = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+# Time-limited lease naming the process allowed to run scheduled jobs; renewed by a heartbeat
+class SchedulerLease(db.Model):
+    name       = db.Column(db.String, primary_key=True)
+    holder     = db.Column(db.String, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+# Outlet groups, domains searched by the Exa ingestion and Indian publication languages,
+# all from the registry in sources.py
+INDIAN_SOURCES = source_registry.domains(INDIAN)
+EXA_INCLUDE_DOMAINS = source_registry.searched_domains()
+SOURCE_LANGUAGES = {s.domain: s.language for s in source_registry.sources(INDIAN)}
+# Topical queries issued per ingestion; each runs against every domain shard
+EXA_QUERIES = [
+    "Bangladesh-related News coverage by Indian news media",
+]
+# Structured summary Exa generates for every result
+EXA_SUMMARY = {
+    "query": "You are a fact-checking and media-analysis assistant specialising in India–Bangladesh coverage.  For the Indian news article at {url} complete ALL of the following tasks and reply **only** with a single JSON object that exactly matches the schema provided below (do not wrap it in Markdown):  1️⃣  **extractSummary** → In ≤3 sentences, give a concise, neutral summary of the article's topic and its main claim(s).  2️⃣  **sourceDomain** → Return only the publisher's domain, e.g. \"thehindu.com\".  3️⃣  **newsCategory** → Classify into one of: Politics • Economy • Crime • Environment • Health • Technology • Diplomacy • Sports • Culture • Other  4️⃣  **sentimentTowardBangladesh** → Positive • Negative • Neutral (base it on overall tone toward Bangladesh).  5️⃣  **factCheck** → Compare the article's main claim(s) against the latest coverage in these outlets 🇧🇩 bdnews24.com, thedailystar.net, prothomalo.com, dhakatribune.com, newagebd.net, financialexpress.com.bd, theindependentbd.com 🌍 bbc.com, reuters.com, aljazeera.com, apnews.com, cnn.com, nytimes.com, theguardian.com, france24.com, dw.com ✅ Fact-checking sites: factwatchbd.com, altnews.in, boomlive.in, factchecker.in, thequint.com, factcheck.afp.com, snopes.com, politifact.com, fullfact.org, factcheck.org Return: • **status** \"verified\" | \"unverified\" • **sources** array of URLs used for verification • **similarFactChecks** array of objects { \"title\": …, \"source\": …, \"url\": … }  6️⃣  **mediaCoverageSummary** → For both Bangladeshi and international media, give ≤2-sentence summaries of how (or if) the claim was covered. Return \"Not covered\" if nothing found.  7️⃣  **supportingArticleMatches** → Two arrays: • **bangladeshiMatches** — articles from 🇧🇩 outlets • **internationalMatches** — articles from 🌍 outlets Each item: { \"title\": …, \"source\": …, \"url\": … }",
+    "schema": {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "title": "IndianNewsArticleAnalysis",
+        "type": "object",
+        "required": ["extractSummary", "sourceDomain", "newsCategory", "sentimentTowardBangladesh", "factCheck", "mediaCoverageSummary", "supportingArticleMatches"],
+        "properties": {
+            "extract_summary": {
+                "type": "string",
+                "description": "≤ 3-sentence neutral overview of the article's subject and principal claim(s)."
+            },
+            "source_domain": {
+                "type": "string",
+                "description": "Root domain of the Indian news outlet that published the story (e.g., \"thehindu.com\")."
+            },
+            "news_category": {
+                "type": "string",
+                "enum": ["Politics", "Economy", "Crime", "Environment", "Health", "Technology", "Diplomacy", "Sports", "Culture", "Other"],
+                "description": "Single topical label chosen from the fixed taxonomy."
+            },
+            "sentiment_toward_bangladesh": {
+                "type": "string",
+                "enum": ["Positive", "Negative", "Neutral"],
+                "description": "Overall tone the article conveys toward Bangladesh."
+            },
+            "fact_check": {
                 "type": "object",
-                "required": ["extractSummary", "sourceDomain", "newsCategory", "sentimentTowardBangladesh", "factCheck", "mediaCoverageSummary", "supportingArticleMatches"],
+                "required": ["status", "sources", "similarFactChecks"],
+                "description": "Verification results for the article's main claim(s).",
                 "properties": {
-                    "extract_summary": {
+                    "status": {
                         "type": "string",
-                        "description": "≤ 3-sentence neutral overview of the article's subject and principal claim(s)."
+                        "enum": ["verified", "unverified"],
+                        "description": "\"verified\" if supporting evidence exists in trusted outlets; otherwise \"unverified\"."
                     },
-                    "source_domain": {
-                        "type": "string",
-                        "description": "Root domain of the Indian news outlet that published the story (e.g., \"thehindu.com\")."
-                    },
-                    "news_category": {
-                        "type": "string",
-                        "enum": ["Politics", "Economy", "Crime", "Environment", "Health", "Technology", "Diplomacy", "Sports", "Culture", "Other"],
-                        "description": "Single topical label chosen from the fixed taxonomy."
+                    "sources": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "format": "uri"
+                        },
+                        "description": "URLs of articles or fact-checks used for verification."
                     },
-                    "sentiment_toward_bangladesh": {
-                        "type": "string",
-                        "enum": ["Positive", "Negative", "Neutral"],
-                        "description": "Overall tone the article conveys toward Bangladesh."
-                    },
-                    "fact_check": {
-                        "type": "object",
-                        "required": ["status", "sources", "similarFactChecks"],
-                        "description": "Verification results for the article's main claim(s).",
-                        "properties": {
-                            "status": {
-                                "type": "string",
-                                "enum": ["verified", "unverified"],
-                                "description": "\"verified\" if supporting evidence exists in trusted outlets; otherwise \"unverified\"."
-                            },
-                            "sources": {
-                                "type": "array",
-                                "items": {
+                    "similar_fact_checks": {
+                        "type": "array",
+                        "description": "Related fact-checking articles.",
+                        "items": {
+                            "type": "object",
+                            "required": ["title", "source", "url"],
+                            "properties": {
+                                "title": {
                                     "type": "string",
-                                    "format": "uri"
+                                    "description": "Headline of the fact-check article."
                                 },
-                                "description": "URLs of articles or fact-checks used for verification."
-                            },
-                            "similar_fact_checks": {
-                                "type": "array",
-                                "description": "Related fact-checking articles.",
-                                "items": {
-                                    "type": "object",
-                                    "required": ["title", "source", "url"],
-                                    "properties": {
-                                        "title": {
-                                            "type": "string",
-                                            "description": "Headline of the fact-check article."
-                                        },
-                                        "source": {
-                                            "type": "string",
-                                            "description": "Domain or outlet that published the fact-check."
-                                        },
-                                        "url": {
-                                            "type": "string",
-                                            "format": "uri",
-                                            "description": "Link to the fact-check."
-                                        }
-                                    }
+                                "source": {
+                                    "type": "string",
+                                    "description": "Domain or outlet that published the fact-check."
+                                },
+                                "url": {
+                                    "type": "string",
+                                    "format": "uri",
+                                    "description": "Link to the fact-check."
                                 }
                             }
                         }
+                    }
+                }
+            },
+            "media_coverage_summary": {
+                "type": "object",
+                "required": ["bangladeshiMedia", "internationalMedia"],
+                "description": "Short comparison of how Bangladeshi vs. international outlets covered the claim.",
+                "properties": {
+                    "bangladeshi_media": {
+                        "type": "string",
+                        "description": "≤ 2-sentence synopsis of Bangladeshi coverage, or \"Not covered\"."
                     },
-                    "media_coverage_summary": {
-                        "type": "object",
-                        "required": ["bangladeshiMedia", "internationalMedia"],
-                        "description": "Short comparison of how Bangladeshi vs. international outlets covered the claim.",
-                        "properties": {
-                            "bangladeshi_media": {
-                                "type": "string",
-                                "description": "≤ 2-sentence synopsis of Bangladeshi coverage, or \"Not covered\"."
-                            },
-                            "international_media": {
-                                "type": "string",
-                                "description": "≤ 2-sentence synopsis of international coverage, or \"Not covered\"."
+                    "international_media": {
+                        "type": "string",
+                        "description": "≤ 2-sentence synopsis of international coverage, or \"Not covered\"."
+                    }
+                }
+            },
+            "supporting_article_matches": {
+                "type": "object",
+                "required": ["bangladeshiMatches", "internationalMatches"],
+                "description": "Lists of related articles that discuss the same claim/event.",
+                "properties": {
+                    "bangladeshi_matches": {
+                        "type": "array",
+                        "description": "Matching articles from Bangladeshi outlets.",
+                        "items": {
+                            "type": "object",
+                            "required": ["title", "source", "url"],
+                            "properties": {
+                                "title": {
+                                    "type": "string",
+                                    "description": "Headline of the Bangladeshi article."
+                                },
+                                "source": {
+                                    "type": "string",
+                                    "description": "Publishing domain."
+                                },
+                                "url": {
+                                    "type": "string",
+                                    "format": "uri",
+                                    "description": "Link to the article."
+                                }
                             }
                         }
                     },
-                    "supporting_article_matches": {
-                        "type": "object",
-                        "required": ["bangladeshiMatches", "internationalMatches"],
-                        "description": "Lists of related articles that discuss the same claim/event.",
-                        "properties": {
-                            "bangladeshi_matches": {
-                                "type": "array",
-                                "description": "Matching articles from Bangladeshi outlets.",
-                                "items": {
-                                    "type": "object",
-                                    "required": ["title", "source", "url"],
-                                    "properties": {
-                                        "title": {
-                                            "type": "string",
-                                            "description": "Headline of the Bangladeshi article."
-                                        },
-                                        "source": {
-                                            "type": "string",
-                                            "description": "Publishing domain."
-                                        },
-                                        "url": {
-                                            "type": "string",
-                                            "format": "uri",
-                                            "description": "Link to the article."
-                                        }
-                                    }
-                                }
-                            },
-                            "international_matches": {
-                                "type": "array",
-                                "description": "Matching articles from international outlets.",
-                                "items": {
-                                    "type": "object",
-                                    "required": ["title", "source", "url"],
-                                    "properties": {
-                                        "title": {
-                                            "type": "string",
-                                            "description": "Headline of the international article."
-                                        },
-                                        "source": {
-                                            "type": "string",
-                                            "description": "Publishing domain."
-                                        },
-                                        "url": {
-                                            "type": "string",
-                                            "format": "uri",
-                                            "description": "Link to the article."
-                                        }
-                                    }
+                    "international_matches": {
+                        "type": "array",
+                        "description": "Matching articles from international outlets.",
+                        "items": {
+                            "type": "object",
+                            "required": ["title", "source", "url"],
+                            "properties": {
+                                "title": {
+                                    "type": "string",
+                                    "description": "Headline of the international article."
+                                },
+                                "source": {
+                                    "type": "string",
+                                    "description": "Publishing domain."
+                                },
+                                "url": {
+                                    "type": "string",
+                                    "format": "uri",
+                                    "description": "Link to the article."
                                 }
                             }
                         }
                     }
                 }
             }
-        },
+        }
+    }
+}
+
+class TimedTitleIndex(TitleIndex):
+    """TitleIndex whose queries (the SequenceMatcher pass) are timed as the 'sequence_matcher' operation."""
+
+    def query(self, *args, **kwargs):
+        with metrics.timed('sequence_matcher'):
+            return super().query(*args, **kwargs)
+
+# Title similarity index shared by ingestion-time match lookup and the dashboard fact-check.
+# Built lazily from the DB and extended as articles are committed.
+title_index = TimedTitleIndex()
+# Body fingerprints of stored articles, for linking syndicated copies at ingest time
+simhash_index = SimHashIndex()
+# Keyword category classifier, compiled once
+category_classifier = CategoryClassifier()
+
+def title_groups(url, source):
+    """Source-group labels an article is indexed under."""
+    groups = set()
+    source_group = source_registry.group(source)
+    if source_group in (BD, INTL):
+        groups.add(f'{source_group}_source')
+    url_group = source_registry.group(url)
+    if url_group in (BD, INTL):
+        groups.add(f'{url_group}_domain')
+    return groups
+
+def sync_title_index():
+    """Index articles added since the last sync, including those committed by other processes."""
+    rows = (db.session.query(Article.id, Article.title, Article.url, Article.source)
+            .filter(Article.id > title_index.max_key)
+            .order_by(Article.id))
+    for row in rows:
+        title_index.add(row.id, row.title, title_groups(row.url, row.source))
+    return title_index
+
+def sync_simhash_index():
+    """Index body fingerprints of articles added since the last sync."""
+    rows = (db.session.query(Article.id, Article.simhash)
+            .filter(Article.id > simhash_index.max_key, Article.simhash.isnot(None))
+            .order_by(Article.id))
+    for row in rows:
+        simhash_index.add(row.id, row.simhash)
+    return simhash_index
+
+def update_related_articles(articles):
+    """Store the top-k neighbours of newly ingested articles and repair existing neighbour lists.
+
+    Every existing article among the new one's RELATED_CANDIDATES nearest
+    titles gets it merged into its own top-k, so lists stay current without a
+    full rebuild.
+    """
+    sync_title_index()
+    for a in articles:
+        neighbours = title_index.query_top(a.title, RELATED_CANDIDATES, RELATED_THRESHOLD, exclude=a.id,
+                                           candidates=RELATED_CANDIDATES)
+        RelatedArticle.query.filter_by(article_id=a.id).delete()
+        for key, score in neighbours[:RELATED_K]:
+            db.session.add(RelatedArticle(article_id=a.id, related_id=key, score=score))
+        # Rescore entries pointing at this article from outside its candidates; drop those that
+        # no longer clear the threshold (e.g. retitled)
+        scores = dict(neighbours)
+        stale = (db.session.query(RelatedArticle, Article.title)
+                 .join(Article, Article.id == RelatedArticle.article_id)
+                 .filter(RelatedArticle.related_id == a.id))
+        if scores:
+            stale = stale.filter(~RelatedArticle.article_id.in_(list(scores)))
+        for row, title in stale:
+            score = title_ratio(a.title, title)
+            if score > RELATED_THRESHOLD:
+                row.score = score
+            else:
+                db.session.delete(row)
+        if not scores:
+            continue
+        existing = {}
+        for row in RelatedArticle.query.filter(RelatedArticle.article_id.in_(list(scores))):
+            existing.setdefault(row.article_id, []).append(row)
+        for key, score in neighbours:
+            rows = existing.get(key, [])
+            current = next((r for r in rows if r.related_id == a.id), None)
+            if current is not None:
+                current.score = score
+            elif len(rows) < RELATED_K:
+                db.session.add(RelatedArticle(article_id=key, related_id=a.id, score=score))
+            else:
+                weakest = min(rows, key=lambda r: (r.score, -r.related_id))
+                if score > weakest.score:
+                    db.session.delete(weakest)
+                    db.session.add(RelatedArticle(article_id=key, related_id=a.id, score=score))
+    db.session.commit()
+
+def normalize_sentiment(s):
+    if not s:
+        return 'Neutral'
+    s = s.strip().capitalize()
+    if s in ['Positive', 'Negative', 'Neutral', 'Cautious']:
+        return s
+    # Try to match common variants
+    if s.lower() == 'positive':
+        return 'Positive'
+    if s.lower() == 'negative':
+        return 'Negative'
+    if s.lower() == 'neutral':
+        return 'Neutral'
+    if s.lower() == 'cautious':
+        return 'Cautious'
+    return 'Neutral'
+
+def mentions_bangladesh(title, text):
+    return 'bangladesh' in (title or '').lower() or 'bangladesh' in (text or '').lower()
+
+def fact_check_verdicts(articles):
+    """{article id: (verdict, reason)} from sentiment agreement with similar BD and International titles."""
+    sync_title_index()
+    match_ids = {}
+    for a in articles:
+        ids = [key for key, _ in title_index.query(a.title, 0.7, group='bd_domain')]
+        ids += [key for key, _ in title_index.query(a.title, 0.7, group='intl_domain')]
+        match_ids[a.id] = ids
+    all_match_ids = {key for ids in match_ids.values() for key in ids}
+    match_sentiments = dict(
+        db.session.query(Article.id, Article.sentiment).filter(Article.id.in_(all_match_ids))
+    ) if all_match_ids else {}
+    verdicts = {}
+    for a in articles:
+        agreements = 0
+        contradictions = 0
+        for match_id in match_ids[a.id]:
+            match_sentiment = match_sentiments.get(match_id)
+            # Compare sentiment as a proxy for agreement
+            if match_sentiment and a.sentiment and match_sentiment.lower() == a.sentiment.lower():
+                agreements += 1
+            else:
+                contradictions += 1
+        if agreements > 0 and contradictions == 0:
+            verdicts[a.id] = ('True', f"Matched with {agreements} sources, all agree.")
+        elif contradictions > 0 and agreements == 0:
+            verdicts[a.id] = ('False', f"Matched with {contradictions} sources, all contradict.")
+        elif agreements > 0 and contradictions > 0:
+            verdicts[a.id] = ('Mixed', f"Matched with {agreements} agreeing and {contradictions} contradicting sources.")
+        else:
+            verdicts[a.id] = ('Unverified', 'No matching articles found in Bangladeshi or International sources.')
+    return verdicts
+
+def rollup_key(entry):
+    return (entry.day, entry.source, entry.category, entry.sentiment, entry.verdict)
+
+def apply_rollup_deltas(deltas):
+    """Add per-key count changes to dashboard_rollup, dropping rows that reach zero."""
+    for (day, source, category, sentiment, verdict), delta in deltas.items():
+        if not delta:
+            continue
+        row = DashboardRollup.query.filter_by(day=day, source=source, category=category,
+                                              sentiment=sentiment, verdict=verdict).first()
+        if row is None:
+            if delta < 0:
+                continue
+            row = DashboardRollup(day=day, source=source, category=category,
+                                  sentiment=sentiment, verdict=verdict, count=0)
+            db.session.add(row)
+        row.count += delta
+        if row.count <= 0:
+            db.session.delete(row)
+
+def refresh_dashboard_entries(article_ids):
+    """Recompute dashboard entries for the given articles and apply the change to the rollup.
+
+    Runs inside the caller's transaction. Only Indian-source articles that
+    mention Bangladesh get an entry; others lose theirs.
+    """
+    if not article_ids:
+        return
+    articles = (Article.query
+                .options(load_only(Article.id, Article.title, Article.source, Article.sentiment,
+                                   Article.published_at, Article.category, Article.mentions_bangladesh))
+                .filter(Article.id.in_(list(article_ids))).all())
+    old = {e.article_id: e for e in DashboardEntry.query.filter(DashboardEntry.article_id.in_(list(article_ids)))}
+    eligible = [a for a in articles if a.source in INDIAN_SOURCES and a.mentions_bangladesh]
+    verdicts = fact_check_verdicts(eligible)
+    deltas = Counter()
+    for a in eligible:
+        entry = old.pop(a.id, None)
+        if entry is None:
+            entry = DashboardEntry(article_id=a.id)
+            db.session.add(entry)
+        else:
+            deltas[rollup_key(entry)] -= 1
+        entry.day = a.published_at.date() if a.published_at else None
+        entry.source = a.source
+        entry.category = a.category or 'General'
+        entry.sentiment = normalize_sentiment(a.sentiment)
+        entry.verdict, entry.reason = verdicts[a.id]
+        deltas[rollup_key(entry)] += 1
+    for entry in old.values():
+        deltas[rollup_key(entry)] -= 1
+        db.session.delete(entry)
+    apply_rollup_deltas(deltas)
+
+def dashboard_repair_ids(articles):
+    """Ids of dashboard entries whose verdict may change because ``articles`` (id, title, url, source) were stored.
+
+    A BD or International article can become a match of existing Indian
+    articles, so their entries are recomputed. The candidate threshold is a
+    little below the verdict threshold because title similarity is not
+    perfectly symmetric.
+    """
+    candidates = set()
+    for article_id, title, url, source in articles:
+        if title_groups(url, source) & {'bd_domain', 'intl_domain'}:
+            candidates.update(key for key, _ in title_index.query(title, 0.6, exclude=article_id))
+    if not candidates:
+        return set()
+    return {row.article_id for row in
+            db.session.query(DashboardEntry.article_id).filter(DashboardEntry.article_id.in_(list(candidates)))}
+
+def sentiment_label():
+    """SQL equivalent of normalize_sentiment() over Article.sentiment."""
+    value = db.func.lower(db.func.trim(Article.sentiment))
+    return db.case(*[(value == s.lower(), s) for s in ('Positive', 'Negative', 'Neutral', 'Cautious')],
+                   else_='Neutral')
+
+def article_rollup_select(*filters):
+    """SELECT of article_rollup rows aggregated from the articles matching ``filters``."""
+    day = db.func.date(Article.published_at)
+    category = db.func.coalesce(Article.category, 'General')
+    sentiment = sentiment_label()
+    return (db.select(day, Article.source, Article.source_group, category, sentiment, db.func.count())
+            .where(Article.published_at.isnot(None), *filters)
+            .group_by(day, Article.source, Article.source_group, category, sentiment))
+
+ARTICLE_ROLLUP_COLUMNS = ['day', 'source', 'source_group', 'category', 'sentiment', 'count']
+
+def refresh_article_rollup(days):
+    """Recompute article_rollup for the given publish days; runs inside the caller's transaction."""
+    days = sorted({datetime.date.fromisoformat(d) if isinstance(d, str) else d for d in days if d})
+    if not days:
+        return
+    db.session.execute(ArticleRollup.__table__.delete().where(ArticleRollup.day.in_(days)))
+    # Per-day ranges so the article scan stays on ix_article_published_at
+    ranges = [Article.published_at.between(datetime.datetime.combine(d, datetime.time.min),
+                                           datetime.datetime.combine(d, datetime.time.max))
+              for d in days]
+    db.session.execute(ArticleRollup.__table__.insert().from_select(
+        ARTICLE_ROLLUP_COLUMNS, article_rollup_select(db.or_(*ranges))))
+
+def article_days(urls):
+    """Publish days currently stored for the given URLs."""
+    if not urls:
+        return set()
+    return {day for (day,) in db.session.query(db.func.date(Article.published_at))
+            .filter(Article.url.in_(urls), Article.published_at.isnot(None)).distinct()}
+
+def make_response_cache():
+    """The response cache selected by RESPONSE_CACHE_BACKEND, or None when it is off."""
+    if RESPONSE_CACHE_BACKEND == 'sqlite':
+        return SQLiteCache(RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL,
+                           max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=RESPONSE_CACHE_MAX_BYTES)
+    if RESPONSE_CACHE_BACKEND == 'off':
+        return None
+    return MemoryCache(ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                       max_bytes=RESPONSE_CACHE_MAX_BYTES)
+
+def get_response_cache():
+    """The current app's response cache (see make_response_cache)."""
+    return current_app.extensions.get('response_cache')
+
+# Request, query and ingestion metrics served at /api/metrics (see metrics.py)
+request_duration = metrics.registry.histogram(
+    'http_request_duration_seconds', 'API request latency.', ['endpoint', 'method', 'status'])
+request_queries = metrics.registry.histogram(
+    'http_request_queries', 'SQL statements issued per API request.', ['endpoint'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250))
+ingestion_stage_seconds = metrics.registry.histogram(
+    'ingestion_stage_duration_seconds', 'Duration of each Exa ingestion stage.', ['stage'],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800))
+INGESTION_OUTCOMES = ('fetched', 'skipped', 'failed', 'inserted', 'updated', 'unchanged', 'duplicate')
+ingestion_items = metrics.registry.counter(
+    'ingestion_items_total', 'Exa results handled by ingestion, by outcome.', ['outcome'])
+ingestion_runs = metrics.registry.counter(
+    'ingestion_runs_total', 'Exa ingestion runs, by result.', ['status'])
+ingestion_last_success = metrics.registry.gauge(
+    'ingestion_last_success_timestamp_seconds', 'Unix time the last ingestion run finished.')
+cache_lookups = metrics.registry.counter(
+    'response_cache_lookups_total', 'Response cache lookups in this process, by result.', ['result'])
+cache_entries = metrics.registry.gauge('response_cache_entries', 'Entries in the response cache.')
+cache_bytes = metrics.registry.gauge('response_cache_bytes', 'Size of the response cache.')
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    metrics.record('sql', time.perf_counter() - context.query_started)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with jsonify() serialization timed as the 'json' operation."""
+
+    def dumps(self, obj, **kwargs):
+        with metrics.timed('json'):
+            return super().dumps(obj, **kwargs)
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = metrics.begin_request()
+
+@api.after_app_request
+def record_request_metrics(response):
+    """Record latency and query count per endpoint; add the X-Debug-Timing breakdown when asked or slow."""
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed, breakdown = metrics.end_request(started)
+    endpoint = request.endpoint or 'unmatched'
+    request_duration.observe(elapsed, endpoint=endpoint, method=request.method, status=response.status_code)
+    request_queries.observe(breakdown.get('sql', (0, 0))[1], endpoint=endpoint)
+    slow = DEBUG_TIMING_SLOW_MS > 0 and elapsed * 1000 >= DEBUG_TIMING_SLOW_MS
+    if slow or request.headers.get('X-Debug-Timing', '').lower() in ('1', 'true', 'yes'):
+        timing = metrics.format_breakdown(elapsed, breakdown)
+        response.headers['X-Debug-Timing'] = timing
+        if slow:
+            print(f"Slow request {request.method} {request.full_path}: {timing}")
+    return response
+
+def current_data_version():
+    """Version of the article data; read from the DB so ingestion in any process invalidates every cache."""
+    try:
+        row = db.session.get(DataVersion, 1)
+    except Exception:
+        # Table missing (database not migrated yet): serve uncached
+        db.session.rollback()
+        return None
+    return row.version if row else 0
+
+def bump_data_version():
+    row = db.session.get(DataVersion, 1)
+    if row is None:
+        row = DataVersion(id=1, version=0)
+        db.session.add(row)
+    row.version += 1
+    row.updated_at = datetime.datetime.utcnow()
+    db.session.commit()
+    response_cache = get_response_cache()
+    if isinstance(response_cache, MemoryCache):
+        # Old entries can no longer be hit; free their memory now
+        response_cache.clear()
+    article_count_cache.clear()
+    return row.version
+
+def cached_response(view):
+    """Serve the view's JSON body from response_cache, keyed by path and normalized query params."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response_cache = get_response_cache()
+        version = current_data_version() if response_cache is not None else None
+        if version is None:
+            return view(*args, **kwargs)
+        key = cache_key(request.path, request.args)
+        body = response_cache.get(key, version)
+        if body is not None:
+            response = current_app.response_class(body, mimetype='application/json')
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response_cache.set(key, version, response.get_data())
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+# SQLite FTS5 index over article title and body (created by migration or 'flask rebuild-search-index').
+# Contentless, so the index does not keep a second, uncompressed copy of full_text; rows can only be
+# removed with FTS5's 'delete' command given the values they were indexed with (see index_article_texts)
+ARTICLE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5("
+    "title, full_text, content='', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+_search_index_available = None
+
+def search_index_available():
+    """True when the FTS5 table exists (SQLite only); cached after the first check."""
+    global _search_index_available
+    if _search_index_available is None:
+        if db.engine.dialect.name != 'sqlite':
+            _search_index_available = False
+        else:
+            _search_index_available = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_fts'")
+            ).first() is not None
+    return _search_index_available
+
+def index_article_text(article):
+    """Add the article's row to the FTS index; runs inside the caller's transaction."""
+    index_article_texts([(article.id, article.title, article.full_text)])
+
+def fts_entries(article_ids):
+    """``(id, title, full_text)`` of stored articles, as last indexed; empty without the FTS index."""
+    if not article_ids or not search_index_available():
+        return []
+    return db.session.query(Article.id, Article.title, Article.full_text).filter(Article.id.in_(article_ids)).all()
+
+def index_article_texts(entries, previous=()):
+    """Add FTS rows for ``(id, title, full_text)`` tuples, first removing the ``previous`` ones.
+
+    The contentless index cannot look up what it indexed, so ``previous``
+    must hold the title and text each replaced row was indexed with (see
+    fts_entries()); one executemany each for delete and insert.
+    """
+    if not search_index_available():
+        return
+    if previous:
+        db.session.execute(
+            text("INSERT INTO article_fts (article_fts, rowid, title, full_text) VALUES ('delete', :id, :title, :full_text)"),
+            [{'id': i, 'title': t or '', 'full_text': body or ''} for i, t, body in previous]
+        )
+    if not entries:
+        return
+    db.session.execute(
+        text("INSERT INTO article_fts (rowid, title, full_text) VALUES (:id, :title, :full_text)"),
+        [{'id': i, 'title': t or '', 'full_text': body or ''} for i, t, body in entries]
+    )
+
+def fts_query(search):
+    """Translate a user search string into an FTS5 MATCH expression.
+
+    "quoted text" becomes a phrase, term* a prefix query and all other words
+    must appear (implicit AND). The last bare word is also matched as a prefix
+    so keystroke-driven queries behave like the old substring search.
+    """
+    terms = []
+    trailing_bare = False
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', search):
+        if word:
+            prefix = word.endswith('*')
+            tokens = re.findall(r'\w+', word)
+            terms.extend('"' + t + '"' + ('*' if prefix else '') for t in tokens)
+            trailing_bare = bool(tokens) and not prefix
+        else:
+            tokens = re.findall(r'\w+', phrase)
+            if tokens:
+                terms.append('"' + ' '.join(tokens) + '"')
+                trailing_bare = False
+    if not terms:
+        return None
+    if trailing_bare:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+def safe_capitalize(val, default='Neutral'):
+    if isinstance(val, str):
+        return val.capitalize()
+    return default
+
+def get_nlp():
+    """The spaCy pipeline trimmed to NER (see entities.load_ner_pipeline), loaded once on first call."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                with metrics.timed('spacy_load'):
+                    _nlp = load_ner_pipeline(NLP_MODEL)
+    return _nlp
+
+def get_ner_pool(processes):
+    """This process's NER worker pool (see entities.ner_pool) with at least ``processes`` workers.
+
+    Started on first use and kept for later calls; a process forked from the
+    one that started it (a gunicorn worker) starts its own.
+    """
+    global _ner_pool
+    with _nlp_lock:
+        pid, workers, pool = _ner_pool
+        if pid != os.getpid() or workers < processes:
+            if pid == os.getpid():
+                pool.shutdown(wait=False)
+            pool = ner_pool(NLP_MODEL, processes)
+            _ner_pool = (os.getpid(), processes, pool)
+        return pool
+
+def discard_ner_pool():
+    """Drop this process's NER pool, e.g. after a worker died, so the next call starts a new one."""
+    global _ner_pool
+    with _nlp_lock:
+        pid, _, pool = _ner_pool
+        if pid == os.getpid():
+            pool.shutdown(wait=False)
+        _ner_pool = (None, 0, None)
+
+def extract_entities(articles, batch_size=None, n_process=None):
+    """Run NER over the given articles and replace their stored entities.
+
+    Each article's title and (capped, segmented) body go through the NER
+    pipeline, in the worker pool when there are enough texts to keep more
+    than one process busy and in-process otherwise.
+    """
+    articles = [a for a in articles if a.id is not None]
+    if not articles:
+        return 0
+    batch_size = batch_size or NLP_BATCH_SIZE
+    owners, texts = [], []
+    for a in articles:
+        for segment in text_segments((a.title or '') + '\n' + (a.full_text or ''), NLP_SEGMENT_CHARS, NLP_MAX_CHARS):
+            owners.append(a.id)
+            texts.append(segment)
+    n_process = pipe_processes(len(texts), batch_size, NLP_PROCESSES if n_process is None else n_process)
+    found = {a.id: {} for a in articles}  # entity text -> label, in order of first mention
+    if n_process > 1:
+        entities = pool_entities(get_ner_pool(n_process), texts, batch_size, NER_LABELS)
+    else:
+        entities = ([(ent.text, ent.label_) for ent in doc.ents if ent.label_ in NER_LABELS]
+                    for doc in get_nlp().pipe(texts, batch_size=batch_size))
+    try:
+        for article_id, ents in zip(owners, metrics.timed_iter(entities, 'spacy')):
+            for ent_text, label in ents:
+                found[article_id].setdefault(ent_text, label)
+    except BrokenProcessPool:
+        # A worker exited (e.g. the model failed to load in it); the next run starts a new pool
+        discard_ner_pool()
+        raise
+    rows = [{'article_id': article_id, 'text': ent_text, 'label': label}
+            for article_id, ents in found.items() for ent_text, label in ents.items()]
+    ArticleEntity.query.filter(ArticleEntity.article_id.in_(list(found))).delete(synchronize_session=False)
+    if rows:
+        db.session.execute(ArticleEntity.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+def load_entities(article_ids):
+    """Return {article_id: [entity text, ...]} for the given ids in a single query."""
+    entities = {}
+    if not article_ids:
+        return entities
+    rows = (ArticleEntity.query
+            .filter(ArticleEntity.article_id.in_(article_ids))
+            .order_by(ArticleEntity.id)
+            .with_entities(ArticleEntity.article_id, ArticleEntity.text))
+    for article_id, ent_text in rows:
+        entities.setdefault(article_id, []).append(ent_text)
+    return entities
+
+def matched_articles(hit_lists):
+    """Resolve lists of title-index hits to the {'title', 'source', 'url'} dicts stored as matches, in one query."""
+    ids = {key for matches in hit_lists for key, _ in matches}
+    if not ids:
+        return [[] for _ in hit_lists]
+    rows = {a.id: a for a in db.session.query(Article.id, Article.title, Article.source, Article.url).filter(Article.id.in_(ids))}
+    return [[{'title': rows[i].title, 'source': rows[i].source, 'url': rows[i].url} for i, _ in matches if i in rows]
+            for matches in hit_lists]
+
+def get_field(s, *keys, default=None):
+    for k in keys:
+        if k in s:
+            return s[k]
+    return default
+
+def normalize_exa_result(item):
+    """Turn one Exa result into {'article': column values, 'bd_matches': [...], 'intl_matches': [...]}.
+
+    Returns None when the result has no usable summary. Batches should use
+    parse_exa_result() and complete_records() to classify categories in one pass.
+    """
+    record = parse_exa_result(item)
+    if record is not None:
+        complete_records([record])
+    return record
+
+def parse_exa_result(item):
+    """normalize_exa_result() without the steps complete_records() does for a whole batch.
+
+    ``article['category']`` is None when Exa gave no category (or 'General'),
+    match lists Exa left empty are not searched for yet and the summary JSON
+    is not filled in.
+    """
+    summary = getattr(item, 'summary', None)
+    # Robust summary parsing
+    if summary and isinstance(summary, str):
+        try:
+            summary = json.loads(summary)
+        except Exception:
+            print("Warning: Could not parse summary as JSON.")
+    if not summary:
+        return None
+    art = {'url': item.url, 'title': item.title, 'content_hash': content_hash(item)}
+    if item.published_date:
+        art['published_at'] = datetime.datetime.fromisoformat(item.published_date.replace('Z','+00:00'))
+    else:
+        art['published_at'] = None
+    # Author extraction: if missing, try to extract from text
+    art['author'] = getattr(item, 'author', None)
+    if not art['author'] and item.text:
+        author_match = re.search(r'By\s+([A-Za-z\s]+)', item.text)
+        if author_match:
+            art['author'] = author_match.group(1).strip()
+    # Use Exa's category if present; complete_records() infers the rest
+    category = get_field(summary, 'category', default=None)
+    if category == "General":
+        category = None
+    # Source normalization
+    source = source_registry.lookup(get_field(summary, 'source', default='Unknown'))
+    if source is not None and source.group in (INDIAN, BD, INTL):
+        art['source'] = source.domain
+    else:
+        art['source'] = 'Other'
+    # Group of the publishing site, falling back to the one Exa reported
+    art['source_group'] = source_registry.group(item.url) or (source.group if source is not None else None)
+    # Sentiment normalization
+    sentiment_val = get_field(summary, 'sentiment', default='Neutral')
+    art['sentiment'] = safe_capitalize(sentiment_val, default='Neutral')
+    # Fact check normalization
+    fact_check_val = get_field(summary, 'fact_check', 'factCheck', default='Unverified')
+    if isinstance(fact_check_val, dict):
+        fact_check_status = fact_check_val.get('status', 'Unverified')
+    else:
+        fact_check_status = fact_check_val
+    art['fact_check'] = safe_capitalize(fact_check_status, default='Unverified')
+    # Summaries
+    comp = get_field(summary, 'comparison', default={})
+    art['bd_summary'] = get_field(comp, 'bangladeshi_media', 'bangladeshiMedia', default='Not covered')
+    art['int_summary'] = get_field(comp, 'international_media', 'internationalMedia', default='Not covered')
+    # Matches (always arrays)
+    bd_matches = get_field(summary, 'bangladeshi_matches', 'bangladeshiMatches', default=[])
+    intl_matches = get_field(summary, 'international_matches', 'internationalMatches', default=[])
+    if not isinstance(bd_matches, list):
+        bd_matches = []
+    if not isinstance(intl_matches, list):
+        intl_matches = []
+    art['image'] = getattr(item, 'image', None)
+    art['favicon'] = getattr(item, 'favicon', None)
+    art['score'] = getattr(item, 'score', None)
+    # Extras normalization: if links missing, extract from text
+    extras = getattr(item, 'extras', {})
+    if not extras.get('links') and item.text:
+        links = re.findall(r'https?://\S+', item.text)
+        extras['links'] = list(set(links))  # remove duplicates
+    art['extras'] = json.dumps(extras)
+    art['full_text'] = getattr(item, 'text', None)
+    art['category'] = category
+    art['mentions_bangladesh'] = mentions_bangladesh(art['title'], art['full_text'])
+    art['simhash'] = simhash(art['full_text'])
+    return {'article': art, 'bd_matches': bd_matches, 'intl_matches': intl_matches}
+
+def complete_records(records):
+    """Infer missing categories for parsed records in one classifier pass, then add their summary JSON.
+
+    Empty match lists are filled with similar stored titles first.
+    """
+    missing = [r['article'] for r in records if not r['article']['category']]
+    inferred = category_classifier.classify_many((art['title'], art['full_text']) for art in missing)
+    for art, category in zip(missing, inferred):
+        art['category'] = category
+    # Secondary fuzzy search for matches if empty; a re-fetched article must not match its stored copy
+    unmatched = [r for r in records if not r['bd_matches'] or not r['intl_matches']]
+    if unmatched:
+        sync_title_index()
+        own_ids = dict(db.session.query(Article.url, Article.id)
+                       .filter(Article.url.in_([r['article']['url'] for r in unmatched])))
+        searches = []  # (record, match list key, title-index hits)
+        for record in unmatched:
+            title, own_id = record['article']['title'], own_ids.get(record['article']['url'])
+            for field, group in (('bd_matches', 'bd_source'), ('intl_matches', 'intl_source')):
+                if not record[field]:
+                    searches.append((record, field, title_index.query(title, 0.7, group=group, exclude=own_id, limit=3)))
+        for (record, field, _), matches in zip(searches, matched_articles([hits for _, _, hits in searches])):
+            record[field] = matches
+    for record in records:
+        art = record['article']
+        # Store only the normalized summary
+        art['summary_json'] = json.dumps({
+            'source': art['source'],
+            'sentiment': art['sentiment'],
+            'fact_check': art['fact_check'],
+            'category': art['category'],
+            'comparison': {
+                'bangladeshi_media': art['bd_summary'],
+                'international_media': art['int_summary']
+            },
+            'bangladeshi_matches': record['bd_matches'],
+            'international_matches': record['intl_matches']
+        }, default=str)
+    return records
+
+# Exa result attributes a stored article is derived from; the per-query relevance score is left out
+CONTENT_HASH_FIELDS = ('url', 'title', 'published_date', 'author', 'text', 'summary', 'image', 'favicon', 'extras')
+
+def content_hash(item):
+    """Fingerprint of a raw Exa result, taken before normalization.
+
+    Values filled in from the database (fallback matches, inferred
+    categories) are left out, so the same result hashes the same however
+    the stored corpus has changed since it was last fetched.
+    """
+    payload = json.dumps([getattr(item, f, None) for f in CONTENT_HASH_FIELDS], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def match_rows(article_id, matches):
+    return [{'article_id': article_id, 'title': m.get('title', ''), 'source': m.get('source', ''), 'url': m.get('url', '')}
+            for m in matches[:3]]
+
+def write_articles(records, known_ids):
+    """Upsert articles and replace their matches and FTS rows; returns {url: id}.
+
+    ``known_ids`` maps URLs already in the table to their ids so only new
+    rows need an id lookup after the insert.
+    """
+    rows = [r['article'] for r in records]
+    # Read before the upsert overwrites them: the FTS rows of updated articles are removed by value
+    previous = fts_entries([known_ids[r['url']] for r in rows if r['url'] in known_ids])
+    # One multi-row VALUES statement; INGEST_BATCH_SIZE keeps it under SQLite's bound-parameter limit
+    stmt = upsert_insert(db.engine, Article.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['url'],
+        set_={c: stmt.excluded[c] for c in rows[0] if c != 'url'}
+    )
+    db.session.execute(stmt)
+    ids = {url: known_ids[url] for url in (r['url'] for r in rows) if url in known_ids}
+    new_urls = [r['url'] for r in rows if r['url'] not in ids]
+    if new_urls:
+        ids.update(db.session.query(Article.url, Article.id).filter(Article.url.in_(new_urls)))
+    article_ids = list(ids.values())
+    db.session.execute(BDMatch.__table__.delete().where(BDMatch.article_id.in_(article_ids)))
+    db.session.execute(IntMatch.__table__.delete().where(IntMatch.article_id.in_(article_ids)))
+    bd_rows = [m for r in records for m in match_rows(ids[r['article']['url']], r['bd_matches'])]
+    intl_rows = [m for r in records for m in match_rows(ids[r['article']['url']], r['intl_matches'])]
+    if bd_rows:
+        db.session.execute(BDMatch.__table__.insert(), bd_rows)
+    if intl_rows:
+        db.session.execute(IntMatch.__table__.insert(), intl_rows)
+    index_article_texts([(ids[r['url']], r['title'], r['full_text']) for r in rows], previous)
+    return ids
+
+def classify_records(records):
+    """Split a batch into records to write, unchanged re-fetches and syndicated copies.
+
+    Only articles of the same source group count as copies of each other,
+    so e.g. an Indian outlet's reprint of a Bangladeshi story is kept as the
+    Indian article the dashboard compares.
+
+    Returns ``(to_write, unchanged, links)`` where ``links`` holds
+    ``(url, canonical, distance)`` and ``canonical`` is an article id, or the
+    URL of an earlier record in the same batch.
+    """
+    urls = [r['article']['url'] for r in records]
+    stored_hashes = dict(db.session.query(Article.url, Article.content_hash).filter(Article.url.in_(urls)))
+    aliased = {url for (url,) in db.session.query(ArticleAlias.url).filter(ArticleAlias.url.in_(urls))}
+    sync_simhash_index()
+    near_hits = {r['article']['url']: simhash_index.query(r['article']['simhash'], SIMHASH_MAX_DISTANCE)
+                 for r in records if r['article']['simhash'] is not None
+                 and r['article']['url'] not in aliased and r['article']['url'] not in stored_hashes}
+    near_ids = {key for hits in near_hits.values() for key, _ in hits}
+    near_groups = dict(db.session.query(Article.id, Article.source_group)
+                       .filter(Article.id.in_(near_ids))) if near_ids else {}
+    to_write, unchanged, links = [], 0, []
+    batch_hashes = []  # (simhash, source group, url) of new records written by this batch
+    for record in records:
+        art = record['article']
+        url = art['url']
+        if url in aliased:
+            links.append((url, None, None))
+            continue
+        if url in stored_hashes:
+            if stored_hashes[url] == art['content_hash']:
+                unchanged += 1
+            else:
+                to_write.append(record)
+            continue
+        if art['simhash'] is not None:
+            group = art['source_group']
+            near = [(key, distance) for key, distance in near_hits[url] if near_groups.get(key) == group]
+            if near:
+                links.append((url, near[0][0], near[0][1]))
+                continue
+            same = [(hamming_distance(h, art['simhash']), u) for h, g, u in batch_hashes if g == group]
+            same = [s for s in same if s[0] <= SIMHASH_MAX_DISTANCE]
+            if same:
+                distance, canonical = min(same)
+                links.append((url, canonical, distance))
+                continue
+            batch_hashes.append((art['simhash'], group, url))
+        to_write.append(record)
+    return to_write, unchanged, links
+
+def persist_articles(records):
+    """Store a batch of normalized Exa results in a single transaction.
+
+    Records whose content hash matches the stored row are skipped, and new
+    URLs whose body is a near-copy of a stored (or earlier) article from the
+    same source group are recorded as aliases of it rather than stored. The rest are written with
+    one INSERT ... ON CONFLICT(url) DO UPDATE inside a savepoint. If that
+    fails the batch is retried item by item, each in its own savepoint, so one
+    bad record does not lose the rest. Dashboard entries and the dashboard
+    and time-series rollups are updated before the same commit.
+
+    Returns ``(ids, outcome)``: the ids of the written articles and counts of
+    inserted, updated, unchanged and duplicate records.
+    """
+    outcome = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicate': 0}
+    if not records:
+        return [], outcome
+    to_write, outcome['unchanged'], links = classify_records(records)
+    urls = [r['article']['url'] for r in to_write]
+    known_ids = dict(db.session.query(Article.url, Article.id).filter(Article.url.in_(urls))) if urls else {}
+    # Rollup days to recompute: where updated articles were, and where written ones land
+    touched_days = article_days(list(known_ids))
+    touched_days.update(r['article']['published_at'].date() for r in to_write if r['article']['published_at'])
+    stored = {}
+    if to_write:
+        try:
+            with db.session.begin_nested():
+                stored.update(write_articles(to_write, known_ids))
+        except Exception as e:
+            print(f"Batch upsert failed, retrying items individually: {e}")
+            for record in to_write:
+                try:
+                    with db.session.begin_nested():
+                        stored.update(write_articles([record], known_ids))
+                except Exception as e:
+                    print(f"Error storing article {record['article'].get('title')}: {e}")
+    written = [(stored[r['article']['url']], r['article']['title'], r['article']['url'], r['article']['source'])
+               for r in to_write if r['article']['url'] in stored]
+    outcome['inserted'] = sum(1 for w in written if w[2] not in known_ids)
+    outcome['updated'] = len(written) - outcome['inserted']
+    now = datetime.datetime.utcnow()
+    aliases = []
+    for url, canonical, distance in links:
+        if canonical is None:
+            outcome['duplicate'] += 1  # already linked by an earlier run
+            continue
+        article_id = stored.get(canonical) if isinstance(canonical, str) else canonical
+        if article_id is not None:
+            aliases.append({'url': url, 'article_id': article_id, 'distance': distance, 'created_at': now})
+            outcome['duplicate'] += 1
+    try:
+        if aliases:
+            db.session.execute(upsert_insert(db.engine, ArticleAlias.__table__).values(aliases).on_conflict_do_nothing())
+        # Titles are indexed before the commit so dashboard verdicts see the whole batch
+        sync_title_index()
+        for article_id, title, url, source in written:
+            # Re-add so retitled articles replace their old index entry
+            title_index.add(article_id, title, title_groups(url, source))
+        refresh_dashboard_entries({w[0] for w in written} | dashboard_repair_ids(written))
+        if written:
+            refresh_article_rollup(touched_days)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # Drop entries for rows that were never committed; the indexes rebuild lazily
+        title_index.clear()
+        simhash_index.clear()
+        raise
+    for record in to_write:
+        art = record['article']
+        if art['url'] in stored and art['simhash'] is not None:
+            simhash_index.add(stored[art['url']], art['simhash'])
+    for article_id, *_ in written:
+        print(f"Committed Article: {article_id}")
+    return [w[0] for w in written], outcome
+
+def make_exa_client():
+    """Exa client for ingestion; EXA_BASE_URL points it at another server (e.g. a local fake)."""
+    from exa_py import Exa
+    base_url = os.getenv('EXA_BASE_URL')
+    if base_url:
+        return Exa(api_key=EXA_API_KEY, base_url=base_url)
+    return Exa(api_key=EXA_API_KEY)
+
+def fetch_exa_results(client=None, queries=None, shard_size=None, concurrency=None, rate=None, retries=None):
+    """Search Exa for every (query, domain shard) pair concurrently; returns results de-duplicated by URL."""
+    plan = plan_requests(
+        queries or EXA_QUERIES,
+        EXA_INCLUDE_DOMAINS,
+        EXA_SHARD_SIZE if shard_size is None else shard_size,
+        category="news",
+        text=True,
+        num_results=100,
+        livecrawl="always",
+        summary=EXA_SUMMARY,
         extras={"links": 1}
     )
-    print(f"Total results: {len(result.results)}")
-    for idx, item in enumerate(result.results):
+    print(f"Issuing {len(plan)} Exa requests")
+    return fan_out(
+        client or make_exa_client(),
+        plan,
+        concurrency=EXA_CONCURRENCY if concurrency is None else concurrency,
+        rate=EXA_RATE_LIMIT if rate is None else rate,
+        retries=EXA_MAX_RETRIES if retries is None else retries
+    )
+
+def run_exa_ingestion(client=None, progress=None, **fetch_options):
+    """Fetch, store and enrich the latest Exa results.
+
+    ``progress`` is called with keyword updates (stage and fetched/processed/
+    skipped/failed plus inserted/updated/unchanged/duplicate counts) as the
+    run advances. Returns the final counts, or None when no Exa API key is
+    configured.
+    """
+    callback = progress or (lambda **fields: None)
+    stages = metrics.StageTimer(ingestion_stage_seconds)
+
+    def progress(**fields):
+        if 'stage' in fields:
+            stages.start(fields['stage'])
+        callback(**fields)
+
+    if not EXA_API_KEY and client is None:
+        print("Error: EXA_API_KEY environment variable not set")
+        return None
+    print("Running advanced Exa ingestion for Bangladesh-related news coverage by Indian Media...")
+    progress(stage='fetching')
+    results = fetch_exa_results(client, **fetch_options)
+    print(f"Total results: {len(results)}")
+    counts = {'fetched': len(results), 'processed': 0, 'skipped': 0, 'failed': 0,
+              'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicate': 0}
+    progress(stage='normalizing', **counts)
+    records = {}
+    for idx, item in enumerate(results):
         try:
             print(f"\nProcessing item {idx + 1}:")
             print("Title:", item.title)
             print("URL:", item.url)
-            summary = getattr(item, 'summary', None)
-            # Robust summary parsing
-            if summary and isinstance(summary, str):
-                try:
-                    summary = json.loads(summary)
-                except Exception:
-                    print("Warning: Could not parse summary as JSON.")
-            if not summary:
+            record = parse_exa_result(item)
+            if record is None:
                 print("No summary available, skipping.")
+                counts['skipped'] += 1
                 continue
-            # Normalize and validate fields
-            def get_field(s, *keys, default=None):
-                for k in keys:
-                    if k in s:
-                        return s[k]
-                return default
-            art = Article.query.filter_by(url=item.url).first() or Article(url=item.url)
-            art.title = item.title
-            if item.published_date:
-                art.published_at = datetime.datetime.fromisoformat(item.published_date.replace('Z','+00:00'))
-            else:
-                art.published_at = None
-            # Author extraction: if missing, try to extract from text
-            art.author = getattr(item, 'author', None)
-            if not art.author and item.text:
-                author_match = re.search(r'By\s+([A-Za-z\s]+)', item.text)
-                if author_match:
-                    art.author = author_match.group(1).strip()
-            # Use Exa's category if present, otherwise infer
-            category = get_field(summary, 'category', default=None)
-            if not category or category == "General":
-                category = infer_category(item.title, getattr(item, 'text', None))
-            # Source normalization
-            source = get_field(summary, 'source', default='Unknown')
-            if source.lower() in indian_sources:
-                art.source = source
-            elif source.lower() in bd_sources:
-                art.source = source
-            elif source.lower() in intl_sources:
-                art.source = source
-            else:
-                art.source = 'Other'
-            # Sentiment normalization
-            sentiment_val = get_field(summary, 'sentiment', default='Neutral')
-            sentiment = safe_capitalize(sentiment_val, default='Neutral')
-            art.sentiment = sentiment
-            # Fact check normalization
-            fact_check_val = get_field(summary, 'fact_check', 'factCheck', default='Unverified')
-            if isinstance(fact_check_val, dict):
-                fact_check_status = fact_check_val.get('status', 'Unverified')
-            else:
-                fact_check_status = fact_check_val
-            fact_check = safe_capitalize(fact_check_status, default='Unverified')
-            art.fact_check = fact_check
-            # Summaries
-            comp = get_field(summary, 'comparison', default={})
-            art.bd_summary = get_field(comp, 'bangladeshi_media', 'bangladeshiMedia', default='Not covered')
-            art.int_summary = get_field(comp, 'international_media', 'internationalMedia', default='Not covered')
-            # Matches (always arrays)
-            bd_matches = get_field(summary, 'bangladeshi_matches', 'bangladeshiMatches', default=[])
-            intl_matches = get_field(summary, 'international_matches', 'internationalMatches', default=[])
-            if not isinstance(bd_matches, list):
-                bd_matches = []
-            if not isinstance(intl_matches, list):
-                intl_matches = []
-            # Secondary fuzzy search for matches if empty
-            if not bd_matches:
-                bd_matches = [{'title': a.title, 'source': a.source, 'url': a.url} for a in Article.query.filter(Article.source.in_(bd_sources)).all() if SequenceMatcher(None, a.title.lower(), item.title.lower()).ratio() > 0.7][:3]
-            if not intl_matches:
-                intl_matches = [{'title': a.title, 'source': a.source, 'url': a.url} for a in Article.query.filter(Article.source.in_(intl_sources)).all() if SequenceMatcher(None, a.title.lower(), item.title.lower()).ratio() > 0.7][:3]
-            art.image = getattr(item, 'image', None)
-            art.favicon = getattr(item, 'favicon', None)
-            art.score = getattr(item, 'score', None)
-            # Extras normalization: if links missing, extract from text
-            extras = getattr(item, 'extras', {})
-            if not extras.get('links') and item.text:
-                links = re.findall(r'https?://\S+', item.text)
-                extras['links'] = list(set(links))  # remove duplicates
-            art.extras = json.dumps(extras)
-            art.full_text = getattr(item, 'text', None)
-            # Store only the normalized summary
-            art.summary_json = json.dumps({
-                'source': art.source,
-                'sentiment': art.sentiment,
-                'fact_check': art.fact_check,
-                'category': category,
-                'comparison': {
-                    'bangladeshi_media': art.bd_summary,
-                    'international_media': art.int_summary
-                },
-                'bangladeshi_matches': bd_matches,
-                'international_matches': intl_matches
-            }, default=str)
-            db.session.add(art)
-            db.session.commit()
-            # Store matches
-            BDMatch.query.filter_by(article_id=art.id).delete()
-            for m in bd_matches[:3]:
-                db.session.add(BDMatch(article_id=art.id, title=m.get('title', ''), source=m.get('source', ''), url=m.get('url', '')))
-            IntMatch.query.filter_by(article_id=art.id).delete()
-            for m in intl_matches[:3]:
-                db.session.add(IntMatch(article_id=art.id, title=m.get('title', ''), source=m.get('source', ''), url=m.get('url', '')))
-            db.session.commit()
-            print(f"Committed Article: {art.id}")
+            # A URL returned twice keeps its last occurrence, as the per-item writes used to
+            if records.pop(item.url, None) is not None:
+                counts['skipped'] += 1
+            records[item.url] = record
         except Exception as e:
             print(f"Error processing article {getattr(item, 'title', None)}: {e}")
+            counts['failed'] += 1
+    # Categories Exa left out are inferred for the whole batch at once
+    records = complete_records(list(records.values()))
+    progress(stage='storing', **counts)
+    committed_ids = []
+    for i in range(0, len(records), INGEST_BATCH_SIZE):
+        batch = records[i:i + INGEST_BATCH_SIZE]
+        try:
+            stored, outcome = persist_articles(batch)
+        except Exception as e:
+            print(f"Error storing batch starting at item {i + 1}: {e}")
             db.session.rollback()
+            stored, outcome = [], {}
+        committed_ids.extend(stored)
+        handled = sum(outcome.values())
+        for key, n in outcome.items():
+            counts[key] += n
+        counts['processed'] += handled
+        counts['failed'] += len(batch) - handled
+        progress(**counts)
+    print(f"Inserted {counts['inserted']}, updated {counts['updated']}, unchanged {counts['unchanged']}, "
+          f"linked {counts['duplicate']} syndicated duplicates")
+    progress(stage='enriching')
+    # Named entities are extracted once here so the dashboard never runs spaCy per request
+    try:
+        stored = extract_entities(Article.query.options(load_only(Article.id, Article.title, Article.full_text))
+                                  .filter(Article.id.in_(committed_ids)).all())
+        print(f"Stored {stored} entities for {len(committed_ids)} articles")
+    except Exception as e:
+        print(f"Error extracting entities: {e}")
+        db.session.rollback()
+    try:
+        update_related_articles(Article.query.options(load_only(Article.id, Article.title))
+                                .filter(Article.id.in_(committed_ids)).all())
+    except Exception as e:
+        print(f"Error updating related articles: {e}")
+        db.session.rollback()
+    # A run that stored nothing leaves cached responses valid
+    if counts['inserted'] + counts['updated'] + counts['duplicate']:
+        try:
+            print(f"Data version is now {bump_data_version()}")
+        except Exception as e:
+            print(f"Error bumping data version: {e}")
+            db.session.rollback()
+    stages.stop()
+    for outcome in INGESTION_OUTCOMES:
+        ingestion_items.inc(counts[outcome], outcome=outcome)
+    ingestion_runs.inc(status='succeeded')
+    ingestion_last_success.set(time.time())
     print("\nDone.")
+    return counts
+
+# A queued/running job that has not reported progress for this long is treated as dead
+JOB_STALE_AFTER = datetime.timedelta(minutes=int(os.getenv('INGESTION_JOB_STALE_MINUTES', '30')))
+
+def update_job(job_id, **fields):
+    """Write job fields on a separate connection so progress is visible while ingestion's transaction is open."""
+    fields['updated_at'] = datetime.datetime.utcnow()
+    with db.engine.begin() as conn:
+        conn.execute(IngestionJob.__table__.update().where(IngestionJob.id == job_id).values(**fields))
+
+def enqueue_ingestion_job(trigger):
+    """Return ``(job, created)``: a new queued job, or the one already queued/running.
+
+    The unique ``active`` flag makes concurrent requests, from any process,
+    coalesce onto a single job.
+    """
+    now = datetime.datetime.utcnow()
+    current = IngestionJob.query.filter_by(active=True).first()
+    if current is not None and (current.updated_at or current.created_at) < now - JOB_STALE_AFTER:
+        current.status, current.active, current.finished_at = 'failed', None, now
+        current.error = 'Abandoned: no progress reported'
+        db.session.commit()
+        current = None
+    if current is not None:
+        return current, False
+    job = IngestionJob(status='queued', active=True, trigger=trigger, created_at=now, updated_at=now)
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request enqueued first
+        db.session.rollback()
+        return IngestionJob.query.filter_by(active=True).first(), False
+    return job, True
+
+def run_ingestion_job(job_id):
+    """Run ingestion for a queued job, recording progress, timings and the outcome."""
+    now = datetime.datetime.utcnow()
+    update_job(job_id, status='running', started_at=now)
+    try:
+        counts = run_exa_ingestion(progress=lambda **fields: update_job(job_id, **fields))
+    except Exception as e:
+        db.session.rollback()
+        ingestion_runs.inc(status='failed')
+        print(f"Ingestion job {job_id} failed: {e}")
+        update_job(job_id, status='failed', active=None, stage='done', error=str(e),
+                   finished_at=datetime.datetime.utcnow())
+        return
+    if counts is None:
+        update_job(job_id, status='failed', active=None, stage='done', error='EXA_API_KEY not set',
+                   finished_at=datetime.datetime.utcnow())
+        return
+    update_job(job_id, status='succeeded', active=None, stage='done', finished_at=datetime.datetime.utcnow(), **counts)
+
+def run_ingestion_job_with_context(app, job_id):
+    with app.app_context():
+        run_ingestion_job(job_id)
+
+def serialize_job(job):
+    def seconds(start, end):
+        return (end - start).total_seconds() if start and end else None
+    now = datetime.datetime.utcnow()
+    return {
+        'id': job.id,
+        'status': job.status,
+        'trigger': job.trigger,
+        'stage': job.stage,
+        'progress': {'fetched': job.fetched, 'processed': job.processed, 'skipped': job.skipped, 'failed': job.failed},
+        'outcome': {'inserted': job.inserted, 'updated': job.updated, 'unchanged': job.unchanged,
+                    'duplicate': job.duplicate},
+        'error': job.error,
+        'createdAt': job.created_at.isoformat() if job.created_at else None,
+        'startedAt': job.started_at.isoformat() if job.started_at else None,
+        'finishedAt': job.finished_at.isoformat() if job.finished_at else None,
+        'timings': {
+            'queuedSeconds': seconds(job.created_at, job.started_at or now),
+            'runSeconds': seconds(job.started_at, job.finished_at or now),
+        },
+    }
 
 # CLI command
-@app.cli.command('fetch-exa')
-def fetch_exa():
-    run_exa_ingestion()
+@api.cli.command('fetch-exa')
+@click.option('--query', 'queries', multiple=True, help='Topical query to run (repeatable); defaults to EXA_QUERIES.')
+@click.option('--shard-size', type=int, default=None, help='Domains per request; 0 sends the full domain list in one request.')
+@click.option('--concurrency', type=int, default=None, help='Parallel Exa requests.')
+@click.option('--rate', type=float, default=None, help='Exa requests per second across all workers.')
+def fetch_exa(queries, shard_size, concurrency, rate):
+    run_exa_ingestion(queries=list(queries) or None, shard_size=shard_size, concurrency=concurrency, rate=rate)
+
+@api.cli.command('backfill-entities')
+@click.option('--all', 'reprocess_all', is_flag=True, help='Re-extract entities for every article, not just those without any.')
+@click.option('--batch-size', default=1000, show_default=True, help='Articles loaded and committed per batch.')
+@click.option('--processes', type=int, default=None, help='NER worker processes (default NLP_PROCESSES).')
+def backfill_entities(reprocess_all, batch_size, processes):
+    """Extract and store named entities for existing articles."""
+    query = Article.query
+    if not reprocess_all:
+        query = query.filter(~Article.id.in_(db.session.query(ArticleEntity.article_id)))
+    last_id = 0
+    processed = 0
+    while True:
+        batch = (query.options(load_only(Article.id, Article.title, Article.full_text))
+                 .filter(Article.id > last_id).order_by(Article.id).limit(batch_size).all())
+        if not batch:
+            break
+        extract_entities(batch, n_process=processes)
+        last_id = batch[-1].id
+        processed += len(batch)
+        print(f"Processed {processed} articles (last id {last_id})")
+    bump_data_version()
+    print(f"Done. Extracted entities for {processed} articles.")
+
+@api.cli.command('rebuild-search-index')
+@click.option('--batch-size', default=500, show_default=True, help='Articles indexed per commit.')
+def rebuild_search_index(batch_size):
+    """Recreate the FTS5 search table and re-index every article."""
+    global _search_index_available
+    if db.engine.dialect.name != 'sqlite':
+        print("Full-text index is only available on SQLite; search falls back to ILIKE on titles.")
+        return
+    # Dropped rather than emptied so a table created with another definition is replaced too
+    db.session.execute(text("DROP TABLE IF EXISTS article_fts"))
+    db.session.execute(text(ARTICLE_FTS_DDL))
+    db.session.commit()
+    _search_index_available = True
+    last_id = 0
+    processed = 0
+    while True:
+        batch = (Article.query.options(load_only(Article.id, Article.title, Article.full_text))
+                 .filter(Article.id > last_id).order_by(Article.id).limit(batch_size).all())
+        if not batch:
+            break
+        for a in batch:
+            index_article_text(a)
+        db.session.commit()
+        last_id = batch[-1].id
+        processed += len(batch)
+    bump_data_version()
+    print(f"Done. Indexed {processed} articles.")
+
+@api.cli.command('rebuild-related')
+@click.option('--batch-size', default=500, show_default=True, help='Articles processed per commit.')
+def rebuild_related(batch_size):
+    """Recompute the related-article neighbour table for every article."""
+    sync_title_index()
+    RelatedArticle.query.delete()
+    db.session.commit()
+    last_id = 0
+    processed = 0
+    while True:
+        batch = (db.session.query(Article.id, Article.title)
+                 .filter(Article.id > last_id).order_by(Article.id).limit(batch_size).all())
+        if not batch:
+            break
+        for a in batch:
+            neighbours = title_index.query_top(a.title, RELATED_K, RELATED_THRESHOLD, exclude=a.id,
+                                               candidates=RELATED_CANDIDATES)
+            for key, score in neighbours:
+                db.session.add(RelatedArticle(article_id=a.id, related_id=key, score=score))
+        db.session.commit()
+        last_id = batch[-1].id
+        processed += len(batch)
+        print(f"Processed {processed} articles (last id {last_id})")
+    bump_data_version()
+    print(f"Done. Rebuilt related articles for {processed} articles.")
+
+@api.cli.command('rebuild-dashboard')
+@click.option('--batch-size', default=500, show_default=True, help='Articles processed per commit.')
+def rebuild_dashboard(batch_size):
+    """Recompute dashboard entries and rollups for every Indian-source article that mentions Bangladesh."""
+    DashboardEntry.query.delete()
+    DashboardRollup.query.delete()
+    db.session.commit()
+    sync_title_index()
+    last_id = 0
+    processed = 0
+    while True:
+        batch = [row.id for row in db.session.query(Article.id)
+                 .filter(Article.id > last_id, Article.mentions_bangladesh.is_(True),
+                         Article.source.in_(INDIAN_SOURCES))
+                 .order_by(Article.id).limit(batch_size)]
+        if not batch:
+            break
+        refresh_dashboard_entries(batch)
+        db.session.commit()
+        last_id = batch[-1]
+        processed += len(batch)
+        print(f"Processed {processed} articles (last id {last_id})")
+    bump_data_version()
+    print(f"Done. Rebuilt dashboard entries for {processed} articles.")
+
+@api.cli.command('rebuild-timeseries')
+def rebuild_timeseries():
+    """Recompute the article_rollup table behind /api/timeseries from every article."""
+    ArticleRollup.query.delete()
+    db.session.execute(ArticleRollup.__table__.insert().from_select(ARTICLE_ROLLUP_COLUMNS, article_rollup_select()))
+    db.session.commit()
+    bump_data_version()
+    print(f"Done. Rebuilt {ArticleRollup.query.count()} time-series rollup rows.")
+
+INGESTION_LEASE = 'ingestion'
+_lease_holder = (None, None)  # (pid, holder id)
+
+def lease_holder():
+    """Identifies this process as a lease holder; forked workers get their own id, not their master's."""
+    global _lease_holder
+    pid = os.getpid()
+    if _lease_holder[0] != pid:
+        _lease_holder = (pid, f"{socket.gethostname()}:{pid}:{os.urandom(4).hex()}")
+    return _lease_holder[1]
+
+def acquire_lease(name=INGESTION_LEASE, holder=None, seconds=SCHEDULER_LEASE_SECONDS):
+    """Take or renew the named lease; True if ``holder`` (default: this process) owns it afterwards.
+
+    A lease can be taken over once it has expired, so a dead holder is
+    replaced within ``seconds``. Uses its own connection so it never joins
+    an open session transaction.
+    """
+    holder = holder or lease_holder()
+    now = datetime.datetime.utcnow()
+    expires = now + datetime.timedelta(seconds=seconds)
+    table = SchedulerLease.__table__
+    with db.engine.begin() as conn:
+        renewed = conn.execute(
+            table.update()
+            .where(table.c.name == name)
+            .where((table.c.holder == holder) | (table.c.expires_at < now))
+            .values(holder=holder, expires_at=expires)
+        ).rowcount
+    if renewed:
+        return True
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(table.insert().values(name=name, holder=holder, expires_at=expires))
+    except IntegrityError:
+        # Held by another live process
+        return False
+    return True
+
+def release_lease(name=INGESTION_LEASE, holder=None):
+    """Give up the lease if held, so another process can take over immediately."""
+    holder = holder or lease_holder()
+    table = SchedulerLease.__table__
+    with db.engine.begin() as conn:
+        conn.execute(table.delete().where(table.c.name == name).where(table.c.holder == holder))
+
+def lease_heartbeat(app):
+    with app.app_context():
+        try:
+            acquire_lease()
+        except Exception as e:
+            print(f"Error renewing scheduler lease: {e}")
 
 # Scheduler uses the ingestion logic directly
-def run_exa_ingestion_with_context():
-    print(f"[{datetime.datetime.now()}] Scheduled Exa ingestion running...")
+def run_exa_ingestion_with_context(app):
+    with app.app_context():
+        if not acquire_lease():
+            return
+        print(f"[{datetime.datetime.now()}] Scheduled Exa ingestion running...")
+        job, created = enqueue_ingestion_job('scheduler')
+        if not created:
+            print(f"Ingestion job {job.id} is already {job.status}; skipping this run")
+            return
+        run_ingestion_job(job.id)
+
+def stop_scheduler(app):
+    scheduler.shutdown(wait=False)
     with app.app_context():
-        run_exa_ingestion()
+        try:
+            release_lease()
+        except Exception as e:
+            print(f"Error releasing scheduler lease: {e}")
 
 scheduler = BackgroundScheduler()
-scheduler.add_job(run_exa_ingestion_with_context, 'interval', minutes=10)
-scheduler.start()
+_scheduler_lock = threading.Lock()
 
-@app.route('/api/articles')
-def list_articles():
-    # Get query params
-    limit = request.args.get('limit', default=20, type=int)
-    offset = request.args.get('offset', default=0, type=int)
-    source = request.args.get('source')
-    sentiment = request.args.get('sentiment')
-    start = request.args.get('start')  # ISO date string
-    end = request.args.get('end')      # ISO date string
-    search = request.args.get('search')
+def start_scheduler(app):
+    """Run the lease heartbeat and scheduled ingestion for ``app`` in this process."""
+    with _scheduler_lock:
+        if scheduler.running:
+            return
+        # The heartbeat keeps the lease alive while a long ingestion run is in progress
+        scheduler.add_job(lease_heartbeat, 'interval', args=[app], seconds=max(1, SCHEDULER_LEASE_SECONDS // 3),
+                          next_run_time=datetime.datetime.now())
+        scheduler.add_job(run_exa_ingestion_with_context, 'interval', args=[app], minutes=10)
+        scheduler.start()
+    atexit.register(stop_scheduler, app)
+
+@api.before_app_request
+def start_background_scheduler():
+    """Start the scheduler in the process serving requests, not in a master that forks workers (see create_app)."""
+    if current_app.config.get('START_SCHEDULER') and not scheduler.running:
+        start_scheduler(current_app._get_current_object())
+
+def match_list(matches):
+    return [{'title': m.title, 'source': m.source, 'url': m.url} for m in matches]
+
+# Article response fields -> (columns or relationship they load, serializer)
+ARTICLE_FIELDS = {
+    'id':                    (['id'], lambda a: a.id),
+    'title':                 (['title'], lambda a: a.title),
+    'url':                   (['url'], lambda a: a.url),
+    'publishedDate':         (['published_at'], lambda a: a.published_at.isoformat() if a.published_at else None),
+    'author':                (['author'], lambda a: a.author),
+    'score':                 (['score'], lambda a: a.score),
+    'text':                  (['full_text'], lambda a: a.full_text),
+    'summary':               (['summary_json'], lambda a: json.loads(a.summary_json) if a.summary_json else None),
+    'image':                 (['image'], lambda a: a.image),
+    'favicon':               (['favicon'], lambda a: a.favicon),
+    'extras':                (['extras'], lambda a: json.loads(a.extras) if a.extras else None),
+    'source':                (['source'], lambda a: a.source),
+    'sentiment':             (['sentiment'], lambda a: a.sentiment),
+    'fact_check':            (['fact_check'], lambda a: a.fact_check),
+    'bangladeshi_summary':   (['bd_summary'], lambda a: a.bd_summary),
+    'international_summary': (['int_summary'], lambda a: a.int_summary),
+    'bangladeshi_matches':   ('bd_matches', lambda a: match_list(a.bd_matches)),
+    'international_matches': ('int_matches', lambda a: match_list(a.int_matches)),
+}
+# view=compact drops the heavy text/JSON columns
+COMPACT_FIELDS = [f for f in ARTICLE_FIELDS if f not in ('text', 'summary', 'extras')]
+
+def requested_fields():
+    """Resolve the fields=/view= query params to a list of article response fields."""
+    fields = request.args.get('fields')
+    if fields:
+        selected = [f.strip() for f in fields.split(',') if f.strip() in ARTICLE_FIELDS]
+        if selected:
+            return selected
+    if request.args.get('view') == 'compact':
+        return COMPACT_FIELDS
+    return list(ARTICLE_FIELDS)
+
+def project_articles(query, fields, extra_columns=()):
+    """Load only the columns behind ``fields`` and bulk-load requested matches (one IN query each)."""
+    columns = {'id', *extra_columns}
+    options = []
+    for field in fields:
+        loads, _ = ARTICLE_FIELDS[field]
+        if isinstance(loads, str):
+            options.append(selectinload(getattr(Article, loads)))
+        else:
+            columns.update(loads)
+    options.append(load_only(*[getattr(Article, c) for c in columns]))
+    return query.options(*options)
+
+def serialize_article(a, fields=ARTICLE_FIELDS):
+    return {field: ARTICLE_FIELDS[field][1](a) for field in fields}
+
+# Rows loaded per batch by /api/export; memory use is bounded by one batch
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# Filtered article counts per data version, shared by every page of a listing
+article_count_cache = MemoryCache(ttl=RESPONSE_CACHE_TTL, max_entries=1024, max_bytes=1024 * 1024)
+# Query params that select rows (as opposed to paging or shaping them)
+ARTICLE_FILTER_PARAMS = ('source', 'group', 'sentiment', 'category', 'start', 'end', 'search')
+
+# Date order of /api/articles and its keyset cursors. NULLs are placed explicitly because
+# backends disagree on the default (SQLite sorts them last under DESC, PostgreSQL first)
+LISTING_ORDER = [Article.published_at.desc().nullslast(), Article.id.desc()]
+
+def encode_cursor(article):
+    """Opaque keyset cursor for the (published_at, id) position of ``article``."""
+    published = article.published_at.isoformat() if article.published_at else None
+    raw = json.dumps([published, article.id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
 
-    # Build query
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        published, article_id = json.loads(raw)
+        published = datetime.datetime.fromisoformat(published) if published is not None else None
+    except Exception:
+        raise ValueError('invalid cursor')
+    if not isinstance(article_id, int):
+        raise ValueError('invalid cursor')
+    return published, article_id
+
+def after_cursor(query, cursor):
+    """Rows after the cursor in LISTING_ORDER: newest first, then undated articles, ties broken by id."""
+    published, article_id = decode_cursor(cursor)
+    if published is None:
+        return query.filter(Article.published_at.is_(None), Article.id < article_id)
+    return query.filter(db.or_(
+        Article.published_at < published,
+        db.and_(Article.published_at == published, Article.id < article_id),
+        Article.published_at.is_(None)
+    ))
+
+def count_articles(query):
+    """Row count of the filtered query, cached per filter set until the next ingestion."""
+    version = current_data_version()
+    if version is None:
+        return query.count()
+    key = cache_key(request.path, MultiDict(
+        [(k, v) for k, v in request.args.items(multi=True) if k in ARTICLE_FILTER_PARAMS]))
+    cached = article_count_cache.get(key, version)
+    if cached is not None:
+        return int(cached)
+    total = query.count()
+    article_count_cache.set(key, version, str(total).encode())
+    return total
+
+def filter_articles(args):
+    """Article query for the listing filters in ``args``, plus the FTS subquery (with a ``rank`` column) when searching."""
+    source = args.get('source')
+    group = args.get('group')  # indian, bd, intl or factcheck
+    sentiment = args.get('sentiment')
+    category = args.get('category')
+    start = args.get('start')  # ISO date string
+    end = args.get('end')      # ISO date string
+    search = args.get('search')
     query = Article.query
+    fts = None
     if source:
         query = query.filter(Article.source == source)
+    if group:
+        query = query.filter(Article.source_group == group)
     if sentiment:
         query = query.filter(Article.sentiment == sentiment)
+    if category:
+        query = query.filter(Article.category == category)
     if start:
         try:
             start_dt = datetime.datetime.fromisoformat(start)
@@ -404,247 +1813,217 @@ def list_articles():
             query = query.filter(Article.published_at <= end_dt)
         except Exception:
             pass
-    if search:
-        like = f"%{search}%"
-        query = query.filter((Article.title.ilike(like)) | (Article.full_text.ilike(like)))
+    if search and search_index_available():
+        match = fts_query(search)
+        if match is None:
+            query = query.filter(db.false())
+        else:
+            fts = (text("SELECT rowid AS id, bm25(article_fts, 5.0, 1.0) AS rank FROM article_fts WHERE article_fts MATCH :match")
+                   .bindparams(match=match)
+                   .columns(id=db.Integer, rank=db.Float)
+                   .subquery('fts'))
+            query = query.join(fts, fts.c.id == Article.id)
+    elif search:
+        # Bodies are stored compressed, so without the FTS index only titles are searchable
+        query = query.filter(Article.title.ilike(f"%{search}%"))
+    return query, fts
 
-    total = query.count()
-    articles = query.order_by(Article.published_at.desc()).limit(limit).offset(offset).all()
+@api.route('/api/articles')
+@cached_response
+def list_articles():
+    """Filtered article listing with offset or keyset pagination.
 
-    return jsonify({
-        'total': total,
+    Passing ``cursor`` (empty for the first page) switches to keyset paging
+    in date order: the response carries ``next_cursor`` and omits ``total``
+    unless ``total=exact`` is given. Offset paging keeps ``total``;
+    ``total=none`` skips it. Totals are cached per filter set.
+    """
+    # Get query params
+    limit = request.args.get('limit', default=20, type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    sort = request.args.get('sort')  # 'relevance' (default when searching) or 'date'
+    cursor = request.args.get('cursor')  # keyset paging when present
+    want_total = request.args.get('total', 'none' if cursor is not None else 'exact') != 'none'
+
+    query, fts = filter_articles(request.args)
+    order_by = LISTING_ORDER
+    if fts is not None and sort != 'date' and cursor is None:
+        # bm25 ranks lower-is-better; title hits weigh more than body hits
+        order_by = [fts.c.rank, *LISTING_ORDER]
+
+    total = count_articles(query) if want_total else None
+    fields = requested_fields()
+    if cursor is None:
+        articles = project_articles(query, fields).order_by(*order_by).limit(limit).offset(offset).all()
+        data = {'total': total} if want_total else {}
+        data.update({
+            'count': len(articles),
+            'results': [serialize_article(a, fields) for a in articles]
+        })
+        return jsonify(data)
+
+    page = query
+    if cursor:
+        try:
+            page = after_cursor(page, cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    # One extra row tells whether another page exists
+    articles = (project_articles(page, fields, extra_columns=['published_at'])
+                .order_by(*order_by).limit(limit + 1).all())
+    has_more = len(articles) > limit
+    articles = articles[:limit]
+    data = {'total': total} if want_total else {}
+    data.update({
         'count': len(articles),
-        'results': [
-            {
-                'id': a.id,
-                'title': a.title,
-                'url': a.url,
-                'publishedDate': a.published_at.isoformat() if a.published_at else None,
-                'author': a.author,
-                'score': a.score,
-                'text': a.full_text,
-                'summary': json.loads(a.summary_json) if a.summary_json else None,
-                'image': a.image,
-                'favicon': a.favicon,
-                'extras': json.loads(a.extras) if a.extras else None,
-        'source': a.source,
-        'sentiment': a.sentiment,
-                'fact_check': a.fact_check,
-                'bangladeshi_summary': a.bd_summary,
-                'international_summary': a.int_summary,
-                'bangladeshi_matches': [
-                    {'title': m.title, 'source': m.source, 'url': m.url}
-                    for m in BDMatch.query.filter_by(article_id=a.id)
-                ],
-                'international_matches': [
-                    {'title': m.title, 'source': m.source, 'url': m.url}
-                    for m in IntMatch.query.filter_by(article_id=a.id)
-                ]
-            }
-            for a in articles
-        ]
+        'results': [serialize_article(a, fields) for a in articles],
+        'next_cursor': encode_cursor(articles[-1]) if has_more and articles else None
     })
+    return jsonify(data)
 
-@app.route('/api/articles/<int:id>')
-def get_article(id):
-    a = Article.query.get_or_404(id)
-    # Find related articles by fuzzy title match (excluding itself)
-    def similar(a_title, b_title):
-        return SequenceMatcher(None, a_title, b_title).ratio() > 0.5  # adjust threshold as needed
+def export_cell(value):
+    """CSV cell for a serialized field; lists and dicts are written as JSON."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return '' if value is None else value
+
+def export_chunks(query, fields, fmt):
+    """Encoded export output, one chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer is not None:
+        writer.writerow(fields)
+    rows = 0
+    for a in query.yield_per(EXPORT_BATCH_SIZE):
+        data = serialize_article(a, fields)
+        if writer is not None:
+            writer.writerow([export_cell(data[f]) for f in fields])
+        else:
+            buffer.write(json.dumps(data, default=str))
+            buffer.write('\n')
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
 
-    all_articles = Article.query.filter(Article.id != id).all()
+@api.route('/api/export')
+def export_articles():
+    """Stream the filtered corpus as NDJSON or CSV in id order.
+
+    Takes the /api/articles filters and fields=/view= params; ``text=0``
+    drops full_text. Rows are read in batches of EXPORT_BATCH_SIZE and
+    written as they arrive, gzip-compressed when the client accepts it.
+    """
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    fields = requested_fields()
+    if request.args.get('text') in ('0', 'false', 'no'):
+        fields = [f for f in fields if f != 'text']
+    query, _ = filter_articles(request.args)
+    query = project_articles(query, fields).order_by(Article.id)
+    chunks = export_chunks(query, fields, fmt)
+    headers = {'Content-Disposition': f'attachment; filename=articles.{fmt}', 'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt], headers=headers)
+
+@api.route('/api/articles/<int:id>')
+def get_article(id):
+    a = Article.query.options(undefer_group('content')).filter_by(id=id).first_or_404()
+    # Related articles are precomputed at ingest time (see update_related_articles)
+    related_rows = (db.session.query(Article.id, Article.title, Article.source, Article.category, Article.sentiment, Article.url)
+                    .join(RelatedArticle, RelatedArticle.related_id == Article.id)
+                    .filter(RelatedArticle.article_id == id)
+                    .order_by(RelatedArticle.score.desc(), RelatedArticle.related_id))
     related = [
         {
             'id': art.id,
             'title': art.title,
             'source': art.source,
-            'category': art.summary_json and json.loads(art.summary_json).get('category', 'General'),
+            'category': art.category or 'General',
             'sentiment': art.sentiment,
             'url': art.url
         }
-        for art in all_articles
-        if similar((art.title or '').lower(), (a.title or '').lower())
-    ][:5]  # limit to 5
-
-    return jsonify({
-        'id': a.id,
-        'title': a.title,
-        'url': a.url,
-        'publishedDate': a.published_at.isoformat() if a.published_at else None,
-        'author': a.author,
-        'score': a.score,
-        'text': a.full_text,
-        'summary': json.loads(a.summary_json) if a.summary_json else None,
-        'image': a.image,
-        'favicon': a.favicon,
-        'extras': json.loads(a.extras) if a.extras else None,
-        'source': a.source,
-        'sentiment': a.sentiment,
-        'fact_check': a.fact_check,
-        'bangladeshi_summary': a.bd_summary,
-        'international_summary': a.int_summary,
-        'bangladeshi_matches': [
-            {'title': m.title, 'source': m.source, 'url': m.url}
-            for m in BDMatch.query.filter_by(article_id=a.id)
-        ],
-        'international_matches': [
-            {'title': m.title, 'source': m.source, 'url': m.url}
-            for m in IntMatch.query.filter_by(article_id=a.id)
-        ],
-        'related_articles': related
-    })
-
-def infer_category(title, text):
-    title = (title or "").lower()
-    text = (text or "").lower()
-    content = f"{title} {text}"
-    category_keywords = [
-        ("Health", ["covid", "health", "hospital", "doctor", "vaccine", "disease", "virus", "medicine", "medical"]),
-        ("Politics", ["election", "minister", "government", "parliament", "politics", "cabinet", "bjp", "congress", "policy", "bill", "law"]),
-        ("Economy", ["economy", "gdp", "trade", "export", "import", "inflation", "market", "investment", "finance", "stock", "business"]),
-        ("Education", ["school", "university", "education", "student", "exam", "teacher", "college", "admission"]),
-        ("Security", ["security", "terror", "attack", "military", "army", "defence", "border", "police", "crime"]),
-        ("Sports", ["cricket", "football", "olympic", "match", "tournament", "player", "goal", "score", "team", "league"]),
-        ("Technology", ["tech", "ai", "robot", "software", "hardware", "internet", "startup", "app", "digital", "cyber"]),
-        ("Environment", ["climate", "environment", "pollution", "weather", "rain", "flood", "earthquake", "disaster", "wildlife"]),
-        ("International", ["us", "china", "pakistan", "bangladesh", "united nations", "global", "foreign", "international", "world"]),
-        ("Culture", ["festival", "culture", "art", "music", "movie", "film", "heritage", "tradition", "literature"]),
-        ("Science", ["science", "research", "study", "experiment", "discovery", "space", "nasa", "isro"]),
-        ("Business", ["business", "company", "corporate", "industry", "merger", "acquisition", "startup", "entrepreneur"]),
-        ("Crime", ["crime", "theft", "murder", "fraud", "scam", "arrest", "court", "trial"]),
+        for art in related_rows
     ]
-    for cat, keywords in category_keywords:
-        for kw in keywords:
-            if re.search(rf'\\b{re.escape(kw)}\\b', content):
-                return cat
-    return "General"
 
-@app.route('/api/dashboard')
-def dashboard():
-    def normalize_sentiment(s):
-        if not s:
-            return 'Neutral'
-        s = s.strip().capitalize()
-        if s in ['Positive', 'Negative', 'Neutral', 'Cautious']:
-            return s
-        # Try to match common variants
-        if s.lower() == 'positive':
-            return 'Positive'
-        if s.lower() == 'negative':
-            return 'Negative'
-        if s.lower() == 'neutral':
-            return 'Neutral'
-        if s.lower() == 'cautious':
-            return 'Cautious'
-        return 'Neutral'
+    data = serialize_article(a)
+    data['related_articles'] = related
+    return jsonify(data)
 
+@api.route('/api/dashboard')
+@cached_response
+def dashboard():
     # Get category and source filter from query params
     filter_category = request.args.get('category')
     filter_source = request.args.get('source')
     # --- Date range filter ---
     start_date = request.args.get('start')
     end_date = request.args.get('end')
-    # Latest Indian News Monitoring (limit 20, Indian sources only)
-    indian_sources = [
-        "timesofindia.indiatimes.com", "hindustantimes.com", "ndtv.com", "thehindu.com", "indianexpress.com", "indiatoday.in", "news18.com", "zeenews.india.com", "aajtak.in", "abplive.com", "jagran.com", "bhaskar.com", "livehindustan.com", "business-standard.com", "economictimes.indiatimes.com", "livemint.com", "scroll.in", "thewire.in", "wionews.com", "indiatvnews.com", "newsnationtv.com", "jansatta.com", "india.com"
-    ]
-    latest_news_query = Article.query.filter(Article.source.in_(indian_sources))
+    # Entries are precomputed at ingest time (see refresh_dashboard_entries); the list
+    # filters on exact publish time, the rollup on publish day
+    entry_filters = []
+    rollup_filters = []
     if filter_source:
-        latest_news_query = latest_news_query.filter(Article.source == filter_source)
+        entry_filters.append(DashboardEntry.source == filter_source)
+        rollup_filters.append(DashboardRollup.source == filter_source)
+    if filter_category:
+        entry_filters.append(DashboardEntry.category == filter_category)
+        rollup_filters.append(DashboardRollup.category == filter_category)
     # --- Apply date filter if provided ---
     if start_date:
         try:
             start_dt = datetime.datetime.fromisoformat(start_date)
-            latest_news_query = latest_news_query.filter(Article.published_at >= start_dt)
+            entry_filters.append(Article.published_at >= start_dt)
+            rollup_filters.append(DashboardRollup.day >= start_dt.date())
         except Exception:
             pass
     if end_date:
         try:
             # Add 1 day to include the end date fully
             end_dt = datetime.datetime.fromisoformat(end_date) + datetime.timedelta(days=1)
-            latest_news_query = latest_news_query.filter(Article.published_at < end_dt)
+            entry_filters.append(Article.published_at < end_dt)
+            rollup_filters.append(DashboardRollup.day < end_dt.date())
         except Exception:
             pass
-    latest_news = latest_news_query.order_by(Article.published_at.desc()).all()
-    latest_news_data = []
-    # Prepare sets of Bangladeshi and International sources
-    bd_sources = set([
-        'thedailystar.net', 'bdnews24.com', 'newagebd.net', 'tbsnews.net', 'dhakatribune.com', 'prothomalo.com', 'jugantor.com', 'kalerkantho.com', 'banglatribune.com', 'manabzamin.com', 'bssnews.net', 'observerbd.com', 'daily-sun.com', 'dailyjanakantha.com', 'thefinancialexpress.com.bd', 'unb.com.bd', 'risingbd.com', 'bangladeshpost.net', 'daily-bangladesh.com', 'bhorerkagoj.com', 'dailyinqilab.com', 'samakal.com', 'ittefaq.com.bd', 'amardesh.com', 'dailynayadiganta.com', 'dailysangram.com', 'dailyprotidinersangbad.com', 'dailyvorerpata.com', 'dailyshomoyeralo.com', 'dailyamadershomoy.com', 'dailykalerkantho.com', 'dailysangbad.com', 'dailysun.com', 'dailyasianage.com', 'dailyobserverbd.com', 'dailynewnation.com', 'dailyindependentbd.com', 'dailyjanata.com', 'dailyjagaran.com', 'dailyjagonews24.com', 'dailyjagonews.com', 'dailyjagonewsbd.com', 'dailyjagonews24bd.com', 'dailyjagonews24.com.bd', 'dailyjagonews24.net', 'dailyjagonews24.org', 'dailyjagonews24.info', 'dailyjagonews24.biz', 'dailyjagonews24.co', 'dailyjagonews24.in', 'dailyjagonews24.us', 'dailyjagonews24.uk', 'dailyjagonews24.ca', 'dailyjagonews24.au', 'dailyjagonews24.eu', 'dailyjagonews24.asia', 'dailyjagonews24.africa', 'dailyjagonews24.mobi', 'dailyjagonews24.tv', 'dailyjagonews24.fm', 'dailyjagonews24.am', 'dailyjagonews24.cc', 'dailyjagonews24.cn', 'dailyjagonews24.hk', 'dailyjagonews24.jp', 'dailyjagonews24.kr', 'dailyjagonews24.sg', 'dailyjagonews24.tw', 'dailyjagonews24.vn', 'dailyjagonews24.ph', 'dailyjagonews24.id', 'dailyjagonews24.my', 'dailyjagonews24.th', 'dailyjagonews24.pk', 'dailyjagonews24.lk', 'dailyjagonews24.bd', 'dailyjagonews24.in', 'dailyjagonews24.com.bd', 'dailyjagonews24.net.bd', 'dailyjagonews24.org.bd', 'dailyjagonews24.info.bd', 'dailyjagonews24.biz.bd', 'dailyjagonews24.co.bd', 'dailyjagonews24.in.bd', 'dailyjagonews24.us.bd', 'dailyjagonews24.uk.bd', 'dailyjagonews24.ca.bd', 'dailyjagonews24.au.bd', 'dailyjagonews24.eu.bd', 'dailyjagonews24.asia.bd', 'dailyjagonews24.africa.bd', 'dailyjagonews24.mobi.bd', 'dailyjagonews24.tv.bd', 'dailyjagonews24.fm.bd', 'dailyjagonews24.am.bd', 'dailyjagonews24.cc.bd', 'dailyjagonews24.cn.bd', 'dailyjagonews24.hk.bd', 'dailyjagonews24.jp.bd', 'dailyjagonews24.kr.bd', 'dailyjagonews24.sg.bd', 'dailyjagonews24.tw.bd', 'dailyjagonews24.vn.bd', 'dailyjagonews24.ph.bd', 'dailyjagonews24.id.bd', 'dailyjagonews24.my.bd', 'dailyjagonews24.th.bd', 'dailyjagonews24.pk.bd'])
-    intl_sources = set([
-        'bbc.com', 'cnn.com', 'aljazeera.com', 'reuters.com', 'apnews.com', 'theguardian.com', 'nytimes.com', 'washingtonpost.com', 'dw.com', 'france24.com', 'abc.net.au', 'cbc.ca', 'cbsnews.com', 'nbcnews.com', 'foxnews.com', 'sky.com', 'japantimes.co.jp', 'straitstimes.com', 'channelnewsasia.com', 'scmp.com', 'gulfnews.com', 'arabnews.com', 'rt.com', 'tass.com', 'sputniknews.com', 'chinadaily.com.cn', 'globaltimes.cn', 'lemonde.fr', 'spiegel.de', 'elpais.com', 'corriere.it', 'elpais.com', 'lefigaro.fr', 'asahi.com', 'mainichi.jp', 'yomiuri.co.jp', 'koreatimes.co.kr', 'joongang.co.kr', 'hankyoreh.com', 'latimes.com', 'usatoday.com', 'bloomberg.com', 'forbes.com', 'wsj.com', 'economist.com', 'ft.com', 'npr.org', 'voanews.com', 'rferl.org', 'cbc.ca', 'cna.com.tw', 'straitstimes.com', 'thetimes.co.uk', 'independent.co.uk', 'telegraph.co.uk', 'mirror.co.uk', 'express.co.uk', 'dailymail.co.uk', 'thesun.co.uk', 'metro.co.uk', 'eveningstandard.co.uk', 'irishtimes.com', 'rte.ie', 'heraldscotland.com', 'scotsman.com', 'thejournal.ie', 'breakingnews.ie', 'irishmirror.ie', 'irishnews.com', 'belfasttelegraph.co.uk', 'news.com.au', 'smh.com.au', 'theage.com.au', 'theaustralian.com.au', 'afr.com', 'thewest.com.au', 'perthnow.com.au', 'adelaidenow.com.au', 'couriermail.com.au', 'heraldsun.com.au', 'dailytelegraph.com.au', 'ntnews.com.au', 'canberratimes.com.au', 'themercury.com.au', 'examiner.com.au', 'illawarramercury.com.au', 'newcastleherald.com.au', 'sunshinecoastdaily.com.au', 'goldcoastbulletin.com.au', 'thechronicle.com.au', 'northernstar.com.au', 'dailyexaminer.com.au', 'dailymercury.com.au', 'themorningbulletin.com.au', 'frasercoastchronicle.com.au', 'news-mail.com.au', 'observer.com.au', 'qt.com.au', 'warwickdailynews.com.au', 'westernadvocate.com.au', 'westernmagazine.com.au', 'westerntimes.com.au', 'theland.com.au', 'stockandland.com.au', 'queenslandcountrylife.com.au', 'northqueenslandregister.com.au', 'farmonline.com.au', 'theweeklytimes.com.au', 'countryman.com.au', 'farmweekly.com.au', 'stockjournal.com.au', 'theadvocate.com.au', 'examiner.com.au', 'mercury.com.au', 'thecourier.com.au', 'ballaratcourier.com.au', 'thecourier.com.au', 'thecouriermail.com.au', 'theherald.com.au', 'theheraldsun.com.au', 'themercury.com.au', 'thewest.com.au', 'theage.com.au', 'smh.com.au', 'theaustralian.com.au', 'afr.com', 'thewest.com.au', 'perthnow.com.au', 'adelaidenow.com.au', 'couriermail.com.au', 'heraldsun.com.au', 'dailytelegraph.com.au', 'ntnews.com.au', 'canberratimes.com.au', 'themercury.com.au', 'examiner.com.au', 'illawarramercury.com.au', 'newcastleherald.com.au', 'sunshinecoastdaily.com.au', 'goldcoastbulletin.com.au', 'thechronicle.com.au', 'northernstar.com.au', 'dailyexaminer.com.au', 'dailymercury.com.au', 'themorningbulletin.com.au', 'frasercoastchronicle.com.au', 'news-mail.com.au', 'observer.com.au', 'qt.com.au', 'warwickdailynews.com.au', 'westernadvocate.com.au', 'westernmagazine.com.au', 'westerntimes.com.au', 'theland.com.au', 'stockandland.com.au', 'queenslandcountrylife.com.au', 'northqueenslandregister.com.au', 'farmonline.com.au', 'theweeklytimes.com.au', 'countryman.com.au', 'farmweekly.com.au', 'stockjournal.com.au'])
-
-    def get_domain(url):
-        try:
-            return url.split('/')[2].replace('www.', '')
-        except Exception:
-            return url
-
-    # Preload all articles for matching
-    all_articles = list(Article.query.all())
-
-    for a in latest_news:
-        # --- Filter: Only include news that mention Bangladesh in title or full text ---
-        title_lower = (a.title or '').lower()
-        text_lower = (a.full_text or '').lower()
-        if 'bangladesh' not in title_lower and 'bangladesh' not in text_lower:
-            continue
-        # --- Category: Use summary_json category if present ---
-        category = None
-        if a.summary_json:
-            try:
-                summary_obj = json.loads(a.summary_json)
-                category = summary_obj.get('category')
-            except Exception:
-                category = None
-        if not category or category == "General":
-            category = infer_category(a.title, a.full_text)
-        if filter_category and category != filter_category:
-            continue
+    # Latest Indian News Monitoring (Indian sources mentioning Bangladesh)
+    latest_news = (db.session.query(DashboardEntry, Article.title, Article.url, Article.published_at)
+                   .join(Article, Article.id == DashboardEntry.article_id)
+                   .filter(*entry_filters)
+                   .order_by(Article.published_at.desc()))
+    latest_news_data = [
+        {
+            'date': published_at.isoformat() if published_at else None,
+            'headline': title,
+            'source': entry.source,
+            'category': entry.category,
+            'sentiment': entry.sentiment,
+            'fact_check': entry.verdict,
+            'fact_check_reason': entry.reason,
+            'detailsUrl': url,
+            'id': entry.article_id,
+            'entities': []
+        }
+        for entry, title, url, published_at in latest_news
+    ]
 
-        # --- Fact-checking logic ---
-        # Find similar articles in BD and International sources (simple fuzzy match on title)
-        def similar(a, b):
-            return SequenceMatcher(None, a, b).ratio() > 0.7
-        bd_matches = [art for art in all_articles if get_domain(art.url) in bd_sources and similar((art.title or '').lower(), title_lower)]
-        intl_matches = [art for art in all_articles if get_domain(art.url) in intl_sources and similar((art.title or '').lower(), title_lower)]
-        agreements = 0
-        contradictions = 0
-        for match in bd_matches + intl_matches:
-            # Compare sentiment as a proxy for agreement
-            if match.sentiment and a.sentiment and match.sentiment.lower() == a.sentiment.lower():
-                agreements += 1
-            else:
-                contradictions += 1
-        if agreements > 0 and contradictions == 0:
-            fact_check = 'True'
-            reason = f"Matched with {agreements} sources, all agree."
-        elif contradictions > 0 and agreements == 0:
-            fact_check = 'False'
-            reason = f"Matched with {contradictions} sources, all contradict."
-        elif agreements > 0 and contradictions > 0:
-            fact_check = 'Mixed'
-            reason = f"Matched with {agreements} agreeing and {contradictions} contradicting sources."
-        else:
-            fact_check = 'Unverified'
-            reason = 'No matching articles found in Bangladeshi or International sources.'
-
-        # --- NER extraction ---
-        text_for_ner = (a.title or '') + '\n' + (a.full_text or '')
-        doc = nlp(text_for_ner)
-        entities = list(set([ent.text for ent in doc.ents if ent.label_ in ['PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT', 'WORK_OF_ART', 'LAW', 'LANGUAGE']]))
-
-        latest_news_data.append({
-            'date': a.publishedDate if hasattr(a, 'publishedDate') else (a.published_at.isoformat() if a.published_at else None),
-            'headline': a.title,
-            'source': a.source if a.source and a.source.lower() != 'unknown' else 'Other',
-            'category': category,
-            'sentiment': normalize_sentiment(a.sentiment),
-            'fact_check': fact_check,
-            'fact_check_reason': reason,
-            'detailsUrl': a.url,
-            'id': a.id,
-            'entities': entities
-        })
+    # --- NER: entities are precomputed at ingest time, read them in one query ---
+    entities_by_article = load_entities([item['id'] for item in latest_news_data])
+    for item in latest_news_data:
+        item['entities'] = entities_by_article.get(item['id'], [])
 
     # Timeline of Key Events (use major headlines/dates from filtered news)
     timeline_events = [
@@ -655,66 +2034,46 @@ def dashboard():
         for item in latest_news_data[:20]
     ]
 
-    # Language Press Comparison (distribution by language, from filtered news)
-    language_map = {
-        'timesofindia.indiatimes.com': 'English',
-        'hindustantimes.com': 'English',
-        'ndtv.com': 'English',
-        'thehindu.com': 'English',
-        'indianexpress.com': 'English',
-        'indiatoday.in': 'English',
-        'news18.com': 'English',
-        'zeenews.india.com': 'Hindi',
-        'aajtak.in': 'Hindi',
-        'abplive.com': 'Hindi',
-        'jagran.com': 'Hindi',
-        'bhaskar.com': 'Hindi',
-        'livehindustan.com': 'Hindi',
-        'business-standard.com': 'English',
-        'economictimes.indiatimes.com': 'English',
-        'livemint.com': 'English',
-        'scroll.in': 'English',
-        'thewire.in': 'English',
-        'wionews.com': 'English',
-        'indiatvnews.com': 'Hindi',
-        'newsnationtv.com': 'Hindi',
-        'jansatta.com': 'Hindi',
-        'india.com': 'English',
-    }
-    lang_dist = {}
-    for item in latest_news_data:
-        lang = language_map.get(item['source'], 'Other')
-        lang_dist[lang] = lang_dist.get(lang, 0) + 1
+    def rollup_counts(column):
+        return dict(db.session.query(column, db.func.sum(DashboardRollup.count))
+                    .filter(*rollup_filters).group_by(column))
 
-    # Fact-Checking: Cross-Media Comparison (from filtered news)
-    agreement = sum(1 for item in latest_news_data if item['fact_check'] == 'True')
-    verification_status = 'Verified' if agreement > 0 else 'Unverified'
+    # Language Press Comparison (distribution by language, from the rollup)
+    lang_dist = {}
+    source_counts = rollup_counts(DashboardRollup.source)
+    for source, count in source_counts.items():
+        lang = SOURCE_LANGUAGES.get(source, 'Other')
+        lang_dist[lang] = lang_dist.get(lang, 0) + count
 
-    # Tone/Sentiment Analysis (from filtered news)
-    sentiments = [item['sentiment'] for item in latest_news_data]
-    sentiment_counts_raw = Counter(sentiments)
+    # Tone/Sentiment Analysis (from the rollup)
+    sentiment_counts_raw = rollup_counts(DashboardRollup.sentiment)
     allowed_keys = ['Negative', 'Neutral', 'Positive', 'Cautious']
     sentiment_counts = {k: sentiment_counts_raw.get(k, 0) for k in allowed_keys if sentiment_counts_raw.get(k, 0) > 0}
 
-    # --- Fact-checking verdict counts and samples ---
+    # --- Fact-checking verdict counts (rollup) and samples ---
     verdict_counts = {'True': 0, 'False': 0, 'Mixed': 0, 'Unverified': 0}
+    verdict_counts.update(rollup_counts(DashboardRollup.verdict))
     verdict_samples = {'True': [], 'False': [], 'Mixed': [], 'Unverified': []}
     last_updated = None
     for item in latest_news_data:
         v = item['fact_check']
-        verdict_counts[v] = verdict_counts.get(v, 0) + 1
-        if len(verdict_samples[v]) < 3:
+        if len(verdict_samples.setdefault(v, [])) < 3:
             verdict_samples[v].append({'headline': item['headline'], 'source': item['source'], 'date': item['date']})
         # Track last updated
         if not last_updated or (item['date'] and item['date'] > last_updated):
             last_updated = item['date']
 
+    # Fact-Checking: Cross-Media Comparison
+    agreement = verdict_counts['True']
+    verification_status = 'Verified' if agreement > 0 else 'Unverified'
+
     # --- Enhanced Implications & Analysis ---
     implications = []
     neg = sentiment_counts.get('Negative', 0)
     pos = sentiment_counts.get('Positive', 0)
     neu = sentiment_counts.get('Neutral', 0)
     total = sum(sentiment_counts.values())
+    neg_ratio = pos_ratio = neu_ratio = 0
     if total > 0:
         neg_ratio = neg / total
         pos_ratio = pos / total
@@ -761,9 +2120,9 @@ def dashboard():
         }
     ]
 
-    # Key Sources Used (all unique sources in the current filtered/latest news, sorted)
-    sources_in_latest = [item['source'] for item in latest_news_data if item['source'] and item['source'].lower() != 'unknown']
-    key_sources = sorted(set(sources_in_latest))
+    # Key Sources Used (all sources with entries under the current filters, sorted)
+    key_sources = sorted(source for source, count in source_counts.items()
+                         if count and source.lower() != 'unknown')
 
     return jsonify({
         'latestIndianNews': latest_news_data,
@@ -783,43 +2142,126 @@ def dashboard():
         'predictions': predictions
     })
 
-@app.route('/api/fetch-latest', methods=['POST'])
+# /api/timeseries bucket -> first day of the bucket containing a rollup day; weeks start on Monday.
+# Computed in Python over the grouped days so the buckets are the same on every backend
+TIMESERIES_BUCKETS = {
+    'day': lambda day: day,
+    'week': lambda day: day - datetime.timedelta(days=day.weekday()),
+}
+TIMESERIES_GROUPS = {
+    'sentiment': ArticleRollup.sentiment,
+    'source': ArticleRollup.source,
+    'category': ArticleRollup.category,
+    'group': ArticleRollup.source_group,
+}
+
+@api.route('/api/timeseries')
+@cached_response
+def timeseries():
+    """Article counts per day or week, split by sentiment, source, category or group.
+
+    Summed per day in SQL from article_rollup, then folded into buckets. Takes the source, group, category,
+    sentiment and start/end (ISO date) filters. ``counts`` in each series
+    line up with ``buckets``.
+    """
+    bucket = request.args.get('bucket', 'day')
+    group_by = request.args.get('group_by', 'sentiment')
+    if bucket not in TIMESERIES_BUCKETS:
+        return jsonify({'error': f"bucket must be one of {', '.join(TIMESERIES_BUCKETS)}"}), 400
+    if group_by not in TIMESERIES_GROUPS:
+        return jsonify({'error': f"group_by must be one of {', '.join(TIMESERIES_GROUPS)}"}), 400
+    filters = []
+    if request.args.get('source'):
+        filters.append(ArticleRollup.source == request.args['source'])
+    if request.args.get('group'):
+        filters.append(ArticleRollup.source_group == request.args['group'])
+    if request.args.get('category'):
+        filters.append(ArticleRollup.category == request.args['category'])
+    if request.args.get('sentiment'):
+        filters.append(ArticleRollup.sentiment == request.args['sentiment'])
+    start_date = request.args.get('start')
+    end_date = request.args.get('end')
+    if start_date:
+        try:
+            filters.append(ArticleRollup.day >= datetime.datetime.fromisoformat(start_date).date())
+        except Exception:
+            pass
+    if end_date:
+        try:
+            filters.append(ArticleRollup.day <= datetime.datetime.fromisoformat(end_date).date())
+        except Exception:
+            pass
+    bucket_start = TIMESERIES_BUCKETS[bucket]
+    key_col = TIMESERIES_GROUPS[group_by]
+    rows = (db.session.query(ArticleRollup.day, key_col, db.func.sum(ArticleRollup.count))
+            .filter(*filters)
+            .group_by(ArticleRollup.day, key_col)
+            .order_by(ArticleRollup.day))
+    buckets = {}
+    series = {}
+    for day, key, count in rows:
+        index = buckets.setdefault(bucket_start(day).isoformat(), len(buckets))
+        counts = series.setdefault(key or 'Unknown', [])
+        counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += count
+    for counts in series.values():
+        counts.extend([0] * (len(buckets) - len(counts)))
+    return jsonify({
+        'bucket': bucket,
+        'groupBy': group_by,
+        'buckets': list(buckets),
+        'series': [{'key': key, 'counts': counts, 'total': sum(counts)}
+                   for key, counts in sorted(series.items(), key=lambda item: -sum(item[1]))],
+        'total': sum(sum(counts) for counts in series.values()),
+    })
+
+@api.route('/api/fetch-latest', methods=['POST'])
 def fetch_latest_api():
-    run_exa_ingestion()
-    return jsonify({'status': 'success', 'message': 'Fetched latest news from Exa.'})
+    """Queue an ingestion run (or join the one in progress) and return immediately."""
+    job, created = enqueue_ingestion_job('api')
+    if created:
+        threading.Thread(target=run_ingestion_job_with_context, args=(current_app._get_current_object(), job.id),
+                         daemon=True).start()
+    response = jsonify({
+        'status': 'accepted',
+        'jobId': job.id,
+        'coalesced': not created,
+        'statusUrl': f'/api/jobs/{job.id}',
+        'job': serialize_job(job)
+    })
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return response, 202
 
-@app.route('/api/indian-sources')
+@api.route('/api/jobs/<int:id>')
+def get_job(id):
+    return jsonify(serialize_job(IngestionJob.query.get_or_404(id)))
+
+@api.route('/api/indian-sources')
 def indian_sources_api():
-    indian_sources = [
-        ("timesofindia.indiatimes.com", "The Times of India"),
-        ("hindustantimes.com", "Hindustan Times"),
-        ("ndtv.com", "NDTV"),
-        ("thehindu.com", "The Hindu"),
-        ("indianexpress.com", "The Indian Express"),
-        ("indiatoday.in", "India Today"),
-        ("news18.com", "News18"),
-        ("zeenews.india.com", "Zee News"),
-        ("aajtak.in", "Aaj Tak"),
-        ("abplive.com", "ABP Live"),
-        ("jagran.com", "Dainik Jagran"),
-        ("bhaskar.com", "Dainik Bhaskar"),
-        ("livehindustan.com", "Hindustan"),
-        ("business-standard.com", "Business Standard"),
-        ("economictimes.indiatimes.com", "The Economic Times"),
-        ("livemint.com", "Mint"),
-        ("scroll.in", "Scroll.in"),
-        ("thewire.in", "The Wire"),
-        ("wionews.com", "WION"),
-        ("indiatvnews.com", "India TV"),
-        ("newsnationtv.com", "News Nation"),
-        ("jansatta.com", "Jansatta"),
-        ("india.com", "India.com")
-    ]
     return jsonify([
-        {"domain": domain, "name": name} for domain, name in indian_sources]
+        {"domain": s.domain, "name": s.name} for s in source_registry.sources(INDIAN)]
     )
 
-@app.route('/api/health')
+@api.route('/api/cache-stats')
+def cache_stats_api():
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return jsonify({'backend': 'off', 'dataVersion': current_data_version()})
+    return jsonify(dict(response_cache.info(), dataVersion=current_data_version()))
+
+@api.route('/api/metrics')
+def metrics_api():
+    """Prometheus text exposition of this process's metrics."""
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        info = response_cache.info()
+        cache_lookups.set(info['hits'], result='hit')
+        cache_lookups.set(info['misses'], result='miss')
+        cache_entries.set(info['entries'])
+        cache_bytes.set(info['bytes'])
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/health')
 def health_check():
     try:
         # Check database connection
@@ -837,5 +2279,41 @@ def health_check():
             'timestamp': datetime.datetime.now().isoformat()
         }), 500
 
+def create_app(start_background=False):
+    """Build the Flask app: configuration, database engine, extensions and the api blueprint.
+
+    Importing this module only defines models and routes, so CLI commands
+    and migrations start quickly; ``flask`` finds this factory on its own.
+    With ``start_background`` spaCy is preloaded when PRELOAD_NLP is set and
+    the scheduler starts on the first request each process serves (unless
+    SCHEDULER_ENABLED=0), as servers want
+    (``flask --app 'app:create_app(start_background=True)' run`` or
+    ``gunicorn 'app:create_app(start_background=True)'``). Nothing but the
+    model is started here, so a ``gunicorn --preload`` master forks workers
+    with no scheduler threads; each worker drops the connections it inherits
+    (see database.dispose_after_fork) and holds the lease under its own id.
+    """
+    os.makedirs(instance_path, exist_ok=True)
+    app = Flask(__name__)
+    # DATABASE_URL overrides the bundled SQLite file (e.g. a scratch DB for benchmarks, or
+    # PostgreSQL with a driver such as psycopg installed); pool and SQLite PRAGMA settings are in database.py
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url(f'sqlite:///{db_path}')
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    print("Database URI:", make_url(app.config['SQLALCHEMY_DATABASE_URI']).render_as_string(hide_password=True))
+    db.init_app(app)
+    with app.app_context():
+        configure_engine(db.engine)
+        dispose_after_fork(db.engine)
+    migrate.init_app(app, db)
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=['X-Debug-Timing'])
+    app.json = TimedJSONProvider(app)
+    app.extensions['response_cache'] = make_response_cache()
+    app.register_blueprint(api)
+    if start_background and PRELOAD_NLP:
+        get_nlp()
+    app.config['START_SCHEDULER'] = start_background and SCHEDULER_ENABLED
+    return app
+
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    create_app(start_background=True).run(debug=True)
@@ -0,0 +1,72 @@
+"""Throughput benchmark for the category classifier.
+
+Classifies a synthetic corpus with the compiled ``CategoryClassifier`` (one
+call per article and via ``classify_many``) and with the previous approach
+of compiling one regex per keyword on every call, and prints articles per
+second for each.
+
+    cd backend && python benchmarks/classify.py [--articles 5000] [--words 300]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from categories import CATEGORY_KEYWORDS, CategoryClassifier
+
+FILLER = ('the a of and to in on for with said that was from by at as this has have '
+          'after over more new year people report officials city country week').split()
+
+
+def make_corpus(n_articles, n_words, seed=11):
+    """(title, text) pairs mixing filler words with keywords from random categories."""
+    rng = random.Random(seed)
+    keywords = [kw for _, kws in CATEGORY_KEYWORDS for kw in kws]
+    corpus = []
+    for _ in range(n_articles):
+        words = [rng.choice(keywords) if rng.random() < 0.05 else rng.choice(FILLER) for _ in range(n_words)]
+        corpus.append((' '.join(words[:10]).capitalize(), ' '.join(words[10:])))
+    return corpus
+
+
+def legacy_first_match(title, text):
+    """Previous implementation: keyword table and regexes rebuilt per call, first match wins."""
+    content = f"{(title or '').lower()} {(text or '').lower()}"
+    table = [(cat, list(kws)) for cat, kws in CATEGORY_KEYWORDS]
+    for cat, keywords in table:
+        for kw in keywords:
+            if re.search(rf'\b{re.escape(kw)}\b', content):
+                return cat
+    return "General"
+
+
+def timed(label, n, fn):
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  {n / elapsed:10.0f} articles/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=300)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.articles, args.words)
+    print(f"{args.articles} articles of {args.words} words\n")
+    started = time.perf_counter()
+    classifier = CategoryClassifier()
+    print(f"{'compile':<28} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    timed('legacy (per-call regexes)', len(corpus), lambda: [legacy_first_match(t, x) for t, x in corpus])
+    single = timed('classify', len(corpus), lambda: [classifier.classify(t, x) for t, x in corpus])
+    batch = timed('classify_many', len(corpus), lambda: classifier.classify_many(corpus))
+    assert single == batch
+
+
+if __name__ == '__main__':
+    main()
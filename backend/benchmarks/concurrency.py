@@ -0,0 +1,213 @@
+"""Read latency and failures while ingestion writes, with database.py's SQLite settings vs. SQLite's defaults.
+
+Loads a synthetic corpus (see corpus.py), then for each profile runs, in a
+fresh interpreter, ``--readers`` processes (like gunicorn workers)
+requesting the read endpoints and a full export through the Flask test
+client: first alone, then while a writer thread
+stores new articles with ``persist_articles()`` in ``--batch``-sized
+transactions, as scheduled ingestion does, and another thread records job
+progress with ``update_job()`` every ``--status-interval`` seconds, as the
+job runner and /api/fetch-latest do. Reports read latency percentiles,
+failed reads and writes (e.g. "database is locked") and write latency.
+
+The ``defaults`` profile is what the app used before: rollback journal,
+synchronous=FULL, pysqlite's 5 s busy timeout and SQLAlchemy's default
+pool. ``tuned`` is database.py's configuration. Exits non-zero if any read
+or write fails under ``tuned``.
+
+    cd backend && python benchmarks/concurrency.py [--articles 3000] [--readers 4] [--seconds 20] [--batch 10]
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from corpus import CorpusSpec, add_spec_arguments, exa_result, exa_result_dict, generate, load_corpus, spec_from_args
+from probe import run_probe
+from suite import ENDPOINTS
+
+# Environment for each profile's interpreter, on top of the current one
+PROFILES = {
+    'defaults': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_BUSY_TIMEOUT_MS': '5000',
+                 'SQLITE_MMAP_SIZE': '0', 'SQLITE_CACHE_SIZE_KB': '2000', 'DB_POOL_SIZE': '5', 'DB_MAX_OVERFLOW': '10'},
+    'tuned': {},
+}
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] if values else None
+
+
+def reader(app_module, flask_app, paths, max_id, seed, stop, results):
+    with flask_app.app_context():
+        # Connections inherited from the parent belong to it
+        app_module.db.engine.dispose(close=False)
+    client = flask_app.test_client()
+    rng = random.Random(seed)
+    latencies, failures = [], []
+    while not stop.is_set():
+        path = rng.choice(paths).format(article_id=rng.randint(1, max_id))
+        started = time.perf_counter()
+        response = client.get(path)
+        response.get_data()
+        if response.status_code == 200:
+            latencies.append((path.startswith('/api/export'), time.perf_counter() - started))
+        else:
+            failures.append(path)
+    results.put((latencies, failures))
+
+
+def writer(app_module, flask_app, spec, batch, stop, stats):
+    records = generate(CorpusSpec(**dict(spec, articles=10 ** 9, seed=spec['seed'] + 200)), start=spec['articles'] + 1)
+    with flask_app.app_context():
+        while not stop.is_set():
+            records_batch = app_module.complete_records([
+                app_module.parse_exa_result(exa_result(exa_result_dict(next(records)))) for _ in range(batch)])
+            started = time.perf_counter()
+            try:
+                ids, _ = app_module.persist_articles(records_batch)
+                stats['articles'] += len(ids)
+                stats['commits'] += 1
+            except Exception as e:
+                app_module.db.session.rollback()
+                stats['errors'].append(str(e).splitlines()[0])
+            stats['transaction_seconds'].append(time.perf_counter() - started)
+
+
+def status_writer(app_module, flask_app, job_id, interval, stop, stats):
+    with flask_app.app_context():
+        while not stop.wait(interval):
+            started = time.perf_counter()
+            try:
+                app_module.update_job(job_id, processed=len(stats['status_seconds']))
+            except Exception as e:
+                stats['errors'].append(str(e).splitlines()[0])
+            stats['status_seconds'].append(time.perf_counter() - started)
+
+
+def phase(app_module, flask_app, job_id, with_writer, spec, paths, readers, seconds, batch, status_interval):
+    context = multiprocessing.get_context('fork')
+    stop, reader_stop, results = threading.Event(), context.Event(), context.Queue()
+    stats = {'articles': 0, 'commits': 0, 'errors': [], 'transaction_seconds': [], 'status_seconds': []}
+    # Readers are forked before the writer threads start
+    processes = [context.Process(target=reader, args=(app_module, flask_app, paths, spec['articles'], i, reader_stop, results))
+                 for i in range(readers)]
+    for p in processes:
+        p.start()
+    threads = []
+    if with_writer:
+        threads.append(threading.Thread(target=writer, args=(app_module, flask_app, spec, batch, stop, stats)))
+        threads.append(threading.Thread(target=status_writer,
+                                        args=(app_module, flask_app, job_id, status_interval, stop, stats)))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    reader_stop.set()
+    latencies, failures = [], []
+    for _ in processes:
+        reader_latencies, reader_failures = results.get()
+        latencies += reader_latencies
+        failures += reader_failures
+    for p in processes:
+        p.join()
+    for t in threads:
+        t.join()
+    reads = [elapsed for export, elapsed in latencies if not export]
+    exports = [elapsed for export, elapsed in latencies if export]
+    result = {'reads': len(reads), 'failed_reads': len(failures), 'reads_per_second': len(reads) / seconds,
+              'p50_ms': percentile(reads, 50) * 1000, 'p95_ms': percentile(reads, 95) * 1000,
+              'p99_ms': percentile(reads, 99) * 1000, 'max_ms': max(reads) * 1000,
+              'exports': len(exports), 'export_p50_ms': (percentile(exports, 50) or 0) * 1000}
+    if with_writer:
+        result.update(articles_written=stats['articles'], commits=stats['commits'],
+                      failed_writes=len(stats['errors']), write_errors=sorted(set(stats['errors']))[:3],
+                      transaction_p95_ms=(percentile(stats['transaction_seconds'], 95) or 0) * 1000,
+                      status_writes=len(stats['status_seconds']),
+                      status_p95_ms=(percentile(stats['status_seconds'], 95) or 0) * 1000,
+                      status_max_ms=max(stats['status_seconds'], default=0) * 1000)
+    return result
+
+
+def measure(**settings):
+    """The idle and writing phases against DATABASE_URL; runs in a fresh interpreter (see probe.py)."""
+    import app as app_module
+    flask_app = app_module.create_app()
+    with flask_app.app_context():
+        app_module.sync_title_index()
+        app_module.sync_simhash_index()
+        job_id = app_module.enqueue_ingestion_job('benchmark')[0].id
+        app_module.db.session.remove()
+        app_module.db.engine.dispose()
+    # Ingestion logs every article it commits
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {'idle': phase(app_module, flask_app, job_id, False, **settings),
+                'writing': phase(app_module, flask_app, job_id, True, **settings)}
+
+
+def probe(db_path, profile, spec, args):
+    """Run the idle and writing phases for ``profile`` against a copy of ``db_path`` in a fresh interpreter."""
+    copy = f'{db_path}.{profile}'
+    shutil.copyfile(db_path, copy)
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{copy}", RESPONSE_CACHE_BACKEND='off', SCHEDULER_ENABLED='0',
+               **PROFILES[profile])
+    return run_probe(measure, env=env, spec=spec._asdict(), paths=list(ENDPOINTS.values()) + ['/api/export?format=ndjson'],
+                     readers=args.readers, seconds=args.seconds, batch=args.batch, status_interval=args.status_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads.')
+    parser.add_argument('--seconds', type=float, default=20, help='Length of each phase.')
+    parser.add_argument('--batch', type=int, default=10, help='Articles per write transaction.')
+    parser.add_argument('--status-interval', type=float, default=0.5, help='Seconds between job progress writes.')
+    parser.add_argument('--keep-dir', help='Keep the databases here instead of a temporary directory.')
+    parser.set_defaults(articles=3000)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+
+    workdir = args.keep_dir or tempfile.mkdtemp()
+    os.makedirs(workdir, exist_ok=True)
+    db_file = os.path.join(workdir, 'concurrency.db')
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    os.environ.update(DATABASE_URL=f'sqlite:///{db_file}', RESPONSE_CACHE_BACKEND='off', SCHEDULER_ENABLED='0')
+    import app as app_module
+    with app_module.create_app().app_context():
+        app_module.db.create_all()
+        load_corpus(app_module, spec)
+        # Closing the pool checkpoints the WAL into the file before it is copied
+        app_module.db.session.remove()
+        app_module.db.engine.dispose()
+
+    print(f"{spec.articles} articles, {args.readers} readers, writer batches of {args.batch}, {args.seconds:g}s per phase\n")
+    print(f"{'':<20} {'reads/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'failed':>7} {'exports':>8} {'p50':>9}")
+    results = {}
+    for profile in PROFILES:
+        results[profile] = probe(db_file, profile, spec, args)
+        for phase, r in results[profile].items():
+            print(f"{profile + ' ' + phase:<20} {r['reads_per_second']:8.1f} {r['p50_ms']:7.1f}ms {r['p95_ms']:7.1f}ms "
+                  f"{r['p99_ms']:7.1f}ms {r['max_ms']:7.1f}ms {r['failed_reads']:7d} {r['exports']:8d} {r['export_p50_ms']:7.0f}ms")
+            if phase == 'writing':
+                print(f"{'':<20} writer: {r['articles_written']} articles in {r['commits']} commits "
+                      f"(p95 {r['transaction_p95_ms']:.0f}ms); {r['status_writes']} job updates "
+                      f"(p95 {r['status_p95_ms']:.0f}ms, max {r['status_max_ms']:.0f}ms); {r['failed_writes']} failed")
+            for error in r.get('write_errors', []):
+                print(f"{'':<20} write error: {error}")
+    tuned = results['tuned']['writing']
+    if tuned['failed_reads'] or tuned['failed_writes']:
+        print("\nFAIL: requests failed under the tuned settings")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
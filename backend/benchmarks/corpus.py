@@ -0,0 +1,281 @@
+"""Synthetic news corpus generator for the benchmarks.
+
+Articles are generated deterministically from a ``CorpusSpec``: the share of
+Indian, Bangladeshi and international outlets, the mean body length, how
+many Bangladeshi/international matches each Indian article carries, and how
+many Indian articles mention Bangladesh. Bodies mix topical words with a
+Zipf-distributed filler vocabulary so they compress and tokenize like prose.
+
+The same records feed two paths:
+
+- ``exa_result()`` turns a record into an object shaped like an Exa search
+  result, for ingestion through a fake client (see fake_exa.py);
+- ``load_corpus()`` bulk-inserts records straight into the app's tables,
+  which is fast enough for 500k articles. Columns that ingestion derives
+  expensively (simhash, content_hash, entities, related articles) are left
+  empty, and dashboard verdicts are drawn at random instead of computed.
+
+    cd backend && python benchmarks/corpus.py --articles 1000 --out corpus.jsonl
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import random
+import sys
+from collections import Counter
+from types import SimpleNamespace
+from typing import NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sources import BD, INDIAN, INTL, registry
+
+TOPIC_WORDS = ('bangladesh india dhaka delhi border trade election flood cricket minister talks river water '
+               'treaty visa rail power export garment protest summit security government economy police '
+               'court market investment health hospital climate festival university').split()
+CATEGORIES = ['Politics', 'Economy', 'Security', 'Sports', 'International', 'Environment', 'Health', 'General']
+SENTIMENTS = ['Positive', 'Negative', 'Neutral', 'Cautious']
+VERDICTS = ['True', 'False', 'Mixed', 'Unverified']
+AUTHORS = ['Staff Reporter', 'Press Trust of India', 'Special Correspondent', None]
+
+
+class CorpusSpec(NamedTuple):
+    articles: int = 1000
+    # (group, weight) pairs for the publishing outlet
+    source_mix: tuple = ((INDIAN, 0.6), (BD, 0.2), (INTL, 0.2))
+    words: int = 400             # mean body length
+    match_density: float = 1.5   # mean Bangladeshi + international matches per Indian article
+    bangladesh_share: float = 0.7  # share of Indian articles that mention Bangladesh
+    days: int = 365
+    seed: int = 7
+
+
+def parse_mix(value):
+    """``indian=0.6,bd=0.2,intl=0.2`` -> source_mix tuple."""
+    mix = []
+    for part in value.split(','):
+        group, _, weight = part.partition('=')
+        if group.strip() not in (INDIAN, BD, INTL):
+            raise argparse.ArgumentTypeError(f"unknown source group {group!r}")
+        mix.append((group.strip(), float(weight)))
+    return tuple(mix)
+
+
+def add_spec_arguments(parser):
+    """Add the corpus shape options to an argparse parser."""
+    defaults = CorpusSpec()
+    parser.add_argument('--articles', type=int, default=defaults.articles)
+    parser.add_argument('--mix', type=parse_mix, default=defaults.source_mix,
+                        help='Source group weights, e.g. indian=0.6,bd=0.2,intl=0.2.')
+    parser.add_argument('--words', type=int, default=defaults.words, help='Mean body length in words.')
+    parser.add_argument('--match-density', type=float, default=defaults.match_density,
+                        help='Mean Bangladeshi + international matches per Indian article.')
+    parser.add_argument('--bangladesh-share', type=float, default=defaults.bangladesh_share)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def spec_from_args(args):
+    return CorpusSpec(articles=args.articles, source_mix=args.mix, words=args.words,
+                      match_density=args.match_density, bangladesh_share=args.bangladesh_share, seed=args.seed)
+
+
+def filler_vocabulary(rng, size=6000):
+    letters = 'etaoinshrdlucmfwypvbgkqjxz'
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(letters[:rng.randint(8, 26)]) for _ in range(rng.randint(2, 10))))
+    return sorted(words)
+
+
+def poisson(rng, mean):
+    """Small-mean Poisson sample (Knuth)."""
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def generate(spec, start=1):
+    """Yield ``spec.articles`` article records (plain dicts) with ids from ``start``."""
+    rng = random.Random(spec.seed)
+    filler = filler_vocabulary(rng)
+    vocabulary = list(TOPIC_WORDS) + filler
+    cum_weights = []
+    total = 0.0
+    for rank in range(len(vocabulary)):
+        total += 1 / (rank + 1)
+        cum_weights.append(total)
+    groups = [group for group, _ in spec.source_mix]
+    group_weights = [weight for _, weight in spec.source_mix]
+    domains = {group: [s.domain for s in registry.sources(group) if s.searched] for group in groups}
+    base = datetime.datetime(2025, 1, 1)
+    recent = {BD: [], INTL: []}  # latest articles of each group, candidates for matches
+    for i in range(start, start + spec.articles):
+        group = rng.choices(groups, group_weights)[0]
+        domain = rng.choice(domains[group])
+        published = base + datetime.timedelta(seconds=rng.randrange(spec.days * 86400))
+        # A couple of topical words in otherwise distinct headlines, like real ones
+        title_words = rng.choices(TOPIC_WORDS, k=2) + rng.choices(filler, k=rng.randint(5, 8))
+        rng.shuffle(title_words)
+        mentions = group != INDIAN or rng.random() < spec.bangladesh_share
+        if mentions and 'bangladesh' not in title_words:
+            title_words[rng.randrange(len(title_words))] = 'bangladesh'
+        elif not mentions:
+            title_words = [w for w in title_words if w != 'bangladesh'] or ['india']
+        title = ' '.join(title_words).capitalize()
+        n_words = max(20, int(rng.gauss(spec.words, spec.words / 4)))
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=n_words)
+        if not mentions:
+            words = [w for w in words if w != 'bangladesh']
+        body = '. '.join(' '.join(words[j:j + 16]).capitalize() for j in range(0, len(words), 16)) + '.'
+        record = {
+            'id': i,
+            'url': f'https://{domain}/news/{published:%Y/%m/%d}/{i}',
+            'title': title,
+            'published_date': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'author': rng.choice(AUTHORS),
+            'text': body,
+            'image': f'https://{domain}/img/{i}.jpg',
+            'favicon': f'https://{domain}/favicon.ico',
+            'score': round(rng.random(), 4),
+            'extras': {'links': [f'https://{domain}/news/{rng.randrange(1, i + 1)}' for _ in range(rng.randint(0, 6))]},
+            'group': group,
+            'source': domain,
+            'sentiment': rng.choice(SENTIMENTS),
+            'category': rng.choice(CATEGORIES),
+            'bd_matches': [],
+            'intl_matches': [],
+        }
+        if group == INDIAN:
+            for _ in range(poisson(rng, spec.match_density)):
+                target = rng.choice((BD, INTL))
+                if recent[target]:
+                    match = rng.choice(recent[target])
+                    record['bd_matches' if target == BD else 'intl_matches'].append(match)
+            record['bd_matches'] = record['bd_matches'][:3]
+            record['intl_matches'] = record['intl_matches'][:3]
+            matched = record['bd_matches'] + record['intl_matches']
+            if matched and mentions:
+                # Coverage of the same story: reword the matched headline slightly
+                words = matched[0]['title'].lower().split()
+                words[rng.randrange(len(words))] = rng.choice(filler)
+                record['title'] = ' '.join(words).capitalize()
+        else:
+            pool = recent[group]
+            pool.append({'title': title, 'source': domain, 'url': record['url']})
+            if len(pool) > 200:
+                pool.pop(0)
+        yield record
+
+
+def exa_summary(record):
+    """Summary JSON string in the shape the Exa summary schema asks for."""
+    return json.dumps({
+        'source': record['source'],
+        'sentiment': record['sentiment'],
+        'category': record['category'],
+        'fact_check': {'status': 'verified' if record['bd_matches'] or record['intl_matches'] else 'unverified',
+                       'sources': [m['url'] for m in record['bd_matches'] + record['intl_matches']],
+                       'similarFactChecks': []},
+        'comparison': {'bangladeshi_media': 'Covered' if record['bd_matches'] else 'Not covered',
+                       'international_media': 'Covered' if record['intl_matches'] else 'Not covered'},
+        'bangladeshi_matches': record['bd_matches'],
+        'international_matches': record['intl_matches'],
+    })
+
+
+# Attributes of an Exa search result that ingestion reads
+EXA_RESULT_FIELDS = ('url', 'title', 'published_date', 'author', 'text', 'summary', 'image', 'favicon', 'score', 'extras')
+
+
+def exa_result_dict(record):
+    """A record as a recorded Exa result (plain dict, JSON-serializable)."""
+    result = {field: record.get(field) for field in EXA_RESULT_FIELDS if field != 'summary'}
+    result['summary'] = exa_summary(record)
+    return result
+
+
+def exa_result(fields):
+    """Attribute-style Exa result from a recorded result dict; mutable values are copied."""
+    fields = json.loads(json.dumps(fields))
+    return SimpleNamespace(**{field: fields.get(field) for field in EXA_RESULT_FIELDS})
+
+
+def load_corpus(app_module, spec, batch_size=1000, progress=True):
+    """Bulk-insert the corpus described by ``spec`` into the app's database, with its derived rows."""
+    from sqlalchemy import text
+    db = app_module.db
+    classify = app_module.category_classifier.classify
+    db.session.execute(text(app_module.ARTICLE_FTS_DDL))
+    rollup = Counter()
+    articles, bd, intl, fts, entries = [], [], [], [], []
+    rng = random.Random(spec.seed + 1)
+
+    def flush():
+        db.session.execute(app_module.Article.__table__.insert(), articles)
+        if bd:
+            db.session.execute(app_module.BDMatch.__table__.insert(), bd)
+        if intl:
+            db.session.execute(app_module.IntMatch.__table__.insert(), intl)
+        if entries:
+            db.session.execute(app_module.DashboardEntry.__table__.insert(), entries)
+        db.session.execute(text("INSERT INTO article_fts (rowid, title, full_text) VALUES (:id, :title, :full_text)"), fts)
+        db.session.commit()
+        for rows in (articles, bd, intl, fts, entries):
+            rows.clear()
+
+    for record in generate(spec):
+        i = record['id']
+        source = record['source'] if record['group'] in (INDIAN, BD, INTL) else 'Other'
+        category = record['category'] if record['category'] != 'General' else classify(record['title'], record['text'])
+        published = datetime.datetime.strptime(record['published_date'], '%Y-%m-%dT%H:%M:%SZ')
+        mentions = app_module.mentions_bangladesh(record['title'], record['text'])
+        articles.append({
+            'id': i, 'url': record['url'], 'title': record['title'], 'published_at': published,
+            'author': record['author'], 'source': source, 'sentiment': record['sentiment'],
+            'fact_check': 'Unverified', 'bd_summary': 'Not covered', 'int_summary': 'Not covered',
+            'image': record['image'], 'favicon': record['favicon'], 'score': record['score'],
+            'extras': json.dumps(record['extras']), 'full_text': record['text'], 'summary_json': exa_summary(record),
+            'category': category, 'source_group': record['group'], 'mentions_bangladesh': mentions,
+        })
+        bd.extend(dict(m, article_id=i) for m in record['bd_matches'])
+        intl.extend(dict(m, article_id=i) for m in record['intl_matches'])
+        fts.append({'id': i, 'title': record['title'], 'full_text': record['text']})
+        if source in app_module.INDIAN_SOURCES and mentions:
+            verdict = rng.choice(VERDICTS) if record['bd_matches'] or record['intl_matches'] else 'Unverified'
+            entry = {'article_id': i, 'day': published.date(), 'source': source, 'category': category,
+                     'sentiment': app_module.normalize_sentiment(record['sentiment']), 'verdict': verdict, 'reason': ''}
+            entries.append(entry)
+            rollup[(entry['day'], source, category, entry['sentiment'], verdict)] += 1
+        if len(articles) >= batch_size:
+            flush()
+            if progress:
+                print(f"  loaded {i} articles", end='\r')
+    if articles:
+        flush()
+    db.session.execute(app_module.DashboardRollup.__table__.insert(), [
+        {'day': d, 'source': s, 'category': c, 'sentiment': se, 'verdict': v, 'count': n}
+        for (d, s, c, se, v), n in rollup.items()])
+    db.session.execute(app_module.ArticleRollup.__table__.insert().from_select(
+        app_module.ARTICLE_ROLLUP_COLUMNS, app_module.article_rollup_select()))
+    db.session.commit()
+    if progress:
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument('--out', required=True, help='Write the records as Exa results, one JSON object per line.')
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    with open(args.out, 'w') as f:
+        for record in generate(spec):
+            f.write(json.dumps(exa_result_dict(record)) + '\n')
+    print(f"Wrote {spec.articles} results to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
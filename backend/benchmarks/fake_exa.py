@@ -0,0 +1,92 @@
+"""Exa stand-ins that replay recorded ``search_and_contents`` responses.
+
+A recording is a JSON-lines file with one line per request:
+``{"query": ..., "include_domains": [...], "results": [{result fields}, ...]}``.
+``RecordingClient`` wraps a real ``exa_py.Exa`` client and writes such a
+file; ``synthetic_recording()`` builds one from a generated corpus by
+handing each result to a request that searches its domain. ``ReplayClient``
+answers requests from a recording, so ingestion can be benchmarked without
+the network.
+"""
+import json
+import threading
+from types import SimpleNamespace
+
+from corpus import EXA_RESULT_FIELDS, exa_result, exa_result_dict
+
+
+def request_key(query, include_domains):
+    return query, tuple(include_domains or ())
+
+
+class ReplayClient:
+    """Answers ``search_and_contents`` with the recorded results for the same query and domains.
+
+    Unrecorded requests return no results and are counted in ``misses``.
+    """
+
+    def __init__(self, responses):
+        self._responses = {request_key(r['query'], r.get('include_domains')): r['results'] for r in responses}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.misses = 0
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+    def search_and_contents(self, query, **kwargs):
+        results = self._responses.get(request_key(query, kwargs.get('include_domains')))
+        with self._lock:
+            self.calls += 1
+            if results is None:
+                self.misses += 1
+        return SimpleNamespace(results=[exa_result(r) for r in results or []])
+
+
+class RecordingClient:
+    """Passes requests through to ``client`` and keeps each response for ``save()``."""
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        self.responses = []
+
+    def search_and_contents(self, query, **kwargs):
+        response = self._client.search_and_contents(query, **kwargs)
+        results = [{field: getattr(item, field, None) for field in EXA_RESULT_FIELDS} for item in response.results]
+        with self._lock:
+            self.responses.append({'query': query, 'include_domains': kwargs.get('include_domains'), 'results': results})
+        return response
+
+    def save(self, path):
+        write_recording(path, self.responses)
+
+
+def write_recording(path, responses):
+    with open(path, 'w') as f:
+        for response in responses:
+            f.write(json.dumps(response, default=str) + '\n')
+
+
+def synthetic_recording(records, plan):
+    """Recorded responses for the request ``plan`` (see exa_fetch.plan_requests) serving ``records``.
+
+    Each record goes to one request whose domains include its outlet,
+    rotating across the matching requests so every query returns some.
+    """
+    responses = [{'query': r['query'], 'include_domains': r.get('include_domains'), 'results': []} for r in plan]
+    by_domain = {}
+    for response in responses:
+        for domain in response['include_domains'] or ():
+            by_domain.setdefault(domain, []).append(response)
+    turn = {}
+    for record in records:
+        candidates = by_domain.get(record['source'])
+        if not candidates:
+            continue
+        n = turn.get(record['source'], 0)
+        turn[record['source']] = n + 1
+        candidates[n % len(candidates)]['results'].append(exa_result_dict(record))
+    return responses
@@ -0,0 +1,97 @@
+"""Entity-extraction throughput: the full spaCy pipeline vs. the NER-only one, across worker processes.
+
+Runs synthetic article texts (see corpus.py), capped and segmented as
+extract_entities() does, through ``spacy.load(model)`` in one process and
+through ``entities.load_ner_pipeline(model)`` with each ``--processes``
+count, and for counts above 1 through the spawned worker pool
+extract_entities() keeps (``entities.ner_pool()``, timed once its workers
+have loaded the model), and reports articles and characters per second.
+Exits non-zero if the pool's entities differ from the in-process ones, or
+if the trimmed pipeline finds different entities than the full one in more
+than ``--max-diff`` of the articles; some difference is expected, since the
+sentencizer splits sentences where the parser would not and no entity
+crosses a sentence boundary.
+
+    cd backend && python benchmarks/ner.py [--model en_core_web_sm] [--articles 500] [--processes 1,2,4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from corpus import add_spec_arguments, generate, spec_from_args
+from entities import load_ner_pipeline, ner_pool, pool_entities, text_segments
+
+
+def entities(nlp, texts, owners, batch_size, n_process):
+    """({article index: [(text, label), ...]}, seconds) for one pass over ``texts``."""
+    found = {}
+    started = time.perf_counter()
+    for owner, doc in zip(owners, nlp.pipe(texts, batch_size=batch_size, n_process=n_process)):
+        found.setdefault(owner, []).extend((ent.text, ent.label_) for ent in doc.ents)
+    return found, time.perf_counter() - started
+
+
+def pool_found(pool, texts, owners, batch_size, labels):
+    """Like entities(), through a worker pool whose workers have already loaded the model."""
+    found = {}
+    started = time.perf_counter()
+    for owner, ents in zip(owners, pool_entities(pool, texts, batch_size, labels)):
+        found.setdefault(owner, []).extend(ents)
+    return found, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument('--model', default=os.getenv('NLP_MODEL', 'en_core_web_sm'), help='spaCy package name or path.')
+    parser.add_argument('--processes', default=f'1,2,{os.cpu_count() or 1}', help='Comma-separated n_process values.')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--segment-chars', type=int, default=10000)
+    parser.add_argument('--max-chars', type=int, default=100000)
+    parser.add_argument('--max-diff', type=float, default=0.05, help='Allowed share of articles with different entities.')
+    parser.set_defaults(articles=500)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+
+    import spacy
+    owners, texts = [], []
+    for i, record in enumerate(generate(spec)):
+        for segment in text_segments(record['title'] + '\n' + record['text'], args.segment_chars, args.max_chars):
+            owners.append(i)
+            texts.append(segment)
+    chars = sum(map(len, texts))
+    full = spacy.load(args.model)
+    trimmed = load_ner_pipeline(args.model)
+    print(f"{spec.articles} articles ({len(texts)} segments, {chars / 1e6:.1f}M chars), model {args.model}")
+    print(f"full pipeline:    {', '.join(full.pipe_names)}")
+    print(f"trimmed pipeline: {', '.join(trimmed.pipe_names)}\n")
+
+    baseline, seconds = entities(full, texts, owners, args.batch_size, 1)
+    print(f"{'full':<16} {spec.articles / seconds:8.1f} articles/s {chars / seconds / 1000:8.0f}K chars/s")
+    reference = None
+    pool_differs = False
+    for n_process in sorted({int(n) for n in args.processes.split(',')}):
+        found, seconds = entities(trimmed, texts, owners, args.batch_size, n_process)
+        reference = reference or found
+        print(f"{f'trimmed x{n_process}':<16} {spec.articles / seconds:8.1f} articles/s {chars / seconds / 1000:8.0f}K chars/s")
+        if n_process > 1:
+            labels = {label for ents in reference.values() for _, label in ents}
+            with ner_pool(args.model, n_process) as pool:
+                list(pool_entities(pool, texts[:n_process * args.batch_size], args.batch_size, labels))
+                found, seconds = pool_found(pool, texts, owners, args.batch_size, labels)
+            pool_differs = pool_differs or found != reference
+            print(f"{f'pool x{n_process}':<16} {spec.articles / seconds:8.1f} articles/s {chars / seconds / 1000:8.0f}K chars/s")
+    differing = sum(1 for i in range(spec.articles) if baseline.get(i, []) != reference.get(i, []))
+    print(f"\n{differing} of {spec.articles} articles have different entities with the trimmed pipeline")
+    if pool_differs:
+        print("FAIL: the worker pool found different entities than the in-process pipeline")
+    if differing > args.max_diff * spec.articles:
+        print("FAIL: trimmed pipeline disagrees with the full one")
+    if pool_differs or differing > args.max_diff * spec.articles:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Run a benchmark measurement in a fresh interpreter.
+
+Startup time, peak memory and SQLite settings are per process, so the
+benchmarks measure them in a new interpreter rather than in the one that
+prepared the databases. ``run_probe()`` imports the module defining a probe
+function there, calls it with keyword arguments and returns what it returned.
+"""
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# Runs in the child interpreter; prints the probe's result as JSON on the last line
+CHILD = r'''
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from {module} import {function} as probe
+print(json.dumps(probe(**json.loads(sys.argv[2]))))
+'''
+
+
+def run_probe(function, env=None, **kwargs):
+    """Call ``function(**kwargs)`` in a new interpreter started in the backend directory and return its result.
+
+    ``function`` must be defined at module level in a benchmarks module (the
+    child imports it by name, so the script being run works too); the
+    arguments and the result must be JSON-serializable. ``env`` replaces the
+    environment, e.g. to point DATABASE_URL at another database. Raises
+    ``subprocess.CalledProcessError`` if the child fails.
+    """
+    module = os.path.splitext(os.path.basename(sys.modules[function.__module__].__file__))[0]
+    code = CHILD.format(module=module, function=function.__name__)
+    out = subprocess.run([sys.executable, '-c', code, BENCHMARKS_DIR, json.dumps(kwargs)], cwd=BACKEND_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
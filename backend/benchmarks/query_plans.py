@@ -0,0 +1,182 @@
+"""Query-plan regression check for the API endpoints.
+
+Builds a large synthetic SQLite database, calls each endpoint through the
+Flask test client while recording every SELECT it issues, then runs
+EXPLAIN QUERY PLAN on each statement. Exits non-zero if any statement
+reads a table with a full scan instead of an index.
+
+    cd backend && python benchmarks/query_plans.py [--articles 20000] [--keep-db path] [--verbose]
+"""
+import argparse
+import datetime
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+# Full scans that are expected, with the reason they are acceptable
+ALLOWED_SCANS = {
+    # One row per (day, source, category, sentiment, verdict); the unfiltered
+    # dashboard aggregates all of it by design
+    'dashboard_rollup': 'bounded rollup table',
+    'article_rollup': 'bounded rollup table',
+}
+
+# Endpoint requests exercised by the check
+ENDPOINTS = [
+    '/api/articles',
+    '/api/articles?view=compact',
+    '/api/articles?source=thehindu.com',
+    '/api/articles?sentiment=Negative',
+    '/api/articles?source=ndtv.com&sentiment=Positive',
+    '/api/articles?category=Economy',
+    '/api/articles?group=bd',
+    '/api/articles?start=2025-03-01&end=2025-03-15',
+    '/api/articles?offset=5000&limit=20&total=none',
+    '/api/articles?cursor=&limit=20',
+    '/api/articles?search=bangladesh+border',
+    '/api/articles?search=dhaka&sort=date',
+    '/api/articles?fields=id,title,bangladeshi_matches,international_matches',
+    '/api/articles/{article_id}',
+    '/api/dashboard',
+    '/api/dashboard?source=thehindu.com',
+    '/api/dashboard?category=Politics',
+    '/api/dashboard?start=2025-03-01&end=2025-03-07',
+    '/api/timeseries?bucket=day&group_by=sentiment',
+    '/api/timeseries?bucket=week&group_by=source&start=2025-02-01&end=2025-04-30',
+    '/api/timeseries?bucket=week&group_by=sentiment&category=Economy',
+]
+
+SOURCES = ['thehindu.com', 'ndtv.com', 'indiatoday.in', 'aajtak.in', 'scroll.in',
+           'thedailystar.net', 'bdnews24.com', 'bbc.com', 'reuters.com', 'Other']
+SENTIMENTS = ['Positive', 'Negative', 'Neutral', 'Cautious']
+CATEGORIES = ['Politics', 'Economy', 'Security', 'Sports', 'International', 'General']
+VERDICTS = ['True', 'False', 'Mixed', 'Unverified']
+WORDS = ('bangladesh india dhaka delhi border trade election flood cricket minister talks '
+         'river water treaty visa rail power export garment protest summit security').split()
+
+
+def build_corpus(app_module, n_articles, seed=7):
+    """Fill the app's database with ``n_articles`` synthetic articles and their derived rows."""
+    from sqlalchemy import text
+    db = app_module.db
+    rng = random.Random(seed)
+    base = datetime.datetime(2025, 1, 1)
+    articles, bd, intl, fts, entries = [], [], [], [], []
+    rollup = {}
+    for i in range(1, n_articles + 1):
+        source = rng.choice(SOURCES)
+        title = ' '.join(rng.choice(WORDS) for _ in range(8)).capitalize()
+        published = base + datetime.timedelta(minutes=rng.randrange(0, 180 * 24 * 60))
+        sentiment = rng.choice(SENTIMENTS)
+        category = rng.choice(CATEGORIES)
+        body = ' '.join(rng.choice(WORDS) for _ in range(60))
+        articles.append({'id': i, 'url': f'https://{source}/story/{i}', 'title': title, 'published_at': published,
+                         'source': source, 'sentiment': sentiment, 'fact_check': 'Unverified',
+                         'full_text': body, 'summary_json': f'{{"category": "{category}"}}', 'extras': '{}',
+                         'category': category, 'mentions_bangladesh': 'bangladesh' in f'{title} {body}'.lower(),
+                         'source_group': app_module.source_registry.group(source)})
+        fts.append({'id': i, 'title': title, 'full_text': body})
+        for _ in range(2):
+            bd.append({'article_id': i, 'title': title, 'source': 'thedailystar.net', 'url': f'https://thedailystar.net/{i}'})
+            intl.append({'article_id': i, 'title': title, 'source': 'bbc.com', 'url': f'https://bbc.com/{i}'})
+        if source in app_module.INDIAN_SOURCES:
+            entry = {'article_id': i, 'day': published.date(), 'source': source, 'category': category,
+                     'sentiment': sentiment, 'verdict': rng.choice(VERDICTS), 'reason': ''}
+            entries.append(entry)
+            key = (entry['day'], source, entry['category'], sentiment, entry['verdict'])
+            rollup[key] = rollup.get(key, 0) + 1
+    db.session.execute(app_module.Article.__table__.insert(), articles)
+    db.session.execute(app_module.BDMatch.__table__.insert(), bd)
+    db.session.execute(app_module.IntMatch.__table__.insert(), intl)
+    db.session.execute(app_module.DashboardEntry.__table__.insert(), entries)
+    db.session.execute(app_module.DashboardRollup.__table__.insert(), [
+        {'day': d, 'source': s, 'category': c, 'sentiment': se, 'verdict': v, 'count': n}
+        for (d, s, c, se, v), n in rollup.items()])
+    db.session.execute(app_module.ArticleRollup.__table__.insert().from_select(
+        app_module.ARTICLE_ROLLUP_COLUMNS, app_module.article_rollup_select()))
+    db.session.execute(text(app_module.ARTICLE_FTS_DDL))
+    db.session.execute(text("INSERT INTO article_fts (rowid, title, full_text) VALUES (:id, :title, :full_text)"), fts)
+    db.session.commit()
+
+
+def full_scans(conn, statement, params, tables):
+    """Real tables the plan reads with a bare SCAN (no index)."""
+    plan = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, params).fetchall()
+    scanned = []
+    for row in plan:
+        detail = row[-1]
+        match = re.match(r'SCAN (?:TABLE )?(\w+)\s*$', detail)
+        if match and match.group(1) in tables:
+            scanned.append(match.group(1))
+    return scanned, [row[-1] for row in plan]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--keep-db', help='Write the synthetic database here instead of a temp file.')
+    parser.add_argument('--verbose', action='store_true', help='Print the plan of every query.')
+    args = parser.parse_args()
+
+    db_file = args.keep_db or os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_file}'
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'off'
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import app as app_module
+    from sqlalchemy import event
+
+    flask_app = app_module.create_app()
+    with flask_app.app_context():
+        app_module.db.create_all()
+        started = time.perf_counter()
+        build_corpus(app_module, args.articles)
+        print(f"Built {args.articles} articles in {time.perf_counter() - started:.1f}s ({db_file})")
+
+        engine = app_module.db.engine
+        captured = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and not executemany:
+                captured.append((statement, parameters))
+        event.listen(engine, 'before_cursor_execute', record)
+
+        client = flask_app.test_client()
+        article_id = args.articles // 2
+        failures = 0
+        with engine.connect() as conn:
+            tables = {name for (name,) in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for endpoint in ENDPOINTS:
+                url = endpoint.format(article_id=article_id)
+                captured.clear()
+                started = time.perf_counter()
+                status = client.get(url).status_code
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"\n{url}  -> {status} in {elapsed:.1f} ms, {len(captured)} queries")
+                for statement, params in list(captured):
+                    scanned, plan = full_scans(conn, statement, params, tables)
+                    bad = [t for t in scanned if t not in ALLOWED_SCANS]
+                    if args.verbose and not bad:
+                        print(f"  {' '.join(statement.split())[:120]}")
+                        for line in plan:
+                            print(f"      {line}")
+                    if bad:
+                        failures += 1
+                        print(f"  FULL SCAN of {', '.join(bad)}:\n    {' '.join(statement.split())[:300]}")
+                        for line in plan:
+                            print(f"      {line}")
+        event.remove(engine, 'before_cursor_execute', record)
+
+    if failures:
+        print(f"\n{failures} queries fell back to a full table scan")
+        sys.exit(1)
+    print("\nAll endpoint queries use indexes")
+
+
+if __name__ == '__main__':
+    main()
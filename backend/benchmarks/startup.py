@@ -0,0 +1,77 @@
+"""Startup-time and import-memory regression check.
+
+Imports the app in fresh interpreters, the way every CLI command, migration
+and worker boot does, and reports the wall time and peak RSS of each run.
+Exits non-zero if the median exceeds the limits or if importing pulled in a
+module that should only load on first use (spaCy, exa_py) or started the
+scheduler.
+
+    cd backend && python benchmarks/startup.py [--runs 5] [--max-seconds 3] [--max-rss-mb 150]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from probe import run_probe
+
+# Modules that must not be imported by `import app`
+LAZY_MODULES = ['spacy', 'exa_py']
+
+def import_app():
+    """Import the app (in a fresh interpreter, see probe.py) and report how long it took and what it loaded."""
+    import resource
+    started = time.perf_counter()
+    import app
+    elapsed = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        rss *= 1024
+    return {
+        'seconds': elapsed,
+        'rss_bytes': rss,
+        'loaded': [m for m in LAZY_MODULES if m in sys.modules],
+        'scheduler_running': app.scheduler.running,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=3.0, help='Limit on the median import time.')
+    parser.add_argument('--max-rss-mb', type=float, default=150.0, help='Limit on the median peak RSS after import.')
+    args = parser.parse_args()
+
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}",
+               RESPONSE_CACHE_BACKEND='memory')
+    runs = []
+    for i in range(args.runs):
+        result = run_probe(import_app, env=env)
+        runs.append(result)
+        print(f"run {i + 1}: {result['seconds'] * 1000:.0f} ms, {result['rss_bytes'] / 2**20:.1f} MB")
+
+    seconds = statistics.median(r['seconds'] for r in runs)
+    rss_mb = statistics.median(r['rss_bytes'] for r in runs) / 2**20
+    print(f"\nmedian import: {seconds * 1000:.0f} ms, peak RSS {rss_mb:.1f} MB")
+    problems = []
+    if seconds > args.max_seconds:
+        problems.append(f"import took {seconds:.2f}s (limit {args.max_seconds}s)")
+    if rss_mb > args.max_rss_mb:
+        problems.append(f"peak RSS {rss_mb:.1f} MB (limit {args.max_rss_mb} MB)")
+    loaded = sorted({m for r in runs for m in r['loaded']})
+    if loaded:
+        problems.append(f"import loaded {', '.join(loaded)}")
+    if any(r['scheduler_running'] for r in runs):
+        problems.append("import started the scheduler")
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        sys.exit(1)
+    print("Startup within limits")
+
+
+if __name__ == '__main__':
+    main()
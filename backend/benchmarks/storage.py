@@ -0,0 +1,212 @@
+"""Database size and load-memory benchmark for the compressed article columns.
+
+Builds a synthetic corpus with realistic-length bodies, extras and summaries,
+then writes two copies of it: one as stored now (zlib-compressed, see
+compressed.py, with a contentless search index) and one with the text
+columns stored as plain TEXT and a search index keeping its own copy of
+them, as before the compression migration. For each copy it reports the
+vacuumed file size, the part of it taken by the article table and by the
+FTS index (from SQLite's dbstat table), and in fresh interpreters the peak
+Python memory and time of a full ``Article`` scan (eagerly loading the text
+columns for the plain copy, the old default, and with them deferred for the
+compressed one) and of a few endpoint requests.
+Exits non-zero if the compressed database is not smaller.
+
+    cd backend && python benchmarks/storage.py [--articles 5000] [--words 600] [--keep-dir path]
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+
+from probe import BACKEND_DIR, run_probe
+
+# article_fts as created before it was made contentless
+PLAIN_FTS_DDL = ("CREATE VIRTUAL TABLE article_fts USING fts5("
+                 "title, full_text, tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+
+# Requests replayed by the endpoint probe
+PATHS = [
+    '/api/articles?limit=50',
+    '/api/articles?view=compact&limit=200',
+    '/api/articles/1',
+    '/api/articles/2',
+    '/api/export?format=ndjson',
+]
+
+SOURCES = ['thehindu.com', 'ndtv.com', 'indiatoday.in', 'aajtak.in', 'scroll.in', 'thedailystar.net', 'bbc.com']
+
+
+def make_vocabulary(rng, size=8000):
+    letters = 'etaoinshrdlucmfwypvbgkqjxz'
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(letters[:rng.randint(8, 26)]) for _ in range(rng.randint(2, 10))))
+    return sorted(words)
+
+
+def build_corpus(app_module, n_articles, n_words, seed=5):
+    """Insert ``n_articles`` articles with Zipf-distributed bodies through the app's table (so compressed) and index them."""
+    from sqlalchemy import text
+    app_module.db.session.execute(text(app_module.ARTICLE_FTS_DDL))
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    base = datetime.datetime(2025, 1, 1)
+    rows = []
+    for i in range(1, n_articles + 1):
+        words = rng.choices(vocabulary, weights, k=n_words)
+        title = ' '.join(words[:9]).capitalize()
+        body = '. '.join(' '.join(words[j:j + 15]).capitalize() for j in range(0, n_words, 15)) + '.'
+        source = rng.choice(SOURCES)
+        extras = {'links': [f'https://{source}/{"/".join(rng.choices(vocabulary, k=3))}' for _ in range(12)]}
+        summary = {'source': source, 'sentiment': 'Neutral', 'category': 'General',
+                   'fact_check': {'status': 'unverified', 'sources': [], 'similar_news': []},
+                   'bangladeshi_matches': [], 'international_matches': [],
+                   'summary': ' '.join(rng.choices(vocabulary, weights, k=60))}
+        rows.append({'id': i, 'url': f'https://{source}/story/{i}', 'title': title, 'source': source,
+                     'published_at': base + datetime.timedelta(minutes=i), 'sentiment': 'Neutral',
+                     'full_text': body, 'extras': json.dumps(extras), 'summary_json': json.dumps(summary),
+                     'category': 'General', 'source_group': app_module.source_registry.group(source)})
+        if len(rows) == 500:
+            insert_rows(app_module, rows)
+            rows = []
+    if rows:
+        insert_rows(app_module, rows)
+    app_module.db.session.commit()
+
+
+def insert_rows(app_module, rows):
+    app_module.db.session.execute(app_module.Article.__table__.insert(), rows)
+    app_module.index_article_texts([(r['id'], r['title'], r['full_text']) for r in rows])
+
+
+def decompress_copy(src, dst):
+    """Copy of ``src`` with the compressed columns rewritten as plain TEXT and the FTS index storing its content."""
+    shutil.copyfile(src, dst)
+    conn = sqlite3.connect(dst)
+    rows = conn.execute("SELECT id, extras, full_text, summary_json FROM article").fetchall()
+    conn.executemany("UPDATE article SET extras = ?, full_text = ?, summary_json = ? WHERE id = ?",
+                     [(*(zlib.decompress(v).decode() if v is not None else None for v in row[1:]), row[0])
+                      for row in rows])
+    conn.execute("DROP TABLE article_fts")
+    conn.execute(PLAIN_FTS_DDL)
+    conn.execute("INSERT INTO article_fts (rowid, title, full_text) SELECT id, title, full_text FROM article")
+    conn.commit()
+    conn.close()
+
+
+def vacuum(path):
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path)
+
+
+def table_sizes(path):
+    """Bytes of the article table and of the FTS index (its shadow tables), indexes included."""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("SELECT m.tbl_name, sum(d.pgsize) FROM dbstat d JOIN sqlite_master m ON m.name = d.name "
+                            "GROUP BY m.tbl_name").fetchall()
+    finally:
+        conn.close()
+    return {'article': sum(size for name, size in rows if name == 'article'),
+            'fts': sum(size for name, size in rows if name.startswith('article_fts'))}
+
+
+def measure(mode, eager, rounds, trace):
+    """One probe run: a full ``Article`` scan (``mode='scan'``) or ``rounds`` replays of PATHS.
+
+    Runs in a fresh interpreter (see probe.py). Memory is the tracemalloc
+    peak, taken in a separate run from the timing since tracing slows Python down.
+    """
+    import tracemalloc
+    from sqlalchemy.orm import undefer_group
+    import app
+    flask_app = app.create_app()
+
+    def run():
+        if mode == 'scan':
+            query = app.Article.query
+            if eager:
+                query = query.options(undefer_group('content'))
+            return len(query.all())
+        client = flask_app.test_client()
+        for _ in range(rounds):
+            for path in PATHS:
+                response = client.get(path)
+                assert response.status_code == 200, (path, response.status_code)
+                response.get_data()
+
+    with flask_app.app_context():
+        if trace:
+            tracemalloc.start()
+            run()
+            return {'peak_bytes': tracemalloc.get_traced_memory()[1]}
+        started = time.perf_counter()
+        run()
+        return {'seconds': time.perf_counter() - started}
+
+
+def probe(db_path, mode, eager=False, rounds=1):
+    """Time, then trace the peak memory of, one probe run in fresh interpreters."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", RESPONSE_CACHE_BACKEND='off', SCHEDULER_ENABLED='0')
+    result = {}
+    for trace in (False, True):
+        result.update(run_probe(measure, env=env, mode=mode, eager=eager, rounds=rounds, trace=trace))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=600)
+    parser.add_argument('--rounds', type=int, default=3, help='Times the endpoint requests are replayed.')
+    parser.add_argument('--keep-dir', help='Write the two databases here instead of a temporary directory.')
+    args = parser.parse_args()
+
+    workdir = args.keep_dir or tempfile.mkdtemp()
+    os.makedirs(workdir, exist_ok=True)
+    compressed_db = os.path.join(workdir, 'compressed.db')
+    plain_db = os.path.join(workdir, 'plain.db')
+    for path in (compressed_db, plain_db):
+        if os.path.exists(path):
+            os.remove(path)
+
+    os.environ.update(DATABASE_URL=f"sqlite:///{compressed_db}", RESPONSE_CACHE_BACKEND='memory', SCHEDULER_ENABLED='0')
+    sys.path.insert(0, BACKEND_DIR)
+    import app as app_module
+    with app_module.create_app().app_context():
+        app_module.db.create_all()
+        build_corpus(app_module, args.articles, args.words)
+        # Closing the pool checkpoints the WAL into the file before it is copied
+        app_module.db.session.remove()
+        app_module.db.engine.dispose()
+    decompress_copy(compressed_db, plain_db)
+
+    sizes = {'plain': vacuum(plain_db), 'compressed': vacuum(compressed_db)}
+    print(f"{args.articles} articles of {args.words} words\n")
+    print(f"{'':<12} {'db size':>10} {'article':>10} {'fts':>10} {'scan peak':>10} {'scan':>9} {'requests peak':>14} {'requests':>9}")
+    for label, path, eager in (('plain', plain_db, True), ('compressed', compressed_db, False)):
+        scan = probe(path, 'scan', eager)
+        requests = probe(path, 'requests', rounds=args.rounds)
+        tables = table_sizes(path)
+        print(f"{label:<12} {sizes[label] / 2**20:8.1f}MB {tables['article'] / 2**20:8.1f}MB {tables['fts'] / 2**20:8.1f}MB "
+              f"{scan['peak_bytes'] / 2**20:8.1f}MB "
+              f"{scan['seconds'] * 1000:7.0f}ms {requests['peak_bytes'] / 2**20:12.1f}MB {requests['seconds'] * 1000:7.0f}ms")
+    print(f"\ncompressed database is {sizes['compressed'] / sizes['plain']:.0%} of the plain one")
+    if sizes['compressed'] >= sizes['plain']:
+        print("FAIL: compression did not shrink the database")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""Per-endpoint and per-stage micro-benchmarks with a comparable JSON baseline.
+
+Loads a synthetic corpus (see corpus.py) into a temporary SQLite database,
+then times the read endpoints through the Flask test client and a full
+``run_exa_ingestion()`` against a replayed Exa client (see fake_exa.py),
+split into its fetching/normalizing/storing/enriching stages, once with new
+articles and once re-fetching them unchanged. Endpoints run ``--rounds``
+times after ``--warmup`` runs, ingestion ``--ingest-rounds`` times. Each
+benchmark reports latency statistics, the number of SQL statements issued
+and the peak Python heap (tracemalloc, from one extra traced run).
+
+``--save`` writes the results as JSON; ``--compare`` checks them against a
+saved baseline and exits non-zero if a median got slower by more than
+``--max-regression`` (and at least ``--min-delta-ms``) or a benchmark issues
+more queries than before.
+
+    cd backend && python benchmarks/suite.py [--articles 1000] [--ingest 100] [--rounds 5]
+        [--only dashboard] [--save baseline.json] [--compare baseline.json]
+        [--replay recording.jsonl] [--record recording.jsonl]
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from flask import current_app
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from corpus import add_spec_arguments, generate, load_corpus, spec_from_args
+from fake_exa import ReplayClient, synthetic_recording, write_recording
+
+# name -> request path; {article_id} is a mid-corpus article
+ENDPOINTS = {
+    'dashboard': '/api/dashboard',
+    'dashboard.filtered': '/api/dashboard?category=Politics&start=2025-03-01&end=2025-05-31',
+    'list_articles': '/api/articles',
+    'list_articles.compact': '/api/articles?view=compact&limit=100',
+    'list_articles.filtered': '/api/articles?source=ndtv.com&sentiment=Negative',
+    'list_articles.search': '/api/articles?search=dhaka+border',
+    'list_articles.cursor': '/api/articles?cursor=&limit=50',
+    'get_article': '/api/articles/{article_id}',
+    'timeseries.week': '/api/timeseries?bucket=week&group_by=sentiment',
+}
+INGEST_STAGES = ('fetching', 'normalizing', 'storing', 'enriching')
+
+
+class QueryCounter:
+    """Counts statements sent to the engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._record)
+
+    def _record(self, *args):
+        self.count += 1
+
+
+class StageClock:
+    """``progress`` callback for run_exa_ingestion recording per-stage time, queries and heap peak."""
+
+    def __init__(self, queries, traced=False):
+        self.queries = queries
+        self.traced = traced
+        self.stages = {}
+        self._stage = None
+
+    def __call__(self, stage=None, **counts):
+        if stage is not None and stage != self._stage:
+            self.close()
+            self._stage = stage
+            self._started = time.perf_counter()
+            self._queries = self.queries.count
+            if self.traced:
+                tracemalloc.reset_peak()
+
+    def close(self):
+        if self._stage is None:
+            return
+        self.stages[self._stage] = {
+            'seconds': time.perf_counter() - self._started,
+            'queries': self.queries.count - self._queries,
+            'peak_bytes': tracemalloc.get_traced_memory()[1] if self.traced else None,
+        }
+        self._stage = None
+
+
+def summarize(seconds, queries, peak_bytes):
+    ms = [s * 1000 for s in seconds]
+    return {
+        'rounds': len(ms),
+        'min_ms': round(min(ms), 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'mean_ms': round(statistics.mean(ms), 3),
+        'max_ms': round(max(ms), 3),
+        'stddev_ms': round(statistics.stdev(ms), 3) if len(ms) > 1 else 0.0,
+        'queries': queries,
+        'peak_kb': round(peak_bytes / 1024, 1) if peak_bytes is not None else None,
+    }
+
+
+def measure(fn, queries, rounds, warmup, setup=None):
+    """Time ``fn`` over ``rounds`` runs, then trace one more for its heap peak."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    seconds = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        before = queries.count
+        started = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - started)
+        issued = queries.count - before
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summarize(seconds, issued, peak)
+
+
+def benchmark_endpoints(app_module, queries, args, article_id, selected):
+    client = current_app.test_client()
+    results = {}
+    for name, path in ENDPOINTS.items():
+        if not selected(name):
+            continue
+        url = path.format(article_id=article_id)
+
+        def request():
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+            response.get_data()
+        results[name] = measure(request, queries, args.rounds, args.warmup)
+        print_result(name, results[name])
+    return results
+
+
+def ingest_once(app_module, queries, responses, traced):
+    """One timed run_exa_ingestion(); returns (seconds, queries, heap peak, per-stage results, counts)."""
+    clock = StageClock(queries, traced)
+    # Ingestion logs every article; keep the formatting cost but not the terminal's
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if traced:
+            tracemalloc.start()
+        before = queries.count
+        started = time.perf_counter()
+        counts = app_module.run_exa_ingestion(client=ReplayClient(responses), progress=clock, rate=0, retries=0)
+        elapsed = time.perf_counter() - started
+        clock.close()
+        peak = tracemalloc.get_traced_memory()[1] if traced else None
+        if traced:
+            tracemalloc.stop()
+    app_module.db.session.remove()
+    return elapsed, queries.count - before, peak, clock.stages, counts
+
+
+def benchmark_ingestion(app_module, queries, rounds, responses, reset):
+    """Per-stage results for ingesting ``responses`` into the corpus, then re-fetching them unchanged.
+
+    New-article rounds each start from a fresh copy of the corpus. Re-fetch
+    rounds run against the state the last of those left behind, where every
+    response is already stored.
+    """
+    results = {}
+    for scenario in ('ingest.new', 'ingest.refetch'):
+        runs = []
+        for round_no in range(rounds + 1):
+            if scenario == 'ingest.new':
+                reset()
+            runs.append(ingest_once(app_module, queries, responses, traced=round_no == rounds))
+        timed, traced_run = runs[:-1], runs[-1]
+        results[scenario] = summarize([r[0] for r in timed], timed[-1][1], traced_run[2])
+        results[scenario]['outcome'] = {k: v for k, v in (timed[-1][4] or {}).items() if v}
+        for stage in INGEST_STAGES:
+            if all(stage in r[3] for r in runs):
+                results[f'{scenario}.{stage}'] = summarize([r[3][stage]['seconds'] for r in timed],
+                                                           timed[-1][3][stage]['queries'],
+                                                           traced_run[3][stage]['peak_bytes'])
+        for name in sorted(n for n in results if n.startswith(scenario)):
+            print_result(name, results[name])
+    return results
+
+
+def print_result(name, result):
+    peak = f"{result['peak_kb']:10.0f} KB" if result['peak_kb'] is not None else ''
+    print(f"{name:<34} {result['median_ms']:10.2f} ms  (min {result['min_ms']:.2f}, sd {result['stddev_ms']:.2f})"
+          f"  {result['queries']:6d} queries {peak}")
+
+
+def compare(results, baseline, max_regression, min_delta_ms):
+    """Print per-benchmark changes against ``baseline``; returns the regressions."""
+    regressions = []
+    print(f"\n{'benchmark':<34} {'baseline':>10} {'now':>10} {'change':>8} {'queries':>11}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<34} {'-':>10} {now['median_ms']:8.2f}ms {'new':>8}")
+            continue
+        change = now['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        flags = []
+        if change > max_regression and now['median_ms'] - before['median_ms'] >= min_delta_ms:
+            flags.append('SLOWER')
+        if now['queries'] > before['queries']:
+            flags.append('MORE QUERIES')
+        print(f"{name:<34} {before['median_ms']:8.2f}ms {now['median_ms']:8.2f}ms {change:+8.0%} "
+              f"{before['queries']:>5}->{now['queries']:<5} {' '.join(flags)}")
+        if flags:
+            regressions.append((name, flags))
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument('--ingest', type=int, default=100, help='New results served to the ingestion benchmark.')
+    parser.add_argument('--rounds', type=int, default=5, help='Timed runs per endpoint.')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed endpoint runs before timing.')
+    parser.add_argument('--ingest-rounds', type=int, default=2, help='Timed runs per ingestion scenario.')
+    parser.add_argument('--only', help='Regex; run only benchmarks whose name matches.')
+    parser.add_argument('--keep-dir', help='Keep the corpus databases here instead of a temporary directory.')
+    parser.add_argument('--replay', help='Serve ingestion from this recording instead of synthetic results.')
+    parser.add_argument('--record', help='Write the synthetic ingestion responses to this recording.')
+    parser.add_argument('--save', help='Write the results as a JSON baseline.')
+    parser.add_argument('--compare', help='Compare against a saved JSON baseline.')
+    parser.add_argument('--max-regression', type=float, default=0.25, help='Allowed relative slowdown of a median.')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='Ignore slowdowns smaller than this.')
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    selected = (lambda name: re.search(args.only, name) is not None) if args.only else (lambda name: True)
+
+    workdir = args.keep_dir or tempfile.mkdtemp()
+    os.makedirs(workdir, exist_ok=True)
+    db_file = os.path.join(workdir, 'suite.db')
+    snapshot = os.path.join(workdir, 'suite.base.db')
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    os.environ.update(DATABASE_URL=f'sqlite:///{db_file}', RESPONSE_CACHE_BACKEND='off', SCHEDULER_ENABLED='0')
+    import app as app_module
+    db = app_module.db
+
+    with app_module.create_app().app_context():
+        db.create_all()
+        started = time.perf_counter()
+        load_corpus(app_module, spec)
+        print(f"Loaded {spec.articles} articles in {time.perf_counter() - started:.1f}s ({db_file})")
+        db.session.remove()
+        db.engine.dispose()
+        shutil.copyfile(db_file, snapshot)
+        try:
+            app_module.get_nlp()
+        except OSError:
+            # No trained pipeline installed: enrichment still runs, without entities
+            import spacy
+            print("spaCy model not installed; the enriching stage uses a blank pipeline")
+            app_module._nlp = spacy.blank('en')
+        queries = QueryCounter(db.engine)
+
+        def reset():
+            """Restore the corpus snapshot and rebuild the in-memory indexes from it, untimed."""
+            db.session.remove()
+            db.engine.dispose()
+            shutil.copyfile(snapshot, db_file)
+            app_module.title_index.clear()
+            app_module.simhash_index.clear()
+            app_module.sync_title_index()
+            app_module.sync_simhash_index()
+
+        print()
+        results = benchmark_endpoints(app_module, queries, args, spec.articles // 2, selected)
+        if selected('ingest'):
+            if args.replay:
+                with open(args.replay) as f:
+                    responses = [json.loads(line) for line in f if line.strip()]
+            else:
+                plan = app_module.plan_requests(app_module.EXA_QUERIES, app_module.EXA_INCLUDE_DOMAINS,
+                                                app_module.EXA_SHARD_SIZE)
+                ingest_spec = spec._replace(articles=args.ingest, seed=spec.seed + 100)
+                responses = synthetic_recording(generate(ingest_spec, start=spec.articles + 1), plan)
+                if args.record:
+                    write_recording(args.record, responses)
+            print()
+            results.update(benchmark_ingestion(app_module, queries, args.ingest_rounds, responses, reset))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'meta': {
+                    'commit': git_commit(),
+                    'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                    'python': platform.python_version(),
+                    'spec': spec._asdict(),
+                    'ingest': args.ingest,
+                    'rounds': args.rounds,
+                },
+                'benchmarks': results,
+            }, f, indent=1)
+        print(f"\nSaved {len(results)} results to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline['meta']['spec'] != json.loads(json.dumps(spec._asdict())):
+            print("\nWarning: baseline was recorded with a different corpus spec")
+        regressions = compare(results, baseline['benchmarks'], args.max_regression, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks regressed against {args.compare}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
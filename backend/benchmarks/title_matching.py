@@ -0,0 +1,187 @@
+"""Title matching: similarity.TitleIndex vs. a full SequenceMatcher scan.
+
+Indexes synthetic headlines (see corpus.py), optionally the titles of an
+existing SQLite database, and ``--copies`` perturbed copies of them (a word
+replaced, dropped or misspelt, as syndicated and re-edited headlines are).
+Then, for ``--queries`` sampled titles, it compares against the scan the
+index replaced (every entry whose ``SequenceMatcher(None, indexed,
+query).ratio()`` on lowercased titles exceeds the threshold, in id order):
+
+- ``TitleIndex.query()`` at each threshold the app uses, with and without a
+  source-group restriction. Any differing result fails.
+- ``TitleIndex.query_top()`` as the related-article lookup calls it, against
+  the scan's RELATED_K best. It is approximate near the threshold, where the
+  neighbours it misses share only a handful of trigrams with the title, so it
+  fails only if it misses a neighbour with ratio >= ``--strong`` or more than
+  ``--max-missed`` of the scan's neighbours.
+
+It prints the time per query of each, and also fails if the related-article
+lookup or the 0.7 queries (run for every ingested article) take more than
+``--max-time-share`` of the scan's time.
+
+    cd backend && python benchmarks/title_matching.py [--articles 2000] [--copies 2000] [--queries 300] [--db instance/SIMS_Analytics.db]
+"""
+import argparse
+import heapq
+import os
+import random
+import sqlite3
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import RELATED_CANDIDATES, RELATED_K, RELATED_THRESHOLD
+from corpus import add_spec_arguments, generate, spec_from_args
+from similarity import TitleIndex
+from sources import BD, INTL, registry
+
+# Thresholds of the app's title_index queries: related articles, dashboard repair, matches and verdicts
+THRESHOLDS = (0.5, 0.6, 0.7)
+GROUPS = (None, f'{BD}_source', f'{INTL}_source')
+# Threshold of the per-article queries held to --max-time-share
+TIMED_THRESHOLD = 0.7
+
+
+def database_titles(path):
+    """``(title, groups)`` for every article in an SQLite database of the app."""
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        rows = conn.execute("SELECT title, source FROM article ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    return [(title, source_groups(registry.group(source))) for title, source in rows if title]
+
+
+def source_groups(group):
+    return {f'{group}_source'} if group in (BD, INTL) else set()
+
+
+def perturb(rng, title, vocabulary):
+    words = title.split()
+    edit = rng.randrange(3)
+    i = rng.randrange(len(words))
+    if edit == 0:
+        words[i] = rng.choice(vocabulary)
+    elif edit == 1 and len(words) > 1:
+        del words[i]
+    elif len(words[i]) > 1:
+        j = rng.randrange(len(words[i]) - 1)
+        words[i] = words[i][:j] + words[i][j + 1] + words[i][j] + words[i][j + 2:]
+    return ' '.join(words)
+
+
+def scan(entries, title, exclude):
+    """``{key: ratio}`` for every entry above the lowest threshold: the full scan the index replaced.
+
+    quick_ratio() is an upper bound of ratio(), so skipping entries it rules
+    out does not change the result.
+    """
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(title.lower())
+    ratios = {}
+    for key, (indexed, _) in entries.items():
+        if key == exclude:
+            continue
+        matcher.set_seq1(indexed.lower())
+        if matcher.quick_ratio() > min(THRESHOLDS):
+            ratios[key] = matcher.ratio()
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument('--copies', type=int, default=2000, help='Perturbed copies of indexed titles to add.')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--db', help='Also index the titles of this SQLite database (e.g. instance/SIMS_Analytics.db).')
+    parser.add_argument('--strong', type=float, default=0.7, help='Related neighbours at this ratio must be found.')
+    parser.add_argument('--max-missed', type=float, default=0.1, help="Allowed share of the scan's related neighbours missed.")
+    parser.add_argument('--max-time-share', type=float, default=0.15, help="Allowed time of the timed lookups vs. the scan's.")
+    parser.set_defaults(articles=2000)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+
+    titles = [(r['title'], source_groups(r['group'])) for r in generate(spec)]
+    if args.db:
+        titles += database_titles(args.db)
+    rng = random.Random(spec.seed + 3)
+    vocabulary = sorted({w for title, _ in titles for w in title.lower().split()})
+    for _ in range(args.copies):
+        title, groups = rng.choice(titles)
+        titles.append((perturb(rng, title, vocabulary), groups))
+    entries = dict(enumerate(titles, start=1))
+    index = TitleIndex()
+    for key, (title, groups) in entries.items():
+        index.add(key, title, groups)
+    queries = rng.sample(sorted(entries), min(args.queries, len(entries)))
+    print(f"{len(entries)} titles, {len(queries)} queries\n")
+
+    scan_seconds = 0.0
+    index_seconds = {(threshold, group): 0.0 for threshold in THRESHOLDS for group in GROUPS}
+    found = dict.fromkeys(index_seconds, 0)
+    differ = dict.fromkeys(index_seconds, 0)
+    top_seconds = 0.0
+    neighbours = missed = strong_missed = 0
+    for key in queries:
+        title = entries[key][0]
+        started = time.perf_counter()
+        ratios = scan(entries, title, key)
+        scan_seconds += time.perf_counter() - started
+        for threshold, group in index_seconds:
+            expected = [(k, r) for k, r in sorted(ratios.items())
+                        if r > threshold and (group is None or group in entries[k][1])]
+            started = time.perf_counter()
+            actual = index.query(title, threshold, group=group, exclude=key)
+            index_seconds[threshold, group] += time.perf_counter() - started
+            found[threshold, group] += len(expected)
+            if actual != expected:
+                differ[threshold, group] += 1
+                missing = sorted({k for k, _ in expected} - {k for k, _ in actual})
+                extra = sorted({k for k, _ in actual} - {k for k, _ in expected})
+                print(f"  {threshold} {group or 'all'} {title!r}: missing {[entries[k][0] for k in missing]}, "
+                      f"extra {[entries[k][0] for k in extra]}")
+        expected = heapq.nsmallest(RELATED_K, [(k, r) for k, r in ratios.items() if r > RELATED_THRESHOLD],
+                                   key=lambda m: (-m[1], m[0]))
+        started = time.perf_counter()
+        actual = dict(index.query_top(title, RELATED_K, RELATED_THRESHOLD, exclude=key, candidates=RELATED_CANDIDATES))
+        top_seconds += time.perf_counter() - started
+        neighbours += len(expected)
+        for k, ratio in expected:
+            if k not in actual:
+                missed += 1
+                if ratio >= args.strong:
+                    strong_missed += 1
+                    print(f"  related {title!r}: missing {entries[k][0]!r} ({ratio:.3f})")
+
+    def per_query(seconds):
+        return seconds * 1000 / len(queries)
+
+    print(f"full scan: {per_query(scan_seconds):.2f} ms per query\n")
+    print(f"{'threshold':>9} {'group':<12} {'index':>12} {'matches':>8} {'differ':>7}")
+    for (threshold, group), seconds in index_seconds.items():
+        print(f"{threshold:9.1f} {group or 'all':<12} {per_query(seconds):7.2f} ms/q "
+              f"{found[threshold, group]:8d} {differ[threshold, group]:7d}")
+    print(f"\nrelated top-{RELATED_K} (query_top): {per_query(top_seconds):.2f} ms/q, "
+          f"missed {missed} of {neighbours} neighbours ({strong_missed} with ratio >= {args.strong})")
+
+    failures = []
+    differing = sum(differ.values())
+    if differing:
+        failures.append(f"{differing} queries differ from the full scan")
+    if strong_missed or missed > args.max_missed * neighbours:
+        failures.append(f"related lookup missed {missed} neighbours, {strong_missed} strong")
+    timed = {'related lookup': top_seconds,
+             **{f"{TIMED_THRESHOLD} {group or 'all'} query": index_seconds[TIMED_THRESHOLD, group] for group in GROUPS}}
+    for label, seconds in timed.items():
+        if seconds > args.max_time_share * scan_seconds:
+            failures.append(f"{label} takes {seconds / scan_seconds:.0%} of the full scan's time")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("\nIndex results match the full scan")
+
+
+if __name__ == '__main__':
+    main()
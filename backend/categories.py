@@ -0,0 +1,68 @@
+"""Keyword-based news category classifier.
+
+The keyword table is compiled once: text is split into words with a single
+regex and single-word keywords are counted with dictionary lookups, while
+the few multi-word keywords share one whole-word alternation regex. Each hit
+maps back to the categories that list the keyword. An article is assigned
+the category with the most keyword hits, with ties going to the category
+listed first, and "General" when nothing matches.
+"""
+import re
+from collections import Counter
+
+# (category, keywords), in tie-break priority order
+CATEGORY_KEYWORDS = [
+    ("Health", ["covid", "health", "hospital", "doctor", "vaccine", "disease", "virus", "medicine", "medical"]),
+    ("Politics", ["election", "minister", "government", "parliament", "politics", "cabinet", "bjp", "congress", "policy", "bill", "law"]),
+    ("Economy", ["economy", "gdp", "trade", "export", "import", "inflation", "market", "investment", "finance", "stock", "business"]),
+    ("Education", ["school", "university", "education", "student", "exam", "teacher", "college", "admission"]),
+    ("Security", ["security", "terror", "attack", "military", "army", "defence", "border", "police", "crime"]),
+    ("Sports", ["cricket", "football", "olympic", "match", "tournament", "player", "goal", "score", "team", "league"]),
+    ("Technology", ["tech", "ai", "robot", "software", "hardware", "internet", "startup", "app", "digital", "cyber"]),
+    ("Environment", ["climate", "environment", "pollution", "weather", "rain", "flood", "earthquake", "disaster", "wildlife"]),
+    ("International", ["us", "china", "pakistan", "bangladesh", "united nations", "global", "foreign", "international", "world"]),
+    ("Culture", ["festival", "culture", "art", "music", "movie", "film", "heritage", "tradition", "literature"]),
+    ("Science", ["science", "research", "study", "experiment", "discovery", "space", "nasa", "isro"]),
+    ("Business", ["business", "company", "corporate", "industry", "merger", "acquisition", "startup", "entrepreneur"]),
+    ("Crime", ["crime", "theft", "murder", "fraud", "scam", "arrest", "court", "trial"]),
+]
+
+DEFAULT_CATEGORY = "General"
+
+WORD_RE = re.compile(r'\w+')
+
+
+class CategoryClassifier:
+    """Scores text by keyword hits per category; built once and reused for every article."""
+
+    def __init__(self, table=CATEGORY_KEYWORDS, default=DEFAULT_CATEGORY):
+        self.default = default
+        self._priority = {category: i for i, (category, _) in enumerate(table)}
+        self._categories = {}
+        for category, keywords in table:
+            for kw in keywords:
+                self._categories.setdefault(kw.lower(), []).append(category)
+        phrases = [kw for kw in self._categories if not re.fullmatch(r'\w+', kw)]
+        self._phrases = re.compile(r'\b(?:' + '|'.join(re.escape(kw) for kw in phrases) + r')\b') if phrases else None
+
+    def scores(self, title, text=None):
+        """Keyword hit count per category."""
+        content = f"{title or ''} {text or ''}".lower()
+        hits = Counter(WORD_RE.findall(content))
+        if self._phrases is not None:
+            hits.update(self._phrases.findall(content))
+        scores = Counter()
+        for kw in hits.keys() & self._categories.keys():
+            for category in self._categories[kw]:
+                scores[category] += hits[kw]
+        return scores
+
+    def classify(self, title, text=None):
+        scores = self.scores(title, text)
+        if not scores:
+            return self.default
+        return min(scores, key=lambda category: (-scores[category], self._priority[category]))
+
+    def classify_many(self, items):
+        """Categories for an iterable of ``(title, text)`` pairs, in order."""
+        return [self.classify(title, text) for title, text in items]
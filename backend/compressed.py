@@ -0,0 +1,38 @@
+"""zlib-compressed text column type.
+
+Article bodies, Exa extras and summaries are stored as zlib streams in a
+BLOB column and decompressed only when the attribute is read, which paired
+with deferred loading means only when an endpoint returns them. Values
+written before the compression migration (plain TEXT) are returned as-is.
+"""
+import zlib
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+# zlib level: 6 is the library default and close to 9 in ratio on news text at a fraction of the CPU
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(value):
+    if value is None:
+        return None
+    return zlib.compress(value.encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def decompress_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return zlib.decompress(value).decode('utf-8')
+
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed; reads back as ``str``."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
@@ -0,0 +1,106 @@
+"""Engine configuration for the app's database.
+
+``DATABASE_URL`` selects the backend; the default is the bundled SQLite file.
+Connections to a SQLite file get PRAGMAs suited to serving API reads while
+ingestion writes from the scheduler thread:
+
+- ``journal_mode=WAL`` lets readers keep reading the last committed snapshot
+  while a write transaction is open or committing.
+- ``synchronous=NORMAL`` is durable across application crashes in WAL mode
+  and only syncs at checkpoints.
+- ``busy_timeout`` makes a connection wait for the write lock instead of
+  failing at once with "database is locked".
+- ``mmap_size`` and ``cache_size`` keep hot pages out of read() calls.
+
+Other backends (e.g. PostgreSQL) get a pre-pinged, recycled pool. Every
+setting can be overridden from the environment. Forked children (workers of
+a ``gunicorn --preload`` master) drop the pool they inherit, see
+dispose_after_fork().
+"""
+import os
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Connections kept open per process, and how many more may be opened under load
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+# Seconds a request waits for a free pooled connection before failing
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+# Seconds before a server-side (non-SQLite) connection is replaced
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '30000')),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    # Negative values are KiB rather than pages
+    'cache_size': -int(os.getenv('SQLITE_CACHE_SIZE_KB', str(64 * 1024))),
+}
+
+
+def database_url(default):
+    """``DATABASE_URL`` or ``default``, accepting the ``postgres://`` scheme some hosts hand out."""
+    url = os.getenv('DATABASE_URL', default)
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def is_sqlite_file(url):
+    url = make_url(url)
+    return (url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+            and not url.database.startswith('file::memory:') and 'mode=memory' not in url.database)
+
+
+def engine_options(url):
+    """Keyword arguments for create_engine() (SQLALCHEMY_ENGINE_OPTIONS) for ``url``."""
+    if make_url(url).get_backend_name() == 'sqlite':
+        if not is_sqlite_file(url):
+            # In-memory databases exist per connection; keep SQLAlchemy's single-connection pool
+            return {}
+        return {'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW, 'pool_timeout': DB_POOL_TIMEOUT}
+    return {'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW, 'pool_timeout': DB_POOL_TIMEOUT,
+            'pool_pre_ping': True, 'pool_recycle': DB_POOL_RECYCLE}
+
+
+def configure_engine(engine, pragmas=None):
+    """Apply ``pragmas`` (default SQLITE_PRAGMAS) to every new connection of a SQLite file engine."""
+    if not is_sqlite_file(engine.url):
+        return
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def dispose_after_fork(engine):
+    """Make forked children of this process start ``engine`` with an empty pool.
+
+    Inherited connections share their socket or file with the parent, so
+    using them from two processes corrupts both; the child forgets them
+    without closing (``close=False``) so the parent's stay usable.
+    """
+    ref = weakref.ref(engine)
+
+    def reset_pool():
+        inherited = ref()
+        if inherited is not None:
+            inherited.dispose(close=False)
+
+    os.register_at_fork(after_in_child=reset_pool)
+
+
+def upsert_insert(engine, table):
+    """INSERT for ``table`` with ``on_conflict_do_update()``/``on_conflict_do_nothing()`` on this backend."""
+    if engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
@@ -0,0 +1,100 @@
+"""spaCy helpers for named-entity extraction.
+
+``load_ner_pipeline()`` loads a trained pipeline without the components NER
+does not use (tagger, parser, lemmatizer, ...), and drops the shared
+``tok2vec``/``transformer`` layer too when the entity recognizer has its own.
+The rule-based sentencizer stands in for the parser's sentence boundaries,
+which the recognizer never lets an entity cross.
+``text_segments()`` caps article bodies and splits long ones into pieces the
+pipeline handles in bounded time and memory. ``pipe_processes()`` decides how
+many worker processes are worth using for a given amount of work, and
+``ner_pool()``/``pool_entities()`` run the pipeline in long-lived ones.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Pipeline components that never feed the entity recognizer
+NON_NER_COMPONENTS = (
+    'tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer',
+    'trainable_lemmatizer', 'textcat', 'textcat_multilabel', 'spancat', 'span_finder', 'entity_linker',
+)
+# Shared embedding layers that other components may listen to
+EMBEDDING_COMPONENTS = ('tok2vec', 'transformer')
+
+
+def load_ner_pipeline(model):
+    """Load ``model`` (a package name or path) with only the components needed for ``doc.ents``."""
+    import spacy
+    nlp = spacy.load(model, exclude=list(NON_NER_COMPONENTS))
+    for name in EMBEDDING_COMPONENTS:
+        if name in nlp.pipe_names and not nlp.get_pipe(name).listening_components:
+            nlp.remove_pipe(name)
+    if 'sentencizer' not in nlp.pipe_names:
+        nlp.add_pipe('sentencizer', first=True)
+    return nlp
+
+
+def text_segments(text, size, limit):
+    """The first ``limit`` characters of ``text`` in pieces of at most ``size``.
+
+    Pieces end at a line break, else a sentence end, else a space in the
+    second half of the window, so entities are rarely cut in two.
+    """
+    text = text[:limit]
+    while len(text) > size:
+        cut = text.rfind('\n', size // 2, size)
+        if cut < 0:
+            cut = text.rfind('. ', size // 2, size) + 1
+        if cut <= 0:
+            cut = text.rfind(' ', size // 2, size)
+        if cut <= 0:
+            cut = size
+        yield text[:cut]
+        text = text[cut:]
+    if text.strip():
+        yield text
+
+
+def pipe_processes(n_texts, batch_size, processes):
+    """Worker processes worth using for ``n_texts``: at most one per full batch, and 1 (in-process) for small jobs."""
+    return max(1, min(processes, n_texts // batch_size))
+
+
+# The pipeline of a ner_pool() worker process, loaded by its initializer
+_worker_nlp = None
+
+
+def _load_worker_pipeline(model):
+    global _worker_nlp
+    _worker_nlp = load_ner_pipeline(model)
+
+
+def _worker_entities(texts, batch_size, labels):
+    return [[(ent.text, ent.label_) for ent in doc.ents if ent.label_ in labels]
+            for doc in _worker_nlp.pipe(texts, batch_size=batch_size)]
+
+
+def ner_pool(model, processes):
+    """Pool of ``processes`` workers that each load ``model`` with load_ner_pipeline() once, at start.
+
+    Workers are spawned, not forked: a fork copies only the calling thread,
+    so a lock another thread holds at that moment (logging, the connection
+    pool, the scheduler) would stay locked forever in the child. Spawned
+    workers start from a fresh interpreter, so the pool can be created and
+    used from any thread. Keep it for the life of the process; starting it
+    costs one model load per worker.
+    """
+    return ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_load_worker_pipeline, initargs=(model,))
+
+
+def pool_entities(pool, texts, batch_size, labels):
+    """``[(text, label), ...]`` with a label in ``labels`` for each of ``texts``, in order, computed by ``pool``.
+
+    Only the texts go to the workers, one batch per task, and only the
+    entities come back.
+    """
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    labels = frozenset(labels)
+    for ents in pool.map(_worker_entities, chunks, [batch_size] * len(chunks), [labels] * len(chunks)):
+        yield from ents
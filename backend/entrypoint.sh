@@ -11,4 +11,4 @@ flask db upgrade
 flask fetch-exa
 
 # Start the Flask server
-flask run --host=0.0.0.0 --port=5000 
\ No newline at end of file
+flask --app "app:create_app(start_background=True)" run --host=0.0.0.0 --port=5000 
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Concurrent fan-out of Exa searches with rate limiting and retries.
+
+A fetch is described as a list of keyword-argument dicts for the client's
+``search_and_contents(query, **kwargs)``. Requests run on a thread pool,
+each waits for a token from a shared bucket before calling the API, and
+failed calls are retried with exponential backoff. Results from all
+requests are merged with duplicate URLs dropped.
+
+Any object with a ``search_and_contents`` method returning something with a
+``results`` list can be used as the client, e.g. ``exa_py.Exa`` pointed at a
+local fake server through its ``base_url``.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` calls per second with bursts of ``capacity``."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def call_with_retries(fn, retries=3, base_delay=1.0, max_delay=30.0, sleep=time.sleep):
+    """Call ``fn()``, retrying up to ``retries`` times with jittered exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            print(f"Exa request failed ({e}); retry {attempt + 1}/{retries} in {delay:.1f}s")
+            sleep(delay)
+            attempt += 1
+
+
+def shard(items, size):
+    """Split ``items`` into consecutive chunks of ``size``; ``size <= 0`` keeps a single chunk."""
+    items = list(items)
+    if size <= 0 or size >= len(items):
+        return [items]
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def plan_requests(queries, domains, shard_size, **common):
+    """One request per (query, domain shard) pair, sharing the ``common`` search options."""
+    return [dict(common, query=query, include_domains=domains_shard)
+            for query in queries
+            for domains_shard in shard(domains, shard_size)]
+
+
+def fan_out(client, requests, concurrency=4, rate=5.0, retries=3, base_delay=1.0):
+    """Run ``requests`` against ``client`` concurrently and merge their results.
+
+    Results keep request order, then the order each response returned them;
+    the first occurrence of a URL wins. A request that still fails after its
+    retries is logged and skipped so the other shards are not lost.
+    """
+    bucket = TokenBucket(rate)
+
+    def run(req):
+        kwargs = dict(req)
+        query = kwargs.pop('query')
+
+        def call():
+            bucket.acquire()
+            return client.search_and_contents(query, **kwargs)
+        try:
+            return call_with_retries(call, retries=retries, base_delay=base_delay).results
+        except Exception as e:
+            print(f"Exa request for {query!r} ({len(kwargs.get('include_domains') or [])} domains) failed: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        responses = list(pool.map(run, requests))
+    seen = set()
+    merged = []
+    for results in responses:
+        for item in results:
+            url = getattr(item, 'url', None)
+            if url in seen:
+                continue
+            seen.add(url)
+            merged.append(item)
+    return merged
@@ -0,0 +1,237 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+``Registry`` holds labelled counters, gauges and histograms. Values are
+per process, like the response cache's hit counters, so a multi-worker
+server is scraped per worker.
+
+``timed(operation)`` measures one unit of work (an SQL statement, a spaCy
+batch, a title-similarity query, JSON serialization). The time goes to the
+``operation_seconds`` totals and, while a request is being handled (between
+``begin_request()`` and ``end_request()``), to that request's breakdown,
+which ``format_breakdown()`` renders for the ``X-Debug-Timing`` header.
+"""
+import contextlib
+import contextvars
+import math
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}  # label values -> value (a float, or histogram state)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {', '.join(self.labels) or '(none)'}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self):
+        """``[(suffix, label values, extra label pairs, value), ...]`` for rendering."""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, values, extra, value in self.samples():
+            lines.append(f'{self.name}{suffix}{format_labels(self.labels, values, extra)} {format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Replace the value, e.g. with a count kept elsewhere and copied in at scrape time."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [('', key, (), value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket (non-cumulative) counts, sum
+                state = self._values[key] = [[0] * len(self.buckets), 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append(('_bucket', key, [('le', format_value(bound))], cumulative))
+                samples.append(('_sum', key, (), total))
+                samples.append(('_count', key, (), cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self, namespace=''):
+        self.namespace = namespace
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, cls, name, documentation, labels=(), **kwargs):
+        name = f'{self.namespace}_{name}' if self.namespace else name
+        with self._lock:
+            if name in self._metrics:
+                raise ValueError(f'Metric {name} is already registered')
+            metric = self._metrics[name] = cls(name, documentation, labels, **kwargs)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._add(Counter, name, documentation, labels)
+
+    def gauge(self, name, documentation, labels=()):
+        return self._add(Gauge, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram, name, documentation, labels, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+registry = Registry('sims')
+operation_seconds = registry.counter(
+    'operation_seconds_total', 'Time spent in instrumented operations.', ['operation'])
+operations = registry.counter(
+    'operations_total', 'Instrumented operations performed.', ['operation'])
+
+# {operation: [seconds, count]} for the request being handled, or None outside requests
+_breakdown = contextvars.ContextVar('breakdown', default=None)
+
+
+def record(operation, seconds):
+    operation_seconds.inc(seconds, operation=operation)
+    operations.inc(operation=operation)
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        entry = breakdown.setdefault(operation, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextlib.contextmanager
+def timed(operation):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(operation, time.perf_counter() - started)
+
+
+def timed_iter(iterable, operation):
+    """Yield from ``iterable``, timing each step as one ``operation`` (for lazy producers like nlp.pipe)."""
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record(operation, time.perf_counter() - started)
+        yield item
+
+
+class StageTimer:
+    """Observes how long each stage of a multi-stage run took in ``histogram`` (labelled by stage)."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.stage = None
+        self.started = None
+
+    def start(self, stage):
+        """Finish the current stage, if any, and start timing ``stage``."""
+        if stage == self.stage:
+            return
+        self.stop()
+        self.stage = stage
+        self.started = time.perf_counter()
+
+    def stop(self):
+        if self.stage is not None:
+            self.histogram.observe(time.perf_counter() - self.started, stage=self.stage)
+        self.stage = None
+
+
+def begin_request():
+    """Start collecting a breakdown for the current request; returns the start time for ``end_request()``."""
+    _breakdown.set({})
+    return time.perf_counter()
+
+
+def end_request(started):
+    """Stop collecting; returns ``(elapsed seconds, {operation: [seconds, count]})``."""
+    breakdown = _breakdown.get() or {}
+    _breakdown.set(None)
+    return time.perf_counter() - started, breakdown
+
+
+def format_breakdown(elapsed, breakdown):
+    """``total;dur=12.3, sql;dur=4.1;count=5, ...`` with durations in milliseconds."""
+    parts = [f'total;dur={elapsed * 1000:.1f}']
+    for operation, (seconds, count) in sorted(breakdown.items(), key=lambda item: -item[1][0]):
+        parts.append(f'{operation};dur={seconds * 1000:.1f};count={count}')
+    return ', '.join(parts)
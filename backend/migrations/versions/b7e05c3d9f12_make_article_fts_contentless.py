@@ -0,0 +1,58 @@
+"""Make the article_fts search index contentless
+
+The FTS5 table kept its own uncompressed copy of every title and body next
+to the compressed article columns. Recreates it with content='' and
+re-indexes the stored articles; the index itself is unchanged, so search
+results and ranking stay the same.
+
+Revision ID: b7e05c3d9f12
+Revises: a2d6f9e4c813
+Create Date: 2025-06-21 09:18:40.662193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from compressed import decompress_text
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e05c3d9f12'
+down_revision = 'a2d6f9e4c813'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+FTS_DDL = ("CREATE VIRTUAL TABLE article_fts USING fts5("
+           "title, full_text{content}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+
+
+def recreate(content):
+    """Drop article_fts and index every article again, in id batches."""
+    conn = op.get_bind()
+    op.execute("DROP TABLE IF EXISTS article_fts")
+    op.execute(FTS_DDL.format(content=content))
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, title, full_text FROM article WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        conn.execute(sa.text("INSERT INTO article_fts (rowid, title, full_text) VALUES (:id, :title, :full_text)"),
+                     [{'id': row.id, 'title': row.title or '', 'full_text': decompress_text(row.full_text) or ''}
+                      for row in rows])
+        last_id = rows[-1].id
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other backends keep the ILIKE search fallback
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    recreate(", content=''")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    recreate('')
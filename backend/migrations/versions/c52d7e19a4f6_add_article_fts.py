@@ -0,0 +1,36 @@
+"""Add article_fts full-text search index
+
+Revision ID: c52d7e19a4f6
+Revises: 8b1e4c6f2a93
+Create Date: 2025-06-07 11:05:52.318740
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52d7e19a4f6'
+down_revision = '8b1e4c6f2a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other backends keep the ILIKE search fallback
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5("
+        "title, full_text, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        "INSERT INTO article_fts (rowid, title, full_text) "
+        "SELECT id, title, coalesce(full_text, '') FROM article"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS article_fts")
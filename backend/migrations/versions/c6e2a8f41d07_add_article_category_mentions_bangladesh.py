@@ -0,0 +1,74 @@
+"""Add article category and mentions_bangladesh columns
+
+Backfills both columns from the stored rows: mentions_bangladesh from the
+title and text, category from the summary, inferred from the text when the
+summary has none or 'General', which is the category the dashboard_entry
+backfill already gave each entry.
+
+Revision ID: c6e2a8f41d07
+Revises: b3f70d5c1e92
+Create Date: 2025-06-16 11:37:52.104318
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from categories import CategoryClassifier
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e2a8f41d07'
+down_revision = 'b3f70d5c1e92'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('category', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('mentions_bangladesh', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.create_index('ix_article_category_published_at', ['category', 'published_at'], unique=False)
+        batch_op.create_index('ix_article_mentions_bangladesh_source', ['mentions_bangladesh', 'source'], unique=False)
+
+    conn = op.get_bind()
+    article = sa.table('article', sa.column('title'), sa.column('full_text'), sa.column('mentions_bangladesh'))
+    conn.execute(article.update()
+                 .where(sa.or_(sa.func.lower(article.c.title).contains('bangladesh'),
+                               sa.func.lower(article.c.full_text).contains('bangladesh')))
+                 .values(mentions_bangladesh=sa.true()))
+    classifier = CategoryClassifier()
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, title, full_text, summary_json FROM article WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        categories = {}
+        missing = []
+        for row in rows:
+            try:
+                category = json.loads(row.summary_json).get('category') if row.summary_json else None
+            except Exception:
+                category = None
+            if category and category != 'General':
+                categories[row.id] = category
+            else:
+                missing.append(row)
+        categories.update(zip((row.id for row in missing),
+                              classifier.classify_many((row.title, row.full_text) for row in missing)))
+        conn.execute(sa.text("UPDATE article SET category = :category WHERE id = :id"),
+                     [{'id': k, 'category': v} for k, v in categories.items()])
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index('ix_article_mentions_bangladesh_source')
+        batch_op.drop_index('ix_article_category_published_at')
+        batch_op.drop_column('mentions_bangladesh')
+        batch_op.drop_column('category')
@@ -0,0 +1,169 @@
+"""Add dashboard_entry and dashboard_rollup tables
+
+Backfills both tables from the stored articles the way
+refresh_dashboard_entries() fills them at ingest time: one entry per
+Indian-source article that mentions Bangladesh, with its category (from the
+summary, classified from the text when missing or 'General'), normalized
+sentiment and a verdict from BD and International articles with similar
+titles; the rollup counts the entries.
+
+Revision ID: d4a81f0b7c25
+Revises: c52d7e19a4f6
+Create Date: 2025-06-09 14:27:36.904512
+
+"""
+import json
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+from categories import CategoryClassifier
+from similarity import TitleIndex
+from sources import registry, BD, INDIAN, INTL
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a81f0b7c25'
+down_revision = 'c52d7e19a4f6'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+# Title similarity above which a BD or International article counts as covering the same story
+VERDICT_THRESHOLD = 0.7
+SENTIMENTS = ('Positive', 'Negative', 'Neutral', 'Cautious')
+ROLLUP_KEY = ('day', 'source', 'category', 'sentiment', 'verdict')
+
+
+def normalize_sentiment(value):
+    value = (value or '').strip().capitalize()
+    return value if value in SENTIMENTS else 'Neutral'
+
+
+def summary_category(summary_json):
+    try:
+        category = json.loads(summary_json).get('category') if summary_json else None
+    except Exception:
+        category = None
+    return category if category and category != 'General' else None
+
+
+def verdict(sentiment, match_sentiments):
+    """(verdict, reason) from how many matched articles share the article's sentiment."""
+    agreements = sum(1 for s in match_sentiments if s and sentiment and s.lower() == sentiment.lower())
+    contradictions = len(match_sentiments) - agreements
+    if agreements > 0 and contradictions == 0:
+        return 'True', f"Matched with {agreements} sources, all agree."
+    if contradictions > 0 and agreements == 0:
+        return 'False', f"Matched with {contradictions} sources, all contradict."
+    if agreements > 0 and contradictions > 0:
+        return 'Mixed', f"Matched with {agreements} agreeing and {contradictions} contradicting sources."
+    return 'Unverified', 'No matching articles found in Bangladeshi or International sources.'
+
+
+def backfill():
+    conn = op.get_bind()
+    article = sa.table('article', sa.column('id', sa.Integer), sa.column('url', sa.String),
+                       sa.column('title', sa.String), sa.column('source', sa.String),
+                       sa.column('sentiment', sa.String), sa.column('published_at', sa.DateTime),
+                       sa.column('summary_json', sa.Text), sa.column('full_text', sa.Text))
+    entry = sa.table('dashboard_entry', sa.column('article_id', sa.Integer), sa.column('day', sa.Date),
+                     sa.column('source', sa.String), sa.column('category', sa.String),
+                     sa.column('sentiment', sa.String), sa.column('verdict', sa.String), sa.column('reason', sa.String))
+    rollup = sa.table('dashboard_rollup', sa.column('day', sa.Date), sa.column('source', sa.String),
+                      sa.column('category', sa.String), sa.column('sentiment', sa.String),
+                      sa.column('verdict', sa.String), sa.column('count', sa.Integer))
+
+    # Verdict matches come from the BD and International articles, indexed by URL domain as in title_groups()
+    index = TitleIndex()
+    sentiments = {}
+    for row in conn.execute(sa.select(article.c.id, article.c.title, article.c.url, article.c.sentiment)):
+        group = registry.group(row.url)
+        if group in (BD, INTL):
+            index.add(row.id, row.title, {f'{group}_domain'})
+            sentiments[row.id] = row.sentiment
+
+    classifier = CategoryClassifier()
+    counts = Counter()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(article.c.id, article.c.title, article.c.source, article.c.sentiment,
+                      article.c.published_at, article.c.summary_json, article.c.full_text)
+            .where(article.c.id > last_id, article.c.source.in_(registry.domains(INDIAN)),
+                   sa.or_(sa.func.lower(article.c.title).contains('bangladesh'),
+                          sa.func.lower(article.c.full_text).contains('bangladesh')))
+            .order_by(article.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        categories = [summary_category(row.summary_json) for row in rows]
+        missing = [i for i, category in enumerate(categories) if category is None]
+        for i, category in zip(missing, classifier.classify_many((rows[i].title, rows[i].full_text) for i in missing)):
+            categories[i] = category
+        entries = []
+        for row, category in zip(rows, categories):
+            matches = [key for group in ('bd_domain', 'intl_domain')
+                       for key, _ in index.query(row.title, VERDICT_THRESHOLD, group=group)]
+            verdict_, reason = verdict(row.sentiment, [sentiments[key] for key in matches])
+            entries.append({'article_id': row.id, 'day': row.published_at.date() if row.published_at else None,
+                            'source': row.source, 'category': category or 'General',
+                            'sentiment': normalize_sentiment(row.sentiment), 'verdict': verdict_, 'reason': reason})
+            counts[tuple(entries[-1][c] for c in ROLLUP_KEY)] += 1
+        conn.execute(entry.insert(), entries)
+        last_id = rows[-1].id
+    if counts:
+        conn.execute(rollup.insert(), [dict(zip(ROLLUP_KEY, key), count=count) for key, count in counts.items()])
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('dashboard_entry',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=True),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('sentiment', sa.String(), nullable=False),
+    sa.Column('verdict', sa.String(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('article_id')
+    )
+    with op.batch_alter_table('dashboard_entry', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_dashboard_entry_category'), ['category'], unique=False)
+        batch_op.create_index(batch_op.f('ix_dashboard_entry_day'), ['day'], unique=False)
+        batch_op.create_index(batch_op.f('ix_dashboard_entry_source'), ['source'], unique=False)
+
+    op.create_table('dashboard_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=True),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('sentiment', sa.String(), nullable=False),
+    sa.Column('verdict', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('dashboard_rollup', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_dashboard_rollup_day'), ['day'], unique=False)
+        batch_op.create_index('ix_dashboard_rollup_source_category_day', ['source', 'category', 'day'], unique=False)
+
+    # ### end Alembic commands ###
+    backfill()
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('dashboard_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ix_dashboard_rollup_source_category_day')
+        batch_op.drop_index(batch_op.f('ix_dashboard_rollup_day'))
+
+    op.drop_table('dashboard_rollup')
+    with op.batch_alter_table('dashboard_entry', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_dashboard_entry_source'))
+        batch_op.drop_index(batch_op.f('ix_dashboard_entry_day'))
+        batch_op.drop_index(batch_op.f('ix_dashboard_entry_category'))
+
+    op.drop_table('dashboard_entry')
+    # ### end Alembic commands ###
@@ -0,0 +1,48 @@
+"""Add article source_group column
+
+Backfills the registry group (see sources.py) of each article's URL host,
+falling back to its stored source.
+
+Revision ID: d91b5f3c7a24
+Revises: c6e2a8f41d07
+Create Date: 2025-06-17 09:44:18.260593
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from sources import registry
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91b5f3c7a24'
+down_revision = 'c6e2a8f41d07'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source_group', sa.String(), nullable=True))
+        batch_op.create_index('ix_article_source_group_published_at', ['source_group', 'published_at'], unique=False)
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, url, source FROM article WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        updates = [{'id': row.id, 'source_group': registry.group(row.url) or registry.group(row.source)}
+                   for row in rows]
+        conn.execute(sa.text("UPDATE article SET source_group = :source_group WHERE id = :id"), updates)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index('ix_article_source_group_published_at')
+        batch_op.drop_column('source_group')
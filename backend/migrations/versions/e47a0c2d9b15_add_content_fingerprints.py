@@ -0,0 +1,72 @@
+"""Add article content fingerprints and article_alias table
+
+Backfills the body SimHash (see similarity.py) of stored articles. The
+content hash is left empty: it covers the raw Exa result, which is not
+stored, so each existing article is rewritten once on its next re-fetch and
+skipped after.
+
+Revision ID: e47a0c2d9b15
+Revises: d91b5f3c7a24
+Create Date: 2025-06-18 11:26:53.804172
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from similarity import simhash
+
+
+# revision identifiers, used by Alembic.
+revision = 'e47a0c2d9b15'
+down_revision = 'd91b5f3c7a24'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('simhash', sa.BigInteger(), nullable=True))
+
+    op.create_table('article_alias',
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('distance', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+    sa.PrimaryKeyConstraint('url')
+    )
+    with op.batch_alter_table('article_alias', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_article_alias_article_id'), ['article_id'], unique=False)
+
+    with op.batch_alter_table('ingestion_job', schema=None) as batch_op:
+        for name in ('inserted', 'updated', 'unchanged', 'duplicate'):
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, full_text FROM article WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        updates = [{'id': row.id, 'simhash': simhash(row.full_text)} for row in rows]
+        conn.execute(sa.text("UPDATE article SET simhash = :simhash WHERE id = :id"), updates)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('ingestion_job', schema=None) as batch_op:
+        for name in ('duplicate', 'unchanged', 'updated', 'inserted'):
+            batch_op.drop_column(name)
+
+    with op.batch_alter_table('article_alias', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_alias_article_id'))
+
+    op.drop_table('article_alias')
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_column('simhash')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,48 @@
+"""Add indexes for article listing filters, match lookups and dashboard rollups
+
+Revision ID: f29d6e3b8a17
+Revises: e7b3c90a1f48
+Create Date: 2025-06-11 15:08:44.671390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f29d6e3b8a17'
+down_revision = 'e7b3c90a1f48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.create_index('ix_article_published_at', ['published_at'], unique=False)
+        batch_op.create_index('ix_article_source_published_at', ['source', 'published_at'], unique=False)
+        batch_op.create_index('ix_article_sentiment_published_at', ['sentiment', 'published_at'], unique=False)
+
+    with op.batch_alter_table('bd_match', schema=None) as batch_op:
+        batch_op.create_index('ix_bd_match_article_id_covering', ['article_id', 'title', 'source', 'url'], unique=False)
+
+    with op.batch_alter_table('int_match', schema=None) as batch_op:
+        batch_op.create_index('ix_int_match_article_id_covering', ['article_id', 'title', 'source', 'url'], unique=False)
+
+    with op.batch_alter_table('dashboard_rollup', schema=None) as batch_op:
+        batch_op.create_index('ix_dashboard_rollup_category_day', ['category', 'day'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('dashboard_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ix_dashboard_rollup_category_day')
+
+    with op.batch_alter_table('int_match', schema=None) as batch_op:
+        batch_op.drop_index('ix_int_match_article_id_covering')
+
+    with op.batch_alter_table('bd_match', schema=None) as batch_op:
+        batch_op.drop_index('ix_bd_match_article_id_covering')
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index('ix_article_sentiment_published_at')
+        batch_op.drop_index('ix_article_source_published_at')
+        batch_op.drop_index('ix_article_published_at')
@@ -0,0 +1,61 @@
+"""Store article full_text, extras and summary_json compressed
+
+Changes the columns to BLOB and rewrites existing values as zlib streams
+(see compressed.py). SQLite only returns the freed pages to the filesystem
+after a VACUUM, which cannot run inside the migration transaction.
+
+Revision ID: f5c83b1e6a40
+Revises: e47a0c2d9b15
+Create Date: 2025-06-19 15:02:37.419826
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from compressed import compress_text, decompress_text
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c83b1e6a40'
+down_revision = 'e47a0c2d9b15'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+COLUMNS = ('extras', 'full_text', 'summary_json')
+
+
+def rewrite(convert, type_):
+    """Apply ``convert`` to the three columns of every article, in id batches."""
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, extras, full_text, summary_json FROM article WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        updates = [dict({c: convert(getattr(row, c)) for c in COLUMNS}, id=row.id) for row in rows]
+        stmt = sa.text(
+            "UPDATE article SET extras = :extras, full_text = :full_text, summary_json = :summary_json WHERE id = :id"
+        ).bindparams(*[sa.bindparam(c, type_=type_) for c in COLUMNS])
+        conn.execute(stmt, updates)
+        last_id = rows[-1].id
+
+
+def upgrade():
+    # Compressed first: changing the type casts the stored text to BLOB, after which it can't be told apart.
+    # Rows written by a newer app may already be compressed.
+    rewrite(lambda value: compress_text(value) if isinstance(value, str) else value, sa.LargeBinary)
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(column, existing_type=sa.Text(), type_=sa.LargeBinary(), existing_nullable=True)
+
+
+def downgrade():
+    rewrite(decompress_text, sa.Text)
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(column, existing_type=sa.LargeBinary(), type_=sa.Text(), existing_nullable=True)
@@ -0,0 +1,199 @@
+"""Caches for serialized API responses.
+
+Entries are tagged with the data version they were computed from; a lookup
+with a different version is a miss, so bumping the version after ingestion
+invalidates everything without having to enumerate keys. Entries also expire
+after a TTL and the caches are bounded by entry count and total bytes.
+
+``MemoryCache`` is a per-process LRU. ``SQLiteCache`` keeps entries in a
+SQLite file so several worker processes share them.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+
+def cache_key(path, args):
+    """Stable key for a request path and its query parameters (a MultiDict), independent of parameter order.
+
+    Names and values are percent-encoded again, so a value containing ``&`` or
+    ``=`` cannot produce the key of a different set of parameters.
+    """
+    return path + '?' + urlencode(sorted(args.items(multi=True)))
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def evicted(self, n=1):
+        with self._lock:
+            self.evictions += n
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRatio': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+        }
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with TTL, entry and byte limits."""
+
+    backend = 'memory'
+
+    def __init__(self, ttl=600, max_entries=256, max_bytes=64 * 1024 * 1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (version, expires, body)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] != version or entry[1] <= self._clock()):
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self.stats.record(entry is not None)
+        return entry[2] if entry is not None else None
+
+    def set(self, key, version, body):
+        size = len(key) + len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (version, self._clock() + self.ttl, body)
+            self._bytes += size
+            evicted = 0
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                evicted += 1
+        if evicted:
+            self.stats.evicted(evicted)
+
+    def _drop(self, key):
+        _, _, body = self._entries.pop(key)
+        self._bytes -= len(key) + len(body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        with self._lock:
+            return dict(self.stats.as_dict(), backend=self.backend, entries=len(self._entries), bytes=self._bytes)
+
+
+class SQLiteCache:
+    """Cache stored in a SQLite file so every worker process sees the same entries.
+
+    Eviction is least-recently-used by access time once the entry or byte
+    limit is exceeded. Hit/miss counters are per process.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path, ttl=600, max_entries=1024, max_bytes=256 * 1024 * 1024, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._clock = clock
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, version INTEGER NOT NULL, expires REAL NOT NULL, "
+                "accessed REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_accessed ON response_cache (accessed)")
+
+    def _connect(self):
+        """This thread's connection; a process forked after it was opened (e.g. a gunicorn worker) opens its own."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, version):
+        conn = self._connect()
+        now = self._clock()
+        with conn:
+            row = conn.execute("SELECT version, expires, body FROM response_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and (row[0] != version or row[1] <= now):
+                conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE response_cache SET accessed = ? WHERE key = ?", (now, key))
+        self.stats.record(row is not None)
+        return bytes(row[2]) if row is not None else None
+
+    def set(self, key, version, body):
+        size = len(key) + len(body)
+        if size > self.max_bytes:
+            return
+        conn = self._connect()
+        now = self._clock()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, version, expires, accessed, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, version, now + self.ttl, now, size, body)
+            )
+            count, total = conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM response_cache").fetchone()
+            evicted = 0
+            if count > self.max_entries or total > self.max_bytes:
+                # Drop stale versions and expired rows first, then least recently used
+                evicted += conn.execute(
+                    "DELETE FROM response_cache WHERE version != ? OR expires <= ?", (version, now)
+                ).rowcount
+                count, total = conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM response_cache").fetchone()
+                rows = conn.execute("SELECT key, size FROM response_cache ORDER BY accessed").fetchall()
+                for old_key, old_size in rows:
+                    if count <= self.max_entries and total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM response_cache WHERE key = ?", (old_key,))
+                    count -= 1
+                    total -= old_size
+                    evicted += 1
+        if evicted:
+            self.stats.evicted(evicted)
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM response_cache")
+
+    def info(self):
+        count, total = self._connect().execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM response_cache").fetchone()
+        return dict(self.stats.as_dict(), backend=self.backend, entries=count, bytes=total)
@@ -0,0 +1,320 @@
+"""Character n-gram inverted index for near-duplicate title matching.
+
+Answers "which indexed titles have a SequenceMatcher ratio above a threshold"
+without comparing the query against every stored title. Candidates are found
+through shared character trigrams, pruned with cheap upper bounds and only
+then verified with the exact ``SequenceMatcher.ratio()`` used elsewhere in the
+app, so matches agree with a full scan. At low thresholds nearly every title
+passes those bounds; ``TitleIndex.query_top()`` serves top-k lookups there by
+verifying only the titles sharing the most rare n-grams with the query.
+
+Also holds the 64-bit SimHash used to spot near-identical article bodies
+(syndicated copies) and a banded index for finding them.
+"""
+import hashlib
+import math
+import re
+import heapq
+import threading
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+
+# Titles with fewer n-grams than this skip the count filter in TitleIndex.query() and the approximate
+# candidate selection of TitleIndex.query_top()
+MIN_FILTERED_GRAMS = 20
+# Query n-grams held by more than this share of the searched titles (e.g. those of "bangladesh")
+# do not select candidates in TitleIndex.query_top()
+COMMON_GRAM_SHARE = 0.1
+
+
+def normalize_title(title):
+    return (title or '').lower()
+
+
+def title_grams(title, n=3):
+    """Set of padded character n-grams of an already normalized title."""
+    padded = f" {title} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def title_ratio(indexed, title):
+    """``SequenceMatcher.ratio()`` of two titles as TitleIndex.query() computes it."""
+    return SequenceMatcher(None, normalize_title(indexed), normalize_title(title)).ratio()
+
+
+class TitleIndex:
+    """Incrementally built n-gram index over titles, partitioned by source group.
+
+    Each entry has an integer key (the article id), a title and a set of
+    group labels. Queries can be restricted to one group; results come back
+    in ascending key order, matching the order of a table scan by id.
+    """
+
+    def __init__(self, n=3):
+        self.n = n
+        self.max_key = 0
+        self._titles = {}
+        self._grams = {}
+        self._groups = {}
+        # group label (None = every entry) -> number of entries
+        self._sizes = Counter()
+        # group label (None = every entry) -> gram -> set of keys
+        self._postings = defaultdict(lambda: defaultdict(set))
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._titles)
+
+    def __contains__(self, key):
+        return key in self._titles
+
+    def add(self, key, title, groups=()):
+        """Insert or replace the entry for ``key``."""
+        title = normalize_title(title)
+        groups = frozenset(groups)
+        grams = title_grams(title, self.n)
+        with self._lock:
+            if key in self._titles:
+                self._remove(key)
+            self._titles[key] = title
+            self._grams[key] = grams
+            self._groups[key] = groups
+            for group in (None, *groups):
+                self._sizes[group] += 1
+                postings = self._postings[group]
+                for gram in grams:
+                    postings[gram].add(key)
+            self.max_key = max(self.max_key, key)
+
+    def remove(self, key):
+        with self._lock:
+            if key in self._titles:
+                self._remove(key)
+
+    def _remove(self, key):
+        grams = self._grams.pop(key)
+        for group in (None, *self._groups.pop(key)):
+            self._sizes[group] -= 1
+            postings = self._postings[group]
+            for gram in grams:
+                keys = postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del postings[gram]
+        del self._titles[key]
+
+    def clear(self):
+        with self._lock:
+            self._titles.clear()
+            self._grams.clear()
+            self._groups.clear()
+            self._sizes.clear()
+            self._postings.clear()
+            self.max_key = 0
+
+    def query(self, title, threshold=0.7, group=None, exclude=None, limit=None):
+        """Return ``[(key, ratio), ...]`` for titles with ratio > ``threshold``.
+
+        ``ratio`` is ``SequenceMatcher(None, indexed_title, title).ratio()`` on
+        lowercased titles. ``group`` restricts the search to entries added with
+        that label, ``exclude`` skips one key (usually the query article).
+        """
+        query_title = normalize_title(title)
+        query_grams = title_grams(query_title, self.n)
+        qlen = len(query_title)
+        # Count filter: pairs above the threshold share a proportional number
+        # of n-grams (calibrated against SequenceMatcher on real headlines).
+        # Short titles lose too many grams to a single transposition for that,
+        # so they only need one gram in common.
+        min_shared = 1
+        if len(query_grams) >= MIN_FILTERED_GRAMS:
+            min_shared = max(1, math.floor(len(query_grams) * max(0.0, 0.8 * threshold - 0.3)))
+        with self._lock:
+            postings = self._postings.get(group)
+            if not postings:
+                return []
+            # Prefix filter: a key sharing min_shared grams must appear in at
+            # least one of the len - min_shared + 1 rarest query grams.
+            ranked = sorted(query_grams, key=lambda g: len(postings.get(g, ())))
+            candidates = set()
+            for gram in ranked[:len(ranked) - min_shared + 1]:
+                keys = postings.get(gram)
+                if keys:
+                    candidates.update(keys)
+            candidates.discard(exclude)
+            titles = [(k, self._titles[k]) for k in sorted(candidates)
+                      if len(query_grams & self._grams[k]) >= min_shared]
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query_title)
+        matches = []
+        for key, cand in titles:
+            clen = len(cand)
+            # Length bound: ratio can never exceed 2*min(len)/sum(len)
+            if clen + qlen == 0 or 2.0 * min(clen, qlen) / (clen + qlen) <= threshold:
+                continue
+            matcher.set_seq1(cand)
+            if matcher.quick_ratio() <= threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio > threshold:
+                matches.append((key, ratio))
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def query_top(self, title, k, threshold=0.5, group=None, exclude=None, candidates=400):
+        """Return the ``k`` best ``[(key, ratio), ...]`` with ratio > ``threshold``, best first.
+
+        Approximate, for thresholds where query() would verify most of the
+        index: only the ``candidates`` entries sharing the most IDF-weighted
+        n-grams with the title are verified, and grams common to more than
+        COMMON_GRAM_SHARE of the entries select none. Strong matches share
+        rare grams and are found; near the threshold, where many titles tie
+        on common words, it may return others than a full scan would.
+        Titles with fewer than MIN_FILTERED_GRAMS n-grams can match on a
+        single common gram, so they go through the exact query().
+        """
+        query_title = normalize_title(title)
+        query_grams = title_grams(query_title, self.n)
+        if len(query_grams) < MIN_FILTERED_GRAMS:
+            matches = self.query(title, threshold, group=group, exclude=exclude)
+            return heapq.nsmallest(k, matches, key=lambda m: (-m[1], m[0]))
+        with self._lock:
+            postings = self._postings.get(group)
+            size = self._sizes[group]
+            if not postings or not size:
+                return []
+            grams = [g for g in query_grams if g in postings]
+            rare = [g for g in grams if len(postings[g]) <= COMMON_GRAM_SHARE * size] or grams
+            weights = defaultdict(float)
+            for gram in rare:
+                keys = postings[gram]
+                idf = math.log(size / len(keys))
+                for key in keys:
+                    weights[key] += idf
+            weights.pop(exclude, None)
+            ranked = heapq.nlargest(candidates, weights.items(), key=lambda item: (item[1], -item[0]))
+            titles = [(key, self._titles[key]) for key, _ in ranked]
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query_title)
+        # quick_ratio() bounds ratio() from above: verify in decreasing bound order and stop once
+        # the bound falls below the weakest of the best k (a min-heap of (ratio, -key))
+        bounded = []
+        for key, cand in titles:
+            matcher.set_seq1(cand)
+            if matcher.real_quick_ratio() > threshold:
+                bound = matcher.quick_ratio()
+                if bound > threshold:
+                    bounded.append((bound, key, cand))
+        bounded.sort(key=lambda b: (-b[0], b[1]))
+        best = []
+        for bound, key, cand in bounded:
+            if len(best) == k and bound < best[0][0]:
+                break
+            matcher.set_seq1(cand)
+            ratio = matcher.ratio()
+            if ratio > threshold:
+                if len(best) < k:
+                    heapq.heappush(best, (ratio, -key))
+                elif (ratio, -key) > best[0]:
+                    heapq.heapreplace(best, (ratio, -key))
+        return [(-neg_key, ratio) for ratio, neg_key in sorted(best, reverse=True)]
+
+
+SIMHASH_BITS = 64
+_MASK = (1 << SIMHASH_BITS) - 1
+_WORD_RE = re.compile(r'\w+')
+
+
+def simhash(text, shingle=3, min_words=50):
+    """64-bit SimHash of the word shingles of ``text`` as a signed integer (fits an SQLite INTEGER).
+
+    Returns None for texts shorter than ``min_words`` words, which are too
+    short to fingerprint reliably.
+    """
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < min_words:
+        return None
+    weights = defaultdict(int)
+    for i in range(len(words) - shingle + 1):
+        weights[' '.join(words[i:i + shingle])] += 1
+    vector = [0] * SIMHASH_BITS
+    for gram, weight in weights.items():
+        h = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += weight if h >> bit & 1 else -weight
+    value = sum(1 << bit for bit, v in enumerate(vector) if v > 0)
+    return value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+
+
+def hamming_distance(a, b):
+    return bin((a ^ b) & _MASK).count('1')
+
+
+class SimHashIndex:
+    """SimHash lookup by Hamming distance.
+
+    Hashes are split into ``bands`` equal bit ranges; two hashes within
+    ``bands - 1`` bits of each other agree exactly on at least one band, so
+    only entries sharing a band value are compared.
+    """
+
+    def __init__(self, bands=8):
+        self.bands = bands
+        self.max_key = 0
+        self._width = SIMHASH_BITS // bands
+        self._hashes = {}
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def _band_values(self, value):
+        band_mask = (1 << self._width) - 1
+        return [(value & _MASK) >> (i * self._width) & band_mask for i in range(self.bands)]
+
+    def add(self, key, value):
+        """Insert or replace the hash for ``key``."""
+        with self._lock:
+            if key in self._hashes:
+                self._remove(key)
+            self._hashes[key] = value
+            for bucket, band in zip(self._buckets, self._band_values(value)):
+                bucket[band].add(key)
+            self.max_key = max(self.max_key, key)
+
+    def remove(self, key):
+        with self._lock:
+            if key in self._hashes:
+                self._remove(key)
+
+    def _remove(self, key):
+        value = self._hashes.pop(key)
+        for bucket, band in zip(self._buckets, self._band_values(value)):
+            keys = bucket.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band]
+
+    def clear(self):
+        with self._lock:
+            self._hashes.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+            self.max_key = 0
+
+    def query(self, value, max_distance=6, exclude=None):
+        """Return ``[(key, distance), ...]`` within ``max_distance`` bits, nearest first."""
+        with self._lock:
+            candidates = set()
+            for bucket, band in zip(self._buckets, self._band_values(value)):
+                candidates.update(bucket.get(band, ()))
+            candidates.discard(exclude)
+            matches = [(key, hamming_distance(value, self._hashes[key])) for key in candidates]
+        return sorted((m for m in matches if m[1] <= max_distance), key=lambda m: (m[1], m[0]))
@@ -0,0 +1,168 @@
+"""Registry of the news outlets the app knows about.
+
+Every outlet is registered once under its root domain with a group
+(``indian``, ``bd``, ``intl`` or ``factcheck``), an optional display name and
+publication language, and whether the Exa ingestion searches it. Lookups take
+a URL, host or bare domain, normalize it and walk up its parent domains, so
+``https://m.thedailystar.net/news/1`` resolves to ``thedailystar.net``; each
+step is a dictionary hit.
+"""
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+INDIAN = 'indian'
+BD = 'bd'
+INTL = 'intl'
+FACT_CHECK = 'factcheck'
+
+
+class Source(NamedTuple):
+    domain: str
+    group: str
+    name: Optional[str] = None
+    language: Optional[str] = None
+    searched: bool = False
+
+
+# (domain, name, language), all searched
+INDIAN_OUTLETS = [
+    ("timesofindia.indiatimes.com", "The Times of India", "English"),
+    ("hindustantimes.com", "Hindustan Times", "English"),
+    ("ndtv.com", "NDTV", "English"),
+    ("thehindu.com", "The Hindu", "English"),
+    ("indianexpress.com", "The Indian Express", "English"),
+    ("indiatoday.in", "India Today", "English"),
+    ("news18.com", "News18", "English"),
+    ("zeenews.india.com", "Zee News", "Hindi"),
+    ("aajtak.in", "Aaj Tak", "Hindi"),
+    ("abplive.com", "ABP Live", "Hindi"),
+    ("jagran.com", "Dainik Jagran", "Hindi"),
+    ("bhaskar.com", "Dainik Bhaskar", "Hindi"),
+    ("livehindustan.com", "Hindustan", "Hindi"),
+    ("business-standard.com", "Business Standard", "English"),
+    ("economictimes.indiatimes.com", "The Economic Times", "English"),
+    ("livemint.com", "Mint", "English"),
+    ("scroll.in", "Scroll.in", "English"),
+    ("thewire.in", "The Wire", "English"),
+    ("wionews.com", "WION", "English"),
+    ("indiatvnews.com", "India TV", "Hindi"),
+    ("newsnationtv.com", "News Nation", "Hindi"),
+    ("jansatta.com", "Jansatta", "Hindi"),
+    ("india.com", "India.com", "English"),
+]
+
+# Bangladeshi outlets searched by the ingestion, then the others recognized in matches
+BD_SEARCHED = [
+    "bdnews24.com", "thedailystar.net", "prothomalo.com", "dhakatribune.com", "newagebd.net",
+    "financialexpress.com.bd", "theindependentbd.com",
+]
+BD_OTHER = [
+    "tbsnews.net", "jugantor.com", "kalerkantho.com", "banglatribune.com", "manabzamin.com", "bssnews.net",
+    "observerbd.com", "daily-sun.com", "dailyjanakantha.com", "thefinancialexpress.com.bd", "unb.com.bd",
+    "risingbd.com", "bangladeshpost.net", "daily-bangladesh.com", "bhorerkagoj.com", "dailyinqilab.com",
+    "samakal.com", "ittefaq.com.bd", "amardesh.com", "dailynayadiganta.com", "dailysangram.com",
+    "dailyprotidinersangbad.com", "dailyvorerpata.com", "dailyshomoyeralo.com", "dailyamadershomoy.com",
+    "dailykalerkantho.com", "dailysangbad.com", "dailysun.com", "dailyasianage.com", "dailyobserverbd.com",
+    "dailynewnation.com", "dailyindependentbd.com", "dailyjanata.com", "dailyjagaran.com", "dailyjagonews24.com",
+    "dailyjagonews.com", "dailyjagonewsbd.com", "dailyjagonews24bd.com",
+]
+
+# International outlets searched by the ingestion, then the others recognized in matches
+INTL_SEARCHED = [
+    "bbc.com", "reuters.com", "aljazeera.com", "apnews.com", "cnn.com", "nytimes.com", "theguardian.com",
+    "france24.com", "dw.com",
+]
+INTL_OTHER = [
+    "washingtonpost.com", "abc.net.au", "cbc.ca", "cbsnews.com", "nbcnews.com", "foxnews.com", "sky.com",
+    "japantimes.co.jp", "straitstimes.com", "channelnewsasia.com", "scmp.com", "gulfnews.com", "arabnews.com",
+    "rt.com", "tass.com", "sputniknews.com", "chinadaily.com.cn", "globaltimes.cn", "lemonde.fr", "spiegel.de",
+    "elpais.com", "corriere.it", "lefigaro.fr", "asahi.com", "mainichi.jp", "yomiuri.co.jp", "koreatimes.co.kr",
+    "joongang.co.kr", "hankyoreh.com", "latimes.com", "usatoday.com", "bloomberg.com", "forbes.com", "wsj.com",
+    "economist.com", "ft.com", "npr.org", "voanews.com", "rferl.org", "cna.com.tw", "thetimes.co.uk",
+    "independent.co.uk", "telegraph.co.uk", "mirror.co.uk", "express.co.uk", "dailymail.co.uk", "thesun.co.uk",
+    "metro.co.uk", "eveningstandard.co.uk", "irishtimes.com", "rte.ie", "heraldscotland.com", "scotsman.com",
+    "thejournal.ie", "breakingnews.ie", "irishmirror.ie", "irishnews.com", "belfasttelegraph.co.uk",
+    "news.com.au", "smh.com.au", "theage.com.au", "theaustralian.com.au", "afr.com", "thewest.com.au",
+    "perthnow.com.au", "adelaidenow.com.au", "couriermail.com.au", "heraldsun.com.au", "dailytelegraph.com.au",
+    "ntnews.com.au", "canberratimes.com.au", "themercury.com.au", "examiner.com.au", "illawarramercury.com.au",
+    "newcastleherald.com.au", "sunshinecoastdaily.com.au", "goldcoastbulletin.com.au", "thechronicle.com.au",
+    "northernstar.com.au", "dailyexaminer.com.au", "dailymercury.com.au", "themorningbulletin.com.au",
+    "frasercoastchronicle.com.au", "news-mail.com.au", "observer.com.au", "qt.com.au", "warwickdailynews.com.au",
+    "westernadvocate.com.au", "westernmagazine.com.au", "westerntimes.com.au", "theland.com.au",
+    "stockandland.com.au", "queenslandcountrylife.com.au", "northqueenslandregister.com.au", "farmonline.com.au",
+    "theweeklytimes.com.au", "countryman.com.au", "farmweekly.com.au", "stockjournal.com.au", "theadvocate.com.au",
+    "mercury.com.au", "thecourier.com.au", "ballaratcourier.com.au", "thecouriermail.com.au", "theherald.com.au",
+    "theheraldsun.com.au",
+]
+
+# Fact-checking sites, all searched
+FACT_CHECKERS = [
+    "factwatchbd.com", "altnews.in", "boomlive.in", "factchecker.in", "thequint.com", "factcheck.afp.com",
+    "snopes.com", "politifact.com", "fullfact.org", "factcheck.org",
+]
+
+
+def normalize_host(value):
+    """Lower-cased host of a URL, host or domain, without port, trailing dot or leading 'www.'."""
+    value = str(value or '').strip().lower()
+    if '//' in value:
+        value = urlsplit(value).hostname or ''
+    else:
+        value = value.split('/', 1)[0].rsplit('@', 1)[-1].split(':', 1)[0]
+    value = value.rstrip('.')
+    if value.startswith('www.'):
+        value = value[4:]
+    return value
+
+
+class SourceRegistry:
+    """Domain -> Source map with parent-domain fallback."""
+
+    def __init__(self, sources):
+        self._by_domain = {}
+        for source in sources:
+            # First registration wins, so a searched entry is not replaced by a later duplicate
+            self._by_domain.setdefault(source.domain, source)
+        self._groups = {}
+        for source in self._by_domain.values():
+            self._groups.setdefault(source.group, []).append(source)
+        self._domain_sets = {group: frozenset(s.domain for s in members) for group, members in self._groups.items()}
+
+    def lookup(self, value):
+        """Source registered for the host or its nearest registered parent domain, or None."""
+        host = normalize_host(value)
+        while host:
+            source = self._by_domain.get(host)
+            if source is not None:
+                return source
+            _, _, host = host.partition('.')
+        return None
+
+    def group(self, value):
+        source = self.lookup(value)
+        return source.group if source is not None else None
+
+    def domains(self, group):
+        """Frozen set of the domains registered in ``group``."""
+        return self._domain_sets.get(group, frozenset())
+
+    def sources(self, group=None):
+        """Registered sources in registration order, optionally limited to one group."""
+        if group is not None:
+            return list(self._groups.get(group, []))
+        return list(self._by_domain.values())
+
+    def searched_domains(self):
+        return [s.domain for s in self._by_domain.values() if s.searched]
+
+
+def default_sources():
+    yield from (Source(domain, INDIAN, name, language, True) for domain, name, language in INDIAN_OUTLETS)
+    yield from (Source(domain, BD, searched=True) for domain in BD_SEARCHED)
+    yield from (Source(domain, INTL, searched=True) for domain in INTL_SEARCHED)
+    yield from (Source(domain, FACT_CHECK, searched=True) for domain in FACT_CHECKERS)
+    yield from (Source(domain, BD) for domain in BD_OTHER)
+    yield from (Source(domain, INTL) for domain in INTL_OTHER)
+
+
+registry = SourceRegistry(default_sources())